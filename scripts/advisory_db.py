@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Offline Advisory Database
+- Loads advisory_snapshot.json, a local snapshot of Python package advisories (no network needed)
+- Builds a per-package interval index: affected ranges are swept into sorted, disjoint segments,
+  each tagged with the advisories covering it, so a version lookup is one bisect (O(log n))
+- Imports OSV advisories (JSON files, directories, or the PyPI all.zip export) into a fresh snapshot
+- Usage: python scripts/advisory_db.py --import-osv osv/ --output advisory_snapshot.json
+Category: security
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import re
+import zipfile
+from bisect import bisect_right
+from datetime import datetime, timezone
+from pathlib import Path
+from packaging.version import Version, InvalidVersion
+from scripts.central_logger import get_logger
+from scripts.central_args import get_arg_parser
+
+SNAPSHOT_PATH = Path(__file__).parent.parent / "advisory_snapshot.json"
+
+# Positions on the version line: (v, BEFORE) sits just below v, (v, AFTER) just above it.
+# A version v itself is probed at (v, AT), so [introduced, fixed) is [(i, BEFORE), (f, BEFORE))
+# and an inclusive last_affected bound l becomes (l, AFTER).
+BEFORE, AT, AFTER = 0, 1, 2
+
+
+def normalize_name(name):
+    """PEP 503 normalised project name."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _key(version, side):
+    return (Version(version), side)
+
+
+class PackageIndex:
+    """Disjoint affected segments for one package: [starts[i], ends[i]) -> advisories[i]."""
+
+    def __init__(self, advisories):
+        self.starts, self.ends, self.advisories = [], [], []
+        self.exact = {}
+        events = []
+        for adv in advisories:
+            for lo, hi, hi_inclusive in adv.get("ranges", []):
+                try:
+                    start = _key(lo or "0", BEFORE)
+                    end = None if hi is None else _key(hi, AFTER if hi_inclusive else BEFORE)
+                except InvalidVersion:
+                    continue
+                if end is None or start < end:
+                    events.append((start, adv["id"], end))
+            for v in adv.get("versions", []):
+                try:
+                    self.exact.setdefault(Version(v), set()).add(adv["id"])
+                except InvalidVersion:
+                    continue
+        self._sweep(events)
+
+    def _sweep(self, events):
+        deltas = {}
+        for start, adv, end in events:
+            deltas.setdefault(start, []).append((adv, 1))
+            if end is not None:
+                deltas.setdefault(end, []).append((adv, -1))
+        points = sorted(deltas)
+        counts = {}
+        for i, start in enumerate(points):
+            for adv, delta in deltas[start]:
+                counts[adv] = counts.get(adv, 0) + delta
+            end = points[i + 1] if i + 1 < len(points) else None
+            active = frozenset(adv for adv, n in counts.items() if n > 0)
+            if not active:
+                continue
+            if self.advisories and self.advisories[-1] == active and self.ends[-1] == start:
+                self.ends[-1] = end
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+                self.advisories.append(active)
+
+    def lookup(self, version):
+        """Advisory ids affecting version (a string or Version); raises InvalidVersion for e.g. "1.*"."""
+        v = version if isinstance(version, Version) else Version(version)
+        point = (v, AT)
+        found = set(self.exact.get(v, ()))
+        i = bisect_right(self.starts, point) - 1
+        if i >= 0 and (self.ends[i] is None or point < self.ends[i]):
+            found |= self.advisories[i]
+        return found
+
+
+class AdvisoryDB:
+    """Advisory snapshot with lazily built per-package interval indexes."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.packages = snapshot.get("packages", {})
+        self._indexes = {}
+        self._by_id = {}
+
+    @classmethod
+    def load(cls, path=SNAPSHOT_PATH):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def index(self, package):
+        name = normalize_name(package)
+        if name not in self._indexes:
+            advisories = self.packages.get(name, [])
+            self._indexes[name] = PackageIndex(advisories)
+            self._by_id.update({a["id"]: a for a in advisories})
+        return self._indexes[name]
+
+    def affected(self, package, version):
+        """Advisories (dicts from the snapshot) affecting package==version, sorted by id."""
+        ids = self.index(package).lookup(version)
+        return [self._by_id[i] for i in sorted(ids)]
+
+
+def osv_ranges(affected):
+    """OSV ECOSYSTEM ranges -> [[introduced, end, end_inclusive], ...]."""
+    ranges = []
+    for r in affected.get("ranges", []):
+        if r.get("type") != "ECOSYSTEM":
+            continue
+        introduced = None
+        for event in r.get("events", []):
+            if "introduced" in event:
+                if introduced is not None:
+                    ranges.append([introduced, None, False])
+                introduced = event["introduced"]
+            elif introduced is not None and ("fixed" in event or "limit" in event):
+                ranges.append([introduced, event.get("fixed", event.get("limit")), False])
+                introduced = None
+            elif introduced is not None and "last_affected" in event:
+                ranges.append([introduced, event["last_affected"], True])
+                introduced = None
+        if introduced is not None:
+            ranges.append([introduced, None, False])
+    return ranges
+
+
+def iter_osv_records(paths):
+    for path in map(Path, paths):
+        if path.is_dir():
+            for file in sorted(path.rglob("*.json")):
+                with open(file) as f:
+                    yield json.load(f)
+        elif path.suffix == ".zip":
+            with zipfile.ZipFile(path) as zf:
+                for name in zf.namelist():
+                    if name.endswith(".json"):
+                        yield json.loads(zf.read(name))
+        else:
+            with open(path) as f:
+                yield json.load(f)
+
+
+def import_osv(paths):
+    """Build a snapshot from OSV records, keeping PyPI entries only."""
+    packages = {}
+    for record in iter_osv_records(paths):
+        if record.get("withdrawn"):
+            continue
+        for affected in record.get("affected", []):
+            pkg = affected.get("package", {})
+            if pkg.get("ecosystem") != "PyPI":
+                continue
+            entry = {
+                "id": record["id"],
+                "aliases": record.get("aliases", []),
+                "summary": record.get("summary") or (record.get("details") or "")[:200],
+                "ranges": osv_ranges(affected),
+            }
+            if affected.get("versions"):
+                entry["versions"] = affected["versions"]
+            packages.setdefault(normalize_name(pkg["name"]), []).append(entry)
+    return {
+        "generated": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "source": "osv",
+        "packages": {name: packages[name] for name in sorted(packages)},
+    }
+
+
+def main():
+    parser = get_arg_parser()
+    parser.add_argument('--import-osv', nargs='+', metavar='PATH', help='OSV JSON files, directories or all.zip to import')
+    parser.add_argument('--output', default=str(SNAPSHOT_PATH), help='Snapshot file to write')
+    parser.add_argument('--lookup', nargs=2, metavar=('PACKAGE', 'VERSION'), help='Show advisories affecting a version')
+    args = parser.parse_args()
+    logger = get_logger(debug=args.debug)
+    if args.import_osv:
+        snapshot = import_osv(args.import_osv)
+        with open(args.output, "w") as f:
+            json.dump(snapshot, f, indent=1, sort_keys=True)
+        logger.info(f"Wrote {sum(map(len, snapshot['packages'].values()))} advisories for "
+                    f"{len(snapshot['packages'])} packages to {args.output}")
+    elif args.lookup:
+        try:
+            advisories = AdvisoryDB.load().affected(*args.lookup)
+        except InvalidVersion:
+            logger.error(f"Not a single version: {args.lookup[1]}")
+            sys.exit(1)
+        for adv in advisories:
+            logger.info(f"{adv['id']}: {adv.get('summary', '')}")
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
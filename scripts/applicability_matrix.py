@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+File x Rule Applicability Matrix
+- One int bitset per rule (bit i = files[i]), resolved once per config folder group via CompiledRuleConfig
+- scope: files the rule is not skipped for; active: scope minus files where the rule is suppressed;
+  suppressed: files where the rule is suppressed (whether or not it is also skipped)
+- Files are walked like import_scanner does (no .venv, build output or dot-directories), so the matrix
+  is the same in a CI checkout with a repo-root virtualenv
+- Persisted gzip-compressed in .smartai_cache/applicability_matrix.json.gz, keyed by file list, config and rules
+- Impact/what-if queries are bitwise OR/AND over these ints plus a popcount
+Category: automation
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import gzip
+import hashlib
+import json
+from pathlib import Path
+from scripts.central_logger import get_logger
+from scripts.central_args import get_arg_parser
+from scripts.import_scanner import EXCLUDE_DIRS
+from scripts.rule_config import CompiledRuleConfig, load_rule_config
+from scripts.rule_registry import get_registry
+
+ROOT = Path(__file__).parent.parent
+CACHE_PATH = ROOT / ".smartai_cache" / "applicability_matrix.json.gz"
+
+
+def get_py_files(root=ROOT):
+    """Project .py files; plugins/, virtualenvs, build output and dot-directories are not walked."""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in EXCLUDE_DIRS and d != "plugins"
+                       and not d.startswith(".") and not d.endswith(".egg-info")]
+        files.extend(Path(dirpath) / name for name in filenames if name.endswith(".py"))
+    return sorted(files)
+
+def matrix_key(files, rules, config):
+    payload = json.dumps({"files": files, "rules": rules, "config": config}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class ApplicabilityMatrix:
+    def __init__(self, files, rules, scope, active, key=None, suppressed=None):
+        self.files = files
+        self.rules = rules
+        self.scope = scope
+        self.active = active
+        self.suppressed = suppressed or {}
+        self.key = key
+        self.file_index = {f: i for i, f in enumerate(files)}
+        self.all_files = (1 << len(files)) - 1
+
+    @classmethod
+    def build(cls, files, rules, config):
+        """Resolve every file's config group once, then OR the group masks into per-rule bitsets."""
+        compiled = CompiledRuleConfig(config)
+        groups = [0] * len(compiled.settings)
+        for i, rel in enumerate(files):
+            groups[compiled.group_of(rel)] |= 1 << i
+        scope, active, suppressed = {}, {}, {}
+        for rule in rules:
+            scope[rule] = active[rule] = suppressed[rule] = 0
+            for g, mask in enumerate(groups):
+                if not mask:
+                    continue
+                if rule in compiled.suppressed[g]:
+                    suppressed[rule] |= mask
+                if rule not in compiled.skipped[g]:
+                    scope[rule] |= mask
+                    if rule not in compiled.suppressed[g]:
+                        active[rule] |= mask
+        return cls(files, rules, scope, active, matrix_key(files, rules, config), suppressed)
+
+    def to_json(self):
+        return {"key": self.key, "files": self.files, "rules": self.rules,
+                "scope": {r: format(m, "x") for r, m in self.scope.items()},
+                "active": {r: format(m, "x") for r, m in self.active.items()},
+                "suppressed": {r: format(m, "x") for r, m in self.suppressed.items()}}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["files"], data["rules"],
+                   {r: int(m, 16) for r, m in data["scope"].items()},
+                   {r: int(m, 16) for r, m in data["active"].items()}, data["key"],
+                   {r: int(m, 16) for r, m in data["suppressed"].items()})
+
+    # Queries ---------------------------------------------------------------
+    def mask(self, files):
+        mask = 0
+        for f in files:
+            if f in self.file_index:
+                mask |= 1 << self.file_index[f]
+        return mask
+
+    def files_in(self, mask):
+        """Files whose bits are set in mask, in file order; one pass over the mask's binary string."""
+        # Peeling bits with mask & -mask copies the whole int per bit; bin() converts it once.
+        bits = bin(mask)[:1:-1]  # least significant bit first
+        out, i = [], bits.find("1")
+        while i >= 0:
+            out.append(self.files[i])
+            i = bits.find("1", i + 1)
+        return out
+
+    @staticmethod
+    def count(mask):
+        return mask.bit_count()
+
+    def files_for(self, rule):
+        return self.active.get(rule, 0)
+
+    def affected_by_enabling(self, rules):
+        """Files that would start being checked if rules were unsuppressed."""
+        mask = 0
+        for rule in rules:
+            mask |= self.scope.get(rule, 0) & ~self.active.get(rule, 0)
+        return mask
+
+    def affected_by_disabling(self, rules):
+        """Files that would stop being checked if rules were suppressed."""
+        mask = 0
+        for rule in rules:
+            mask |= self.active.get(rule, 0)
+        return mask
+
+    def owner_masks(self, file_owners):
+        """{owner: bitset of files they own} for a {file: owner} mapping."""
+        masks = {}
+        for f, owner in file_owners.items():
+            if f in self.file_index:
+                masks[owner] = masks.get(owner, 0) | (1 << self.file_index[f])
+        return masks
+
+    def masks_by(self, label_of):
+        """{label: bitset of files} grouping every file by label_of(file), e.g. its folder."""
+        masks = {}
+        for i, f in enumerate(self.files):
+            label = label_of(f)
+            masks[label] = masks.get(label, 0) | (1 << i)
+        return masks
+
+    def status(self, rule, i):
+        """'suppressed', 'skipped' or 'checked' for files[i], with the precedence report_rule_coverage uses."""
+        bit = 1 << i
+        if self.suppressed.get(rule, 0) & bit:
+            return "suppressed"
+        return "checked" if self.scope.get(rule, 0) & bit else "skipped"
+
+    def owners_of(self, mask, owner_masks):
+        """Owners of any file in mask; '-' stands for files nobody owns."""
+        owners = {owner for owner, owned in owner_masks.items() if owned & mask}
+        owned = 0
+        for m in owner_masks.values():
+            owned |= m
+        if mask & ~owned:
+            owners.add('-')
+        return owners
+
+
+def load_matrix(root=ROOT, cache_path=CACHE_PATH, config=None, rules=None):
+    """Matrix for the current files, config and rules; rebuilt only when one of them changed."""
+    root = Path(root)
+    config = load_rule_config() if config is None else config
+    rules = list(get_registry()) if rules is None else list(rules)
+    files = [f.relative_to(root).as_posix() for f in get_py_files(root)]
+    key = matrix_key(files, rules, config)
+    if Path(cache_path).exists():
+        try:
+            with gzip.open(cache_path, "rt") as f:
+                data = json.load(f)
+            if data.get("key") == key:
+                return ApplicabilityMatrix.from_json(data)
+        except (OSError, ValueError, KeyError):
+            pass
+    matrix = ApplicabilityMatrix.build(files, rules, config)
+    Path(cache_path).parent.mkdir(exist_ok=True)
+    tmp = Path(str(cache_path) + ".tmp")
+    with gzip.open(tmp, "wt") as f:
+        json.dump(matrix.to_json(), f, separators=(",", ":"))
+    os.replace(tmp, cache_path)
+    return matrix
+
+def main():
+    parser = get_arg_parser()
+    parser.add_argument('--build', action='store_true', help='Build (or reuse) the persisted matrix and show per-rule file counts')
+    args = parser.parse_args()
+    logger = get_logger(debug=args.debug)
+    if args.build:
+        matrix = load_matrix()
+        logger.info(f"Applicability matrix: {len(matrix.files)} files x {len(matrix.rules)} rules")
+        for rule in matrix.rules:
+            logger.info(f"- {rule}: {matrix.count(matrix.active[rule])} active / {matrix.count(matrix.scope[rule])} in scope")
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 
 import sys, os
-import requests
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts import http_client
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
 """
@@ -11,6 +11,17 @@ Category: automation
 """
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+def create_ci_issue(repo, token, title, body, logger, api=http_client.GITHUB_API):
+    """Create the CI failure issue; returns its number, or None on failure."""
+    url = f"{api}/repos/{repo}/issues"
+    payload = {"title": title, "body": body}
+    resp = http_client.post(url, json=payload, headers=http_client.github_headers(token))
+    if resp.status_code not in (200, 201):
+        logger.error(f"Failed to create CI failure issue: {resp.text}")
+        return None
+    logger.info("Created GitHub issue for CI/CD failure.")
+    return resp.json().get("number")
+
 def main():
     parser = get_arg_parser()
     parser.add_argument('--title', required=True, help='Issue title')
@@ -27,14 +38,8 @@ def main():
         if not repo or not token:
             logger.error("GITHUB_REPOSITORY and GITHUB_TOKEN must be set in the environment or passed as arguments.")
             sys.exit(1)
-        url = f"https://api.github.com/repos/{repo}/issues"
-        headers = {"Authorization": f"token {token}"}
-        payload = {"title": args.title, "body": args.body}
-        resp = requests.post(url, json=payload, headers=headers)
-        if resp.status_code not in (200, 201):
-            logger.error(f"Failed to create CI failure issue: {resp.text}")
+        if create_ci_issue(repo, token, args.title, args.body, logger) is None:
             sys.exit(1)
-        logger.info("Created GitHub issue for CI/CD failure.")
     except Exception as e:
         logger.error(f"Exception in auto_create_ci_issue: {e}")
         sys.exit(1)
@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 """
-Auto-create GitHub issues for critical security findings from safety or pip-audit reports.
+Auto-create GitHub issues for security findings from safety or pip-audit reports.
+- Parses pip-audit (-f json) and safety (--json) reports; the legacy text scan for CRITICAL lines still works
+- Fingerprints each finding by package, version and advisory and keeps an index of findings already filed
+- Files all new findings in one issue per run (split into parts when the body would exceed GitHub's
+  65,536-character limit); known findings cost no API calls
+- Usage: pip-audit -f json | python scripts/auto_create_security_issues.py
 Category: security
 """
 import os
@@ -10,41 +15,195 @@ try:
 except ImportError:
     pass
 import sys
-import requests
 import re
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import hashlib
+from datetime import date
+from pathlib import Path
+from scripts import http_client
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
 
-def create_github_issue(repo, token, title, body, logger):
-    url = f"https://api.github.com/repos/{repo}/issues"
-    headers = {"Authorization": f"token {token}"}
+INDEX_PATH = Path(__file__).parent.parent / ".smartai_cache" / "security_issue_index.json"
+ISSUE_LABEL = "security"
+FINGERPRINT_RE = re.compile(r"<!-- fingerprint:([0-9a-f]{16}) -->")
+# GitHub rejects issue bodies over 65,536 characters.
+MAX_BODY_CHARS = 65536
+TABLE_HEADER = ["| Package | Version | Advisory | Fixed in | Summary |", "|---|---|---|---|---|"]
+
+
+def finding_fingerprint(package, version, advisory):
+    key = f"{package.lower()}|{version}|{advisory}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+def _finding(package, version, advisory, summary="", fix_versions=(), source=""):
+    return {
+        "package": package,
+        "version": str(version or ""),
+        "advisory": str(advisory),
+        "summary": " ".join(str(summary or "").split())[:300],
+        "fix_versions": list(fix_versions or []),
+        "source": source,
+        "fingerprint": finding_fingerprint(package, version or "", advisory),
+    }
+
+def _pip_audit_findings(dependencies):
+    for dep in dependencies:
+        for vuln in dep.get("vulns") or []:
+            yield _finding(dep["name"], dep.get("version"), vuln["id"], vuln.get("description"),
+                           vuln.get("fix_versions"), "pip-audit")
+
+def _safety_findings(vulnerabilities):
+    for v in vulnerabilities:
+        if isinstance(v, list):
+            # safety 1.x: [package, affected spec, installed version, advisory text, vulnerability id, ...]
+            yield _finding(v[0], v[2], v[4], v[3], source="safety")
+        else:
+            yield _finding(v["package_name"], v.get("analyzed_version"), v.get("vulnerability_id") or v.get("CVE"),
+                           v.get("advisory"), v.get("fixed_versions"), "safety")
+
+def _text_findings(report):
+    for block in re.findall(r'CRITICAL.*?\n.*?\n', report, re.DOTALL):
+        title = block.split('\n')[0][:80]
+        yield _finding(title, "", title, block, source="text")
+
+def iter_findings(report):
+    """
+    Yield findings from a pip-audit or safety report (JSON, or JSON Lines with
+    one pip-audit dependency per line), falling back to the legacy text scan.
+    """
+    stripped = report.lstrip()
+    try:
+        data = json.loads(stripped) if stripped else []
+    except json.JSONDecodeError:
+        try:
+            dependencies = [json.loads(line) for line in stripped.splitlines() if line.strip()]
+        except json.JSONDecodeError:
+            yield from _text_findings(report)
+            return
+        yield from _pip_audit_findings(dependencies)
+        return
+    if isinstance(data, dict) and "dependencies" in data:
+        yield from _pip_audit_findings(data["dependencies"])
+    elif isinstance(data, dict):
+        yield from _safety_findings(data.get("vulnerabilities") or [])
+    elif data and isinstance(data[0], dict):
+        # pip-audit < 2.0 emitted a bare list of dependencies.
+        yield from _pip_audit_findings(data)
+    else:
+        yield from _safety_findings(data)
+
+def load_index(path=INDEX_PATH):
+    if Path(path).exists():
+        with open(path) as f:
+            return json.load(f)
+    return {"fingerprints": {}, "seeded": False}
+
+def save_index(index, path=INDEX_PATH):
+    Path(path).parent.mkdir(exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+
+def seed_index(index, repo, token, logger):
+    """Rebuild the index from fingerprint markers in existing security issues (cold cache)."""
+    url = f"{http_client.GITHUB_API}/repos/{repo}/issues?labels={ISSUE_LABEL}&state=all&per_page=100"
+    while url:
+        resp = http_client.get(url, headers=http_client.github_headers(token))
+        if resp.status_code != 200:
+            logger.error(f"Failed to list security issues: {resp.text}")
+            return index
+        for issue in resp.json():
+            for fp in FINGERPRINT_RE.findall(issue.get("body") or ""):
+                index["fingerprints"].setdefault(fp, issue["number"])
+        url = (resp.links or {}).get("next", {}).get("url")
+    index["seeded"] = True
+    return index
+
+def render_row(f):
+    summary = f["summary"].replace("|", "\\|")
+    return f"| {f['package']} | {f['version']} | {f['advisory']} | {', '.join(f['fix_versions'])} | {summary} |"
+
+def render_issue(findings, part=None):
+    title = f"Security findings: {len(findings)} new advisor{'y' if len(findings) == 1 else 'ies'} ({date.today().isoformat()})"
+    if part:
+        title += f" (part {part[0]}/{part[1]})"
+    lines = TABLE_HEADER + [render_row(f) for f in findings] + [""]
+    lines.extend(f"<!-- fingerprint:{f['fingerprint']} -->" for f in findings)
+    return title, "\n".join(lines)
+
+def render_issues(findings, max_body=MAX_BODY_CHARS):
+    """[(title, body)] covering findings, split so that no body is longer than max_body."""
+    chunks, size = [[]], len("\n".join(TABLE_HEADER)) + 2
+    used = size
+    for f in findings:
+        # Each finding adds its table row and its fingerprint marker, one line each.
+        cost = len(render_row(f)) + len(f"<!-- fingerprint:{f['fingerprint']} -->") + 2
+        if chunks[-1] and used + cost > max_body:
+            chunks.append([])
+            used = size
+        chunks[-1].append(f)
+        used += cost
+    if len(chunks) == 1:
+        return [render_issue(chunks[0])]
+    return [render_issue(chunk, (i, len(chunks))) for i, chunk in enumerate(chunks, 1)]
+
+def create_github_issue(repo, token, title, body, logger, labels=None):
+    url = f"{http_client.GITHUB_API}/repos/{repo}/issues"
     payload = {"title": title, "body": body}
-    resp = requests.post(url, json=payload, headers=headers)
+    if labels:
+        payload["labels"] = labels
+    resp = http_client.post(url, json=payload, headers=http_client.github_headers(token))
     if resp.status_code not in (200, 201):
         logger.error(f"Failed to create issue: {resp.text}")
+        return None
+    logger.info(f"Created GitHub issue: {title}")
+    return resp.json().get("number")
+
+def file_new_findings(report, repo, token, logger, index_path=INDEX_PATH, dry_run=False):
+    """File findings not yet in the index as one issue (several if it would be too long). Returns the new findings."""
+    index = load_index(index_path)
+    if not index.get("seeded") and not dry_run:
+        seed_index(index, repo, token, logger)
+    new, seen = [], set(index["fingerprints"])
+    for finding in iter_findings(report):
+        if finding["fingerprint"] not in seen:
+            seen.add(finding["fingerprint"])
+            new.append(finding)
+    if not new:
+        logger.info("No new security findings to report.")
+    elif dry_run:
+        issues = render_issues(new)
+        logger.info(f"[dry-run] Would file {len(new)} new security findings in {len(issues)} issue(s):\n"
+                    + "\n\n".join(body for _, body in issues))
     else:
-        logger.info(f"Created GitHub issue: {title}")
+        for title, body in render_issues(new):
+            number = create_github_issue(repo, token, title, body, logger, labels=[ISSUE_LABEL])
+            if number is not None:
+                index["fingerprints"].update({fp: number for fp in FINGERPRINT_RE.findall(body)})
+    if not dry_run:
+        save_index(index, index_path)
+    return new
 
 def main():
     parser = get_arg_parser()
+    parser.add_argument('--report', help='Path to a pip-audit/safety report (default: stdin)')
+    parser.add_argument('--dry-run', action='store_true', help='Show new findings without filing an issue')
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
     try:
         repo = os.environ.get("GITHUB_REPOSITORY")
         token = os.environ.get("GITHUB_TOKEN")
-        if not repo or not token:
+        if not args.dry_run and (not repo or not token):
             logger.error("GITHUB_REPOSITORY and GITHUB_TOKEN must be set in the environment.")
             sys.exit(1)
-        # Read safety or pip-audit report from stdin
-        report = sys.stdin.read()
-        criticals = re.findall(r'CRITICAL.*?\n.*?\n', report, re.DOTALL)
-        for finding in criticals:
-            title = finding.split('\n')[0][:80]
-            body = finding
-            create_github_issue(repo, token, title, body, logger)
-        if not criticals:
-            logger.info("No critical security findings to report.")
+        # Read safety or pip-audit report from a file or stdin
+        if args.report:
+            with open(args.report, encoding="utf-8") as f:
+                report = f.read()
+        else:
+            report = sys.stdin.read()
+        file_new_findings(report, repo, token, logger, dry_run=args.dry_run)
     except Exception as e:
         logger.error(f"Exception in auto_create_security_issues: {e}")
         sys.exit(1)
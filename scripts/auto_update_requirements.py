@@ -1,36 +1,112 @@
 #!/usr/bin/env python3
 
 import sys, os
-import subprocess
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import re
+from importlib import metadata
 from pathlib import Path
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts.import_scanner import normalize_name
 """
-Auto-update requirements.txt if dependencies change (pip freeze).
+Auto-update requirements.txt if installed dependency versions change.
+- Reads installed distributions in-process (importlib.metadata), cached by site-packages mtimes
+- Rewrites only the version of pins that changed; comments, ordering and other lines are kept
+- --add-new appends installed distributions that are not listed; --prune drops pins that are not installed
 Category: dependencies
 """
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+REQUIREMENTS_PATH = Path(__file__).parent.parent / "requirements.txt"
+CACHE_PATH = Path(__file__).parent.parent / ".smartai_cache" / "installed_distributions.json"
+PIN_RE = re.compile(r"^(\s*)([A-Za-z0-9][A-Za-z0-9._-]*)(\[[^\]]*\])?(\s*==\s*)([^\s;#]+)(.*)$")
+
+
+def site_dirs():
+    return sorted({p for p in sys.path if p.endswith(("site-packages", "dist-packages")) and os.path.isdir(p)})
+
+def installed_distributions(cache_path=CACHE_PATH):
+    """{normalised name: (name, version)} of installed distributions; reused while site dirs are unchanged."""
+    key = {d: os.stat(d).st_mtime_ns for d in site_dirs()}
+    if Path(cache_path).exists():
+        try:
+            with open(cache_path) as f:
+                cached = json.load(f)
+            if cached.get("key") == key:
+                return {k: tuple(v) for k, v in cached["distributions"].items()}
+        except (OSError, ValueError, KeyError):
+            pass
+    dists = {}
+    for dist in metadata.distributions():
+        name = dist.metadata["Name"]
+        if name:
+            dists.setdefault(normalize_name(name), (name, dist.version))
+    Path(cache_path).parent.mkdir(exist_ok=True)
+    with open(cache_path, "w") as f:
+        json.dump({"key": key, "distributions": dists}, f, sort_keys=True)
+    return dists
+
+def update_requirements(lines, installed, add_new=False, prune=False):
+    """
+    Minimal per-package update of requirements lines.
+    Returns (new lines, [(name, old version, new version)]); new version None means pruned,
+    old version None means added.
+    """
+    out, changes, listed = [], [], set()
+    for line in lines:
+        match = PIN_RE.match(line.rstrip("\n"))
+        if not match:
+            out.append(line)
+            continue
+        indent, name, extras, op, version, rest = match.groups()
+        key = normalize_name(name)
+        listed.add(key)
+        if key not in installed:
+            if prune:
+                changes.append((name, version, None))
+                continue
+            out.append(line)
+        elif installed[key][1] != version:
+            changes.append((name, version, installed[key][1]))
+            newline = "\n" if line.endswith("\n") else ""
+            out.append(f"{indent}{name}{extras or ''}{op}{installed[key][1]}{rest}{newline}")
+        else:
+            out.append(line)
+    if add_new:
+        if out and not out[-1].endswith("\n"):
+            out[-1] += "\n"
+        for key in sorted(set(installed) - listed):
+            name, version = installed[key]
+            changes.append((name, None, version))
+            out.append(f"{name}=={version}\n")
+    return out, changes
+
 def main():
     parser = get_arg_parser()
+    parser.add_argument('--requirements', default=str(REQUIREMENTS_PATH), help='Requirements file to update')
+    parser.add_argument('--add-new', action='store_true', help='Append installed distributions missing from the file')
+    parser.add_argument('--prune', action='store_true', help='Remove pins for distributions that are not installed')
+    parser.add_argument('--dry-run', action='store_true', help='Show the changes without writing the file')
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
     try:
-        req_file = Path(__file__).parent.parent / "requirements.txt"
-        # Get current frozen requirements
-        result = subprocess.run([sys.executable, "-m", "pip", "freeze"], capture_output=True, text=True)
-        frozen = result.stdout.strip()
+        req_file = Path(args.requirements)
         with open(req_file, "r", encoding="utf-8") as f:
-            current = f.read().strip()
-        if frozen != current:
-            logger.info("[auto-update] requirements.txt is out of sync. Updating...")
-            with open(req_file, "w", encoding="utf-8") as f:
-                f.write(frozen + "\n")
-            logger.info("requirements.txt updated. Please commit the changes.")
-        else:
+            lines = f.readlines()
+        new_lines, changes = update_requirements(lines, installed_distributions(), args.add_new, args.prune)
+        if not changes:
             logger.info("requirements.txt is up to date.")
+            return
+        for name, old, new in changes:
+            logger.info(f"[auto-update] {name}: {old or '(new)'} -> {new or '(removed)'}")
+        if args.dry_run:
+            logger.info(f"[dry-run] Would update {len(changes)} entries in {req_file}.")
+            return
+        with open(req_file, "w", encoding="utf-8") as f:
+            f.writelines(new_lines)
+        logger.info("requirements.txt updated. Please commit the changes.")
     except Exception as e:
         logger.error(f"Exception in auto_update_requirements: {e}")
         sys.exit(1)
@@ -1,16 +1,16 @@
 #!/usr/bin/env python3
 import sys, os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-import pkgutil
-import subprocess
 from pathlib import Path
 import json
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
 from scripts.rule_config import load_rule_config, get_file_rule_settings, is_rule_suppressed
+from scripts.import_scanner import scan_project, third_party_imports, distributions_for, normalize_name
 """
 Check for missing dependencies: all imports must be in requirements.txt.
 Fails if any import is missing from requirements.txt.
+Scans every project .py file in-process (see import_scanner.py); unchanged files are served from cache.
 Category: dependencies
 """
 
@@ -49,25 +49,20 @@ def main():
         with open(requirements_path) as f:
             for line in f:
                 if line.strip() and not line.startswith('#'):
-                    reqs.add(line.split('==')[0].strip().lower())
-        # Use pipreqs CLI to detect imports
+                    reqs.add(normalize_name(line.split('==')[0].split(';')[0].strip()))
         try:
-            pipreqs_cmd = ["pipreqs", "scripts", "--force", "--savepath", "pipreqs.txt"]
-            if args.debug:
-                pipreqs_cmd.append("--debug")
-            subprocess.run(pipreqs_cmd, check=True)
-            missing_pkgs = []
-            with open("pipreqs.txt") as f:
-                for line in f:
-                    pkg = line.split('==')[0].strip()
-                    if pkg and pkg.lower() not in reqs:
-                        missing_pkgs.append(pkg)
+            imports = third_party_imports(scan_project())
+            missing = {}
+            for name, dist in sorted(distributions_for(imports).items()):
+                if normalize_name(dist) not in reqs:
+                    missing.setdefault(dist, []).extend(imports[name])
+            missing_pkgs = sorted(missing)
             if args.autofix or args.dry_run:
                 if missing_pkgs:
                     if args.dry_run:
                         logger.info(f"[dry-run] Would add missing dependencies to requirements.txt: {', '.join(missing_pkgs)}")
                     else:
-                        with open(Path(__file__).parent.parent / "requirements.txt", "a", encoding="utf-8") as reqf:
+                        with open(requirements_path, "a", encoding="utf-8") as reqf:
                             for pkg in missing_pkgs:
                                 reqf.write(f"{pkg}\n")
                         logger.info(f"Added missing dependencies to requirements.txt: {', '.join(missing_pkgs)}")
@@ -76,11 +71,11 @@ def main():
                 return
             if missing_pkgs:
                 for pkg in missing_pkgs:
-                    logger.error(f"Missing dependency in requirements.txt: {pkg}")
+                    logger.error(f"Missing dependency in requirements.txt: {pkg} (imported in {', '.join(sorted(set(missing[pkg]))[:3])})")
                 print_rule_and_fix(logger)
                 sys.exit(1)
         except Exception as e:
-            logger.error(f"ERROR running pipreqs: {e}")
+            logger.error(f"ERROR scanning imports: {e}")
             print_rule_and_fix(logger)
             sys.exit(1)
         logger.info("All dependencies are listed in requirements.txt.")
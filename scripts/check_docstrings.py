@@ -16,6 +16,16 @@ from scripts.rule_config import load_rule_config, get_file_rule_settings, is_rul
 def has_module_docstring(tree):
     return ast.get_docstring(tree) is not None
 
+def check_file(py_file, config=None):
+    """Violation messages for a single file (per-file entry point used by the what-if simulator)."""
+    with open(py_file, encoding='utf-8') as f:
+        source = f.read()
+    try:
+        tree = ast.parse(source, filename=str(py_file))
+    except SyntaxError as e:
+        return [f"{py_file} could not be parsed: {e}"]
+    return [] if has_module_docstring(tree) else [f"{py_file} is missing a module docstring."]
+
 def main():
     root = Path(__file__).parent.parent
     py_files = list(root.glob('**/*.py'))
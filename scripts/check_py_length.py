@@ -26,6 +26,17 @@ def print_rule_and_fix(logger):
         logger.info(f"See: {rule.get('doc','')}")
         logger.info(f"Suggested fix: {rule.get('fix','')}")
 
+def check_file(py_file, config):
+    """Violation messages for a single file, ignoring skip_rules (per-file entry point used by the what-if simulator)."""
+    settings = get_file_rule_settings(pathlib.Path(py_file), config)
+    max_lines = settings.get('max_file_length', 350)
+    max_allowed = int(max_lines * (1 + TOLERANCE))
+    with open(py_file, encoding='utf-8') as f:
+        n = sum(1 for _ in f)
+    if n > max_allowed:
+        return [f"{py_file} has {n} lines (limit: {max_lines} ±10%). Please modularize."]
+    return []
+
 def check_file_length(py_file, logger, config):
     try:
         # Skip files in .venv or site-packages
@@ -34,14 +45,9 @@ def check_file_length(py_file, logger, config):
         settings = get_file_rule_settings(pathlib.Path(py_file), config)
         if 'check_py_length' in (settings.get('skip_rules') or []):
             return True
-        max_lines = settings.get('max_file_length', 350)
-        min_lines = int(max_lines * (1 - TOLERANCE))
-        max_allowed = int(max_lines * (1 + TOLERANCE))
-        with open(py_file, encoding='utf-8') as f:
-            lines = f.readlines()
-        n = len(lines)
-        if n > max_allowed:
-            logger.error(f"{py_file} has {n} lines (limit: {max_lines} ±10%). Please modularize.")
+        messages = check_file(py_file, config)
+        if messages:
+            logger.error(messages[0])
             print_rule_and_fix(logger)
             return False
         return True
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Check pinned requirements against the offline advisory snapshot.
+- Fails if any name==version pin in requirements.txt is affected by an advisory in advisory_snapshot.json
+- Wildcard or otherwise unparseable pins (pkg==1.*) are reported as warnings and skipped
+- Runs without network access: each pin is one interval-index lookup (see advisory_db.py)
+- Refresh the snapshot with: python scripts/advisory_db.py --import-osv <osv export>
+Category: security
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import re
+from pathlib import Path
+from packaging.version import InvalidVersion
+from scripts.central_logger import get_logger
+from scripts.central_args import get_arg_parser
+from scripts.advisory_db import AdvisoryDB, SNAPSHOT_PATH
+from scripts.run_history import record_violation
+
+REQUIREMENTS_PATH = Path(__file__).parent.parent / "requirements.txt"
+PIN_RE = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)(?:\[[^\]]*\])?\s*==\s*([^\s;#]+)")
+
+
+def print_rule_and_fix(rule_key, logger):
+    mapping_path = Path(__file__).parent / "rule_mapping.json"
+    if mapping_path.exists():
+        with open(mapping_path) as f:
+            rules = json.load(f)
+        rule = rules.get(rule_key, {})
+        logger.info(f"Rule: {rule.get('rule','')}")
+        logger.info(f"See: {rule.get('doc','')}")
+        logger.info(f"Suggested fix: {rule.get('fix','')}")
+
+def iter_pins(path):
+    """Yield (line number, package, version) for each exact pin."""
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            match = PIN_RE.match(line)
+            if match:
+                yield lineno, match.group(1), match.group(2)
+
+def find_vulnerable_pins(requirements, db, unresolved=None):
+    """
+    [(line number, package, version, advisory)] for each affected pin. Pins that are not a single
+    version (e.g. pkg==1.*) cannot be looked up; they are appended to unresolved and skipped.
+    """
+    findings = []
+    for lineno, package, version in iter_pins(requirements):
+        try:
+            advisories = db.affected(package, version)
+        except InvalidVersion:
+            if unresolved is not None:
+                unresolved.append((lineno, package, version))
+            continue
+        findings.extend((lineno, package, version, adv) for adv in advisories)
+    return findings
+
+def main():
+    parser = get_arg_parser()
+    parser.add_argument('--requirements', default=str(REQUIREMENTS_PATH), help='Requirements file to check')
+    parser.add_argument('--snapshot', default=str(SNAPSHOT_PATH), help='Advisory snapshot file')
+    args, _ = parser.parse_known_args()
+    logger = get_logger(debug=args.debug)
+    if not Path(args.snapshot).exists():
+        logger.error(f"Advisory snapshot not found: {args.snapshot}")
+        print_rule_and_fix("check_vulnerable_pins", logger)
+        sys.exit(1)
+    db = AdvisoryDB.load(args.snapshot)
+    unresolved = []
+    findings = find_vulnerable_pins(args.requirements, db, unresolved)
+    for lineno, package, version in unresolved:
+        logger.warning(f"{args.requirements}:{lineno}: {package}=={version} is not a single version; skipped")
+    for lineno, package, version, adv in findings:
+        message = f"{package}=={version} is affected by {adv['id']}: {adv.get('summary', '')}"
+        logger.error(f"{args.requirements}:{lineno}: {message}")
+        record_violation("check_vulnerable_pins", args.requirements, lineno, message, severity="error",
+                         advisory=adv["id"])
+    if findings:
+        print_rule_and_fix("check_vulnerable_pins", logger)
+        sys.exit(1)
+    logger.info(f"No pinned requirements affected by known advisories (snapshot {db.snapshot.get('generated', 'unknown')}).")
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,32 @@
 """
 Cross-Repo Rule Consistency Checker
 - Compares rule_mapping.json and .smartai_rules.yaml across multiple repos
-- Reports inconsistencies and suggests sync actions
+- Each repo is reduced to one fingerprint per rule (its mapping metadata plus where the config skips or
+  suppresses it) and a Merkle root over those fingerprints, cached in .smartai_cache/repo_fingerprints.json
+  until either file changes
+- Repos whose root matches this repo's are consistent without further work; the others are compared
+  only on the rules whose fingerprints differ
+- Repos are fingerprinted in parallel (--workers) and the result is one drift matrix of repo x rule
+- A repo whose files are missing or cannot be parsed (invalid JSON/YAML, not a mapping) is reported as not comparable
 Category: automation
 """
 import sys
 import os
 import json
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import yaml
 
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts.rule_config import CompiledRuleConfig
+
+ROOT = Path(__file__).parent.parent
+CACHE_PATH = ROOT / ".smartai_cache" / "repo_fingerprints.json"
+CONFIG_LEAF = "(config)"
+DRIFT_SYMBOLS = {"added": "+", "removed": "-", "changed": "~"}
 
 def load_json(path):
     if not Path(path).exists():
@@ -20,56 +35,178 @@ def load_json(path):
     with open(path) as f:
         return json.load(f)
 
-def load_yaml_lines(path):
+def load_yaml(path):
     if not Path(path).exists():
         return None
-    with open(path) as f:
-        return [line.strip() for line in f if line.strip()]
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+def digest(obj):
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, default=str).encode()).hexdigest()
+
+def strip_rule_lists(settings):
+    return {k: v for k, v in (settings or {}).items() if k not in ("skip_rules", "suppressed_rules", "folders", "overrides")}
+
+def rule_fingerprints(mapping, config):
+    """
+    {rule: fingerprint} for every rule in the mapping or named by the config, plus CONFIG_LEAF for the
+    remaining settings (thresholds etc.). A rule's fingerprint covers its metadata and, per config scope,
+    whether it is skipped and its suppression entry.
+    """
+    compiled = CompiledRuleConfig(config)
+    scopes = compiled.folders + ["*"]
+    rules = set(mapping)
+    for skipped, suppressed in zip(compiled.skipped, compiled.suppressed):
+        rules |= skipped | suppressed
+    fingerprints = {}
+    for rule in rules:
+        placement = {}
+        for scope, settings, skipped, suppressed in zip(scopes, compiled.settings, compiled.skipped, compiled.suppressed):
+            if rule in skipped or rule in suppressed:
+                reasons = settings.get("suppressed_rules")
+                reason = reasons.get(rule) if isinstance(reasons, dict) else None
+                placement[scope] = {"skipped": rule in skipped, "suppressed": rule in suppressed, "reason": reason}
+        fingerprints[rule] = digest({"meta": mapping.get(rule), "config": placement})
+    fingerprints[CONFIG_LEAF] = digest({"global": strip_rule_lists(config),
+                                        "folders": {f: strip_rule_lists(s) for f, s in (config.get("folders") or {}).items()}})
+    return fingerprints
+
+def merkle_root(fingerprints):
+    """Root of a binary hash tree over the (rule, fingerprint) leaves in rule order."""
+    level = [hashlib.sha1(f"{rule}:{fp}".encode()).digest() for rule, fp in sorted(fingerprints.items())]
+    if not level:
+        return hashlib.sha1(b"").hexdigest()
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hashlib.sha1(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
+    return level[0].hex()
+
+def repo_stamp(repo):
+    """(mtime_ns, size) of the repo's rule_mapping.json and .smartai_rules.yaml; None for a missing file."""
+    stamp = []
+    for name in ("rule_mapping.json", ".smartai_rules.yaml"):
+        try:
+            stat = (Path(repo) / name).stat()
+            stamp.append([stat.st_mtime_ns, stat.st_size])
+        except FileNotFoundError:
+            stamp.append(None)
+    return stamp
+
+def fingerprint_repo(repo, cached=None):
+    """
+    {"stamp", "root", "rules"} for repo, reusing cached when both files are unchanged. root is None, with the
+    reason in "error", if a file is missing or cannot be parsed.
+    """
+    stamp = repo_stamp(repo)
+    if cached and cached.get("stamp") == stamp:
+        return cached
+    if None in stamp:
+        return {"stamp": stamp, "root": None, "rules": {}, "error": "missing rule_mapping.json or .smartai_rules.yaml"}
+    try:
+        mapping = load_json(Path(repo) / "rule_mapping.json") or {}
+        config = load_yaml(Path(repo) / ".smartai_rules.yaml")
+        if not isinstance(mapping, dict) or not isinstance(config, dict):
+            raise ValueError("rule_mapping.json and .smartai_rules.yaml must each hold a mapping")
+        rules = rule_fingerprints(mapping, config)
+    except (OSError, ValueError, yaml.YAMLError, AttributeError, TypeError) as e:
+        return {"stamp": stamp, "root": None, "rules": {}, "error": f"{type(e).__name__}: {' '.join(str(e).split())}"}
+    return {"stamp": stamp, "root": merkle_root(rules), "rules": rules}
 
-def compare_dicts(d1, d2):
-    keys1 = set(d1 or {})
-    keys2 = set(d2 or {})
-    added = keys2 - keys1
-    removed = keys1 - keys2
-    changed = {k for k in (keys1 & keys2) if d1[k] != d2[k]}
-    return added, removed, changed
+def load_cache(path=CACHE_PATH):
+    if Path(path).exists():
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {}
+
+def save_cache(cache, path=CACHE_PATH):
+    Path(path).parent.mkdir(exist_ok=True)
+    tmp = Path(path).with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(cache, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp, path)
+
+def compare_fingerprints(base, other):
+    """{rule: "added" | "removed" | "changed"} for the rules whose fingerprints differ."""
+    drift = {}
+    for rule in base.keys() | other.keys():
+        if rule not in base:
+            drift[rule] = "added"
+        elif rule not in other:
+            drift[rule] = "removed"
+        elif base[rule] != other[rule]:
+            drift[rule] = "changed"
+    return drift
+
+def scan(repos, base=ROOT, cache=None, workers=8):
+    """
+    Fingerprint base and repos in parallel and compare each repo against base.
+    Returns {repo: None if it (or base) is not comparable, else {rule: drift}} ({} for a matching Merkle root).
+    cache ({resolved repo path: fingerprint entry}) is updated in place.
+    """
+    cache = {} if cache is None else cache
+    paths = [str(Path(p).resolve()) for p in [base] + list(repos)]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        entries = list(pool.map(lambda p: fingerprint_repo(p, cache.get(p)), paths))
+    cache.update(zip(paths, entries))
+    reference = entries[0]
+    results = {}
+    for repo, entry in zip(repos, entries[1:]):
+        if entry["root"] is None or reference["root"] is None:
+            results[repo] = None
+        elif entry["root"] == reference["root"]:
+            results[repo] = {}
+        else:
+            results[repo] = compare_fingerprints(reference["rules"], entry["rules"])
+    return results
+
+def drift_matrix(results):
+    """Markdown table of repo x drifting rule; + only in that repo, - missing from it, ~ differs."""
+    rules = sorted({rule for drift in results.values() if drift for rule in drift})
+    lines = ["| Repo | " + " | ".join(rules) + " |", "|---" * (len(rules) + 1) + "|"]
+    for repo, drift in results.items():
+        if drift is None:
+            cells = ["?"] * len(rules)
+        else:
+            cells = [DRIFT_SYMBOLS[drift[rule]] if rule in drift else "=" for rule in rules]
+        lines.append(f"| {repo} | " + " | ".join(cells) + " |")
+    return lines
 
 def main():
     parser = get_arg_parser()
     parser.add_argument('--repos', nargs='+', required=True, help='Paths to other repos to check')
+    parser.add_argument('--workers', type=int, default=8, help='Repos to fingerprint in parallel')
+    parser.add_argument('--output', type=str, default=None, help='Also write the drift matrix as JSON to this path')
     args = parser.parse_args()
     if not args.repos:
         print("Error: --repos argument is required. Example usage: python cross_repo_rule_consistency.py --repos repo1 repo2")
         sys.exit(1)
     logger = get_logger(debug=args.debug)
-    this_root = Path(__file__).parent.parent
-    this_mapping = load_json(this_root / 'rule_mapping.json')
-    this_config = load_yaml_lines(this_root / '.smartai_rules.yaml')
-    for repo in args.repos:
-        repo_path = Path(repo)
-        logger.info(f"\nChecking repo: {repo_path}")
-        mapping = load_json(repo_path / 'rule_mapping.json')
-        config = load_yaml_lines(repo_path / '.smartai_rules.yaml')
-        if mapping is None or config is None:
-            logger.warning(f"Missing rule_mapping.json or .smartai_rules.yaml in {repo}")
-            continue
-        # Compare mapping
-        a, r, c = compare_dicts(this_mapping, mapping)
-        if a or r or c:
-            logger.info("rule_mapping.json differences:")
-            if a:
-                logger.info(f"  Added: {a}")
-            if r:
-                logger.info(f"  Removed: {r}")
-            if c:
-                logger.info(f"  Changed: {c}")
-        else:
-            logger.info("rule_mapping.json is consistent.")
-        # Compare config (line-based)
-        if this_config != config:
-            logger.info(".smartai_rules.yaml differs.")
-        else:
-            logger.info(".smartai_rules.yaml is consistent.")
+    cache = load_cache()
+    results = scan(args.repos, ROOT, cache, args.workers)
+    save_cache(cache)
+    base_error = cache[str(ROOT.resolve())].get("error")
+    if base_error:
+        logger.error(f"This repo's rules cannot be compared: {base_error}")
+    for repo, drift in results.items():
+        if drift is None and not base_error:
+            logger.warning(f"{repo} is not comparable: {cache[str(Path(repo).resolve())].get('error')}")
+    consistent = [repo for repo, drift in results.items() if drift == {}]
+    drifting = {repo: drift for repo, drift in results.items() if drift}
+    logger.info(f"{len(consistent)}/{len(results)} repos consistent with this repo's rules.")
+    if drifting:
+        logger.info("Drift matrix (+ only in repo, - missing from repo, ~ differs, ? not comparable):")
+        for line in drift_matrix({repo: drift for repo, drift in results.items() if drift != {}}):
+            logger.info(line)
+        if CONFIG_LEAF in {rule for drift in drifting.values() for rule in drift}:
+            logger.info(f"{CONFIG_LEAF} covers settings outside the rule lists, e.g. max_file_length.")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        logger.info(f"Drift matrix written to {args.output}")
 
 if __name__ == "__main__":
     main()
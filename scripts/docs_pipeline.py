@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Incremental Docs Pipeline
+- One entry point for the generated docs: rule list, rule reference, dependency graph, usage dashboard, coverage
+- Each target records its input fingerprints (rule mapping, rule script hashes, log rollup version, ...)
+  and output hashes in a stamp file under .smartai_cache/docs_stamps/
+- Only targets whose inputs or outputs changed are re-rendered, in parallel; files are written only when
+  their content differs, so regenerating never produces spurious git diffs
+- --check reports stale outputs without writing (non-zero exit); CI runs it on every target except the
+  usage dashboard, which is rendered from local logs
+Category: automation
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from scripts.central_logger import get_logger
+from scripts.central_args import get_arg_parser
+
+ROOT = Path(__file__).parent.parent
+STAMP_DIR = ROOT / ".smartai_cache" / "docs_stamps"
+
+
+def write_if_changed(path, content):
+    """Write str or bytes content to path unless it already holds exactly that; returns True if written."""
+    path = Path(path)
+    data = content.encode() if isinstance(content, str) else content
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+def content_hash(content):
+    return hashlib.sha1(content.encode() if isinstance(content, str) else content).hexdigest()
+
+def file_hash(path):
+    path = Path(path)
+    return hashlib.sha1(path.read_bytes()).hexdigest() if path.exists() else None
+
+
+class DocTarget:
+    """
+    name: stamp name. inputs: callable -> {input: fingerprint}.
+    render: callable -> {output path: str or bytes}; {} means there is nothing to write yet.
+    """
+
+    def __init__(self, name, inputs, render):
+        self.name = name
+        self.inputs = inputs
+        self.render = render
+
+
+def load_stamp(name, stamp_dir=STAMP_DIR):
+    path = Path(stamp_dir) / f"{name}.json"
+    if path.exists():
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return None
+
+def save_stamp(name, stamp, stamp_dir=STAMP_DIR):
+    Path(stamp_dir).mkdir(parents=True, exist_ok=True)
+    with open(Path(stamp_dir) / f"{name}.json", "w") as f:
+        json.dump(stamp, f, indent=2, sort_keys=True)
+
+def up_to_date(stamp, inputs):
+    """Inputs unchanged and every recorded output still has the content it was generated with."""
+    if not stamp or stamp.get("inputs") != inputs or not stamp.get("outputs"):
+        return False
+    return all(file_hash(path) == digest for path, digest in stamp.get("outputs", {}).items())
+
+def run_pipeline(targets, stamp_dir=STAMP_DIR, workers=4, force=False, check=False):
+    """
+    Rebuild stale targets. Returns {target name: "up to date" | "unchanged" | "written" | "stale"}
+    ("stale" only in check mode, where nothing is written and no stamps are saved).
+    """
+    inputs = {t.name: t.inputs() for t in targets}
+    status, stale = {}, []
+    for target in targets:
+        if not force and up_to_date(load_stamp(target.name, stamp_dir), inputs[target.name]):
+            status[target.name] = "up to date"
+        else:
+            stale.append(target)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        rendered = list(pool.map(lambda t: t.render(), stale))
+    for target, outputs in zip(stale, rendered):
+        if check:
+            differs = any(file_hash(path) != content_hash(content) for path, content in outputs.items())
+            status[target.name] = "stale" if differs else "unchanged"
+            continue
+        written = [write_if_changed(path, content) for path, content in outputs.items()]
+        status[target.name] = "written" if any(written) else "unchanged"
+        save_stamp(target.name, {"inputs": inputs[target.name],
+                                 "outputs": {str(path): content_hash(content) for path, content in outputs.items()}}, stamp_dir)
+    return status
+
+def default_targets():
+    """The repo's generated docs. Generators are imported here because they use write_if_changed from this module."""
+    from scripts import rule_doc_sync, self_documenting_rules, rule_dependency_graph, rule_usage_analytics, report_rule_coverage
+    from scripts.rule_registry import get_registry, RULE_MAPPING_PATH
+    from scripts.rule_config import load_rule_config
+    from scripts.log_rollups import refresh_rollups
+    from scripts.applicability_matrix import load_matrix
+    from scripts.ownership import get_ownership
+
+    def mapping_inputs():
+        return {"rule_mapping": file_hash(RULE_MAPPING_PATH)}
+
+    def rule_list():
+        doc = rule_doc_sync.DOC_RULES_PATH
+        return {doc: rule_doc_sync.render_rules_section(doc.read_text(), get_registry())}
+
+    def reference_inputs():
+        scripts = sorted({meta["script"] for _, meta in get_registry().items() if meta.get("script")})
+        return {**mapping_inputs(), **{s: file_hash(self_documenting_rules.RULES_DIR / s) for s in scripts}}
+
+    def usage_inputs():
+        return {"rollups": refresh_rollups().get("version")}
+
+    def usage_dashboard():
+        # Rendered even with no violations, so a dashboard from older logs is cleared rather than kept.
+        rollups = refresh_rollups()
+        table = rollups["tables"]["violations"]
+        return {rule_usage_analytics.DASHBOARD_MD: rule_usage_analytics.render_dashboard(table, rollups.get("version"))}
+
+    def coverage_matrix():
+        return load_matrix(config=load_rule_config(), rules=get_registry())
+
+    def coverage_inputs():
+        return {"matrix": coverage_matrix().key, "file_ownership": file_hash(report_rule_coverage.FILE_OWNERSHIP_PATH)}
+
+    def coverage():
+        matrix = coverage_matrix()
+        owners = get_ownership(report_rule_coverage.FILE_OWNERSHIP_PATH).owners_for(matrix.files)
+        return report_rule_coverage.render_outputs(matrix, owners)
+
+    return [
+        DocTarget("rule_list", mapping_inputs, rule_list),
+        DocTarget("rule_reference", reference_inputs,
+                  lambda: {self_documenting_rules.DOCS_PATH: self_documenting_rules.render_docs(get_registry())}),
+        DocTarget("dependency_graph", mapping_inputs,
+                  lambda: {rule_dependency_graph.GRAPH_MD: rule_dependency_graph.render_graph_doc(get_registry())}),
+        DocTarget("usage_dashboard", usage_inputs, usage_dashboard),
+        DocTarget("rule_coverage", coverage_inputs, coverage),
+    ]
+
+def main():
+    parser = get_arg_parser()
+    parser.add_argument('--build', action='store_true', help='Regenerate stale docs')
+    parser.add_argument('--check', action='store_true', help='Report stale docs without writing; exit 1 if any')
+    parser.add_argument('--force', action='store_true', help='Ignore stamps and re-render every target')
+    parser.add_argument('--only', nargs='+', help='Restrict to these targets')
+    parser.add_argument('--workers', type=int, default=4, help='Generators to run in parallel')
+    args = parser.parse_args()
+    logger = get_logger(debug=args.debug)
+    if not (args.build or args.check):
+        parser.print_help()
+        return
+    targets = [t for t in default_targets() if not args.only or t.name in args.only]
+    status = run_pipeline(targets, workers=args.workers, force=args.force, check=args.check)
+    for name, state in status.items():
+        logger.info(f"{name}: {state}")
+    if args.check and "stale" in status.values():
+        logger.error("Generated docs are out of date. Run: python3 scripts/docs_pipeline.py --build")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
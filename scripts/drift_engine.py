@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Vectorized Violation Trend & Anomaly Engine
+- Stores per-run violation counts as a rule x file x run matrix (NumPy)
+- Computes rolling means, EWMA, z-scores and CUSUM change points for every series at once
+- Persists history to logs/rule_violation_history.npz for rule_drift_detection.py
+Category: automation
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from pathlib import Path
+import numpy as np
+
+LOGS_DIR = Path(__file__).parent.parent / "logs"
+HISTORY_PATH = LOGS_DIR / "rule_violation_history.npz"
+
+# Keep at most this many runs per series; older runs are dropped on save.
+MAX_RUNS = 200
+# Counts are integers, so a one-violation swing is the smallest meaningful deviation.
+MIN_STD = 1.0
+
+
+class ViolationHistory:
+    """
+    Per-run violation counts for every observed (rule, file) pair.
+
+    The rule x file plane is stored sparsely: series i is the pair
+    (rules[series_rule[i]], files[series_file[i]]) and counts[i, t] is its
+    violation count in run t. Use as_cube() for the dense rule x file x run view.
+    """
+
+    def __init__(self, rules=None, files=None, runs=None, series_rule=None, series_file=None, counts=None):
+        self.rules = list(rules or [])
+        self.files = list(files or [])
+        self.runs = list(runs or [])
+        self.series_rule = np.asarray(series_rule if series_rule is not None else [], dtype=np.int64)
+        self.series_file = np.asarray(series_file if series_file is not None else [], dtype=np.int64)
+        if counts is None:
+            counts = np.zeros((len(self.series_rule), len(self.runs)), dtype=np.int32)
+        self.counts = np.asarray(counts, dtype=np.int32).reshape(len(self.series_rule), len(self.runs))
+        self._rule_idx = {r: i for i, r in enumerate(self.rules)}
+        self._file_idx = {f: i for i, f in enumerate(self.files)}
+        self._series_idx = {
+            (int(r), int(f)): i for i, (r, f) in enumerate(zip(self.series_rule, self.series_file))
+        }
+
+    @classmethod
+    def load(cls, path=HISTORY_PATH):
+        if not Path(path).exists():
+            return cls()
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                rules=data["rules"].tolist(),
+                files=data["files"].tolist(),
+                runs=data["runs"].tolist(),
+                series_rule=data["series_rule"],
+                series_file=data["series_file"],
+                counts=data["counts"],
+            )
+
+    def save(self, path=HISTORY_PATH, max_runs=MAX_RUNS):
+        Path(path).parent.mkdir(exist_ok=True)
+        runs, counts = self.runs[-max_runs:], self.counts[:, -max_runs:]
+        np.savez_compressed(
+            path,
+            rules=np.array(self.rules, dtype=str),
+            files=np.array(self.files, dtype=str),
+            runs=np.array(runs, dtype=str),
+            series_rule=self.series_rule,
+            series_file=self.series_file,
+            counts=counts,
+        )
+
+    @property
+    def n_series(self):
+        return len(self.series_rule)
+
+    @property
+    def n_runs(self):
+        return len(self.runs)
+
+    def _intern(self, names, index, name):
+        if name not in index:
+            index[name] = len(names)
+            names.append(name)
+        return index[name]
+
+    def add_run(self, run_id, pair_counts):
+        """
+        Append (or replace) a run. pair_counts maps (rule, file) -> count.
+        Pairs missing from pair_counts are recorded as zero for this run.
+        """
+        new_rules, new_files = [], []
+        column_rows, column_vals = [], []
+        for (rule, file), count in pair_counts.items():
+            r = self._intern(self.rules, self._rule_idx, rule)
+            f = self._intern(self.files, self._file_idx, file)
+            key = (r, f)
+            if key not in self._series_idx:
+                self._series_idx[key] = self.n_series + len(new_rules)
+                new_rules.append(r)
+                new_files.append(f)
+            column_rows.append(self._series_idx[key])
+            column_vals.append(count)
+        if new_rules:
+            self.series_rule = np.concatenate([self.series_rule, np.array(new_rules, dtype=np.int64)])
+            self.series_file = np.concatenate([self.series_file, np.array(new_files, dtype=np.int64)])
+            pad = np.zeros((len(new_rules), self.n_runs), dtype=np.int32)
+            self.counts = np.vstack([self.counts, pad])
+        column = np.zeros(self.n_series, dtype=np.int32)
+        column[np.array(column_rows, dtype=np.int64)] = np.array(column_vals, dtype=np.int32)
+        if run_id in self.runs:
+            self.counts[:, self.runs.index(run_id)] = column
+        else:
+            self.runs.append(run_id)
+            self.counts = np.hstack([self.counts, column[:, None]])
+
+    def series_labels(self, idx):
+        """Return (rule, file) for series index idx."""
+        return self.rules[self.series_rule[idx]], self.files[self.series_file[idx]]
+
+    def as_cube(self):
+        """Dense rule x file x run view (only use for small histories)."""
+        cube = np.zeros((len(self.rules), len(self.files), self.n_runs), dtype=np.int32)
+        cube[self.series_rule, self.series_file] = self.counts
+        return cube
+
+
+def rolling_mean(x, window):
+    """Trailing mean over the last `window` runs for every series (shape preserved)."""
+    x = np.asarray(x, dtype=np.float64)
+    csum = np.cumsum(x, axis=1)
+    out = csum.copy()
+    out[:, window:] = csum[:, window:] - csum[:, :-window]
+    n = np.minimum(np.arange(1, x.shape[1] + 1), window)
+    return out / n
+
+
+def ewma(x, alpha):
+    """Exponentially weighted moving average along the run axis for every series."""
+    x = np.asarray(x, dtype=np.float64)
+    out = np.empty_like(x)
+    if x.shape[1] == 0:
+        return out
+    out[:, 0] = x[:, 0]
+    for t in range(1, x.shape[1]):
+        out[:, t] = alpha * x[:, t] + (1 - alpha) * out[:, t - 1]
+    return out
+
+
+def baseline_stats(x, window, skip=1):
+    """Mean and std of the `window` runs preceding the last `skip` runs, per series."""
+    x = np.asarray(x, dtype=np.float64)
+    stop = x.shape[1] - skip
+    base = x[:, max(stop - window, 0):max(stop, 0)]
+    if base.shape[1] == 0:
+        zeros = np.zeros(x.shape[0])
+        return zeros, zeros
+    return base.mean(axis=1), base.std(axis=1)
+
+
+def zscores(values, mean, std, min_std=MIN_STD):
+    """Standardize values against a per-series baseline, flooring std at min_std."""
+    return (np.asarray(values, dtype=np.float64) - mean) / np.maximum(std, min_std)
+
+
+def change_points(x, baseline_runs, k=0.5, h=4.0, min_std=MIN_STD):
+    """
+    One-sided CUSUM over all series at once.
+    Baseline mean/std come from the first `baseline_runs` runs of each series.
+    Returns the index of the first run where the upward CUSUM exceeds h, or -1.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n_series, n_runs = x.shape
+    first = np.full(n_series, -1, dtype=np.int64)
+    if n_runs <= baseline_runs or baseline_runs == 0:
+        return first
+    mu = x[:, :baseline_runs].mean(axis=1)
+    sigma = np.maximum(x[:, :baseline_runs].std(axis=1), min_std)
+    s = np.zeros(n_series)
+    for t in range(baseline_runs, n_runs):
+        s = np.maximum(0.0, s + (x[:, t] - mu) / sigma - k)
+        hit = (s > h) & (first < 0)
+        first[hit] = t
+    return first
+
+
+def analyze(history, window=10, persist=2, alpha=0.3, z_threshold=3.0, cusum_h=4.0, min_std=MIN_STD):
+    """
+    Vectorized drift analysis over every (rule, file) series in history.
+    A series drifts when each of its last `persist` runs sits more than
+    z_threshold baseline standard deviations above the mean of the `window`
+    runs before them, so a single noisy run does not raise an alert on its own.
+    EWMA trend and the CUSUM change point are returned alongside for reporting.
+    """
+    x = history.counts.astype(np.float64)
+    n_series, n_runs = x.shape
+    if n_runs == 0:
+        empty = np.zeros(n_series)
+        return {"latest": empty, "mean": empty, "std": empty, "rolling_mean": empty, "ewma": empty, "z": empty,
+                "change_point": np.full(n_series, -1, dtype=np.int64), "drifting": empty.astype(bool)}
+    persist = max(1, min(persist, n_runs - 1)) if n_runs > 1 else 1
+    mean, std = baseline_stats(x, window, skip=persist)
+    # Short windows underestimate spread; counts are roughly Poisson, so never trust less than sqrt(mean).
+    scale = np.maximum(std, np.sqrt(mean))
+    recent_z = zscores(x[:, -persist:], mean[:, None], scale[:, None], min_std)
+    drifting = (recent_z > z_threshold).all(axis=1)
+    return {
+        "latest": x[:, -1],
+        "mean": mean,
+        "std": std,
+        "rolling_mean": rolling_mean(x, window)[:, -1],
+        "ewma": ewma(x, alpha)[:, -1],
+        "z": recent_z.min(axis=1),
+        "change_point": change_points(x, baseline_runs=min(window, n_runs - persist), h=cusum_h, min_std=min_std),
+        "drifting": drifting,
+    }
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Static HTML Rule Report
+- Builds one self-contained HTML file from check results and a violations table in the log rollups'
+  format (run_all_checks passes this run's violations, aggregated with log_rollups.aggregate)
+- Embeds compact, pre-aggregated columnar JSON: violations by rule, file, owner and day, plus script timings
+- Renders per-file results in a virtualised table, so very large reports open instantly with no server
+Category: automation
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+from datetime import datetime
+from pathlib import Path
+from scripts.ownership import get_ownership
+
+FILE_OWNERSHIP_PATH = Path(__file__).parent.parent / "file_ownership.json"
+UNOWNED = "(unowned)"
+
+
+def load_file_owners(path=FILE_OWNERSHIP_PATH):
+    """Ownership matcher for file_ownership.json; like a dict, .get(file) returns the file's owner."""
+    return get_ownership(path)
+
+
+def build_report_data(results, violations_table, file_owners):
+    """Columnar, dictionary-encoded report payload."""
+    by_rule = violations_table.get("by_rule") or {}
+    by_file = violations_table.get("by_file") or {}
+    by_date = violations_table.get("by_date") or {}
+    rules = sorted(by_rule, key=lambda r: -sum(by_rule[r].values()))
+    severities = sorted({sev for counts in by_rule.values() for sev in counts})
+    files = sorted(by_file, key=lambda f: -by_file[f])
+    owners, owner_idx, owner_counts = [], {}, {}
+    file_owner = []
+    for f in files:
+        owner = file_owners.get(f) or UNOWNED
+        if owner not in owner_idx:
+            owner_idx[owner] = len(owners)
+            owners.append(owner)
+        file_owner.append(owner_idx[owner])
+        owner_counts[owner] = owner_counts.get(owner, 0) + by_file[f]
+    dates = sorted(by_date)
+    results = sorted(results, key=lambda r: r["script"])
+    return {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "totals": {
+            "violations": violations_table.get("total", 0),
+            "auto_fixed": violations_table.get("auto_fixed", 0),
+            "scripts": len(results),
+            "failed": sum(r["status"] != "PASS" for r in results),
+        },
+        "scripts": {
+            "name": [r["script"] for r in results],
+            "category": [r["category"] for r in results],
+            "status": [r["status"] for r in results],
+            "seconds": [round(r.get("duration", 0.0), 3) for r in results],
+        },
+        "by_rule": {
+            "rule": rules,
+            "severities": severities,
+            "counts": [[by_rule[r].get(sev, 0) for sev in severities] for r in rules],
+        },
+        "owners": owners,
+        "by_owner": {"owner": owners, "count": [owner_counts[o] for o in owners]},
+        "by_file": {"file": files, "owner": file_owner, "count": [by_file[f] for f in files]},
+        "by_date": {"date": dates, "count": [by_date[d] for d in dates]},
+    }
+
+
+def render_html(data):
+    payload = json.dumps(data, separators=(",", ":")).replace("</", "<\\/")
+    return HTML_TEMPLATE.replace("__REPORT_DATA__", payload)
+
+
+def write_html_report(path, results, violations_table, file_owners=None):
+    data = build_report_data(results, violations_table, file_owners if file_owners is not None else load_file_owners())
+    Path(path).write_text(render_html(data), encoding="utf-8")
+    return path
+
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>SmartAIPlatform Rule Report</title>
+<style>
+body { font-family: system-ui, sans-serif; margin: 1.5rem; color: #222; }
+h1 { margin-top: 0; }
+.cards { display: flex; gap: 1rem; margin-bottom: 1rem; }
+.card { border: 1px solid #ddd; border-radius: 6px; padding: .6rem 1rem; }
+.card b { display: block; font-size: 1.4rem; }
+.grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(320px, 1fr)); gap: 1.5rem; }
+table { border-collapse: collapse; width: 100%; font-size: .9rem; }
+th, td { text-align: left; padding: 2px 6px; border-bottom: 1px solid #eee; white-space: nowrap; }
+td.bar { width: 40%; } td.bar span { display: inline-block; height: .7rem; background: #4a7bd0; }
+.FAIL, .ERROR, .TIMEOUT { color: #b00020; font-weight: bold; } .PASS { color: #11772d; }
+#viewport { height: 480px; overflow-y: auto; position: relative; border: 1px solid #ddd; }
+#spacer { position: relative; }
+#rows { position: absolute; left: 0; right: 0; }
+.row { display: flex; height: 22px; line-height: 22px; border-bottom: 1px solid #f2f2f2; font-size: .85rem; }
+.row div { padding: 0 6px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }
+.row .f { flex: 6; } .row .o { flex: 2; } .row .c { flex: 1; text-align: right; }
+.head { font-weight: bold; background: #fafafa; border: 1px solid #ddd; border-bottom: none; }
+</style>
+</head>
+<body>
+<h1>SmartAIPlatform Rule Report</h1>
+<p id="generated"></p>
+<div class="cards" id="cards"></div>
+<div class="grid">
+  <section><h2>Scripts</h2><table id="scripts"></table></section>
+  <section><h2>Violations by rule</h2><table id="rules"></table></section>
+  <section><h2>Violations by owner</h2><table id="owners"></table></section>
+  <section><h2>Violations by day</h2><table id="dates"></table></section>
+</div>
+<h2>Violations by file</h2>
+<p><input id="filter" placeholder="Filter files or owners" size="40"> <span id="shown"></span></p>
+<div class="row head"><div class="f">File</div><div class="o">Owner</div><div class="c">Violations</div></div>
+<div id="viewport"><div id="spacer"><div id="rows"></div></div></div>
+<script type="application/json" id="report-data">__REPORT_DATA__</script>
+<script>
+const D = JSON.parse(document.getElementById("report-data").textContent);
+const esc = s => String(s).replace(/[&<>"]/g, c => ({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]));
+document.getElementById("generated").textContent = "Generated " + D.generated;
+document.getElementById("cards").innerHTML = [["Violations", D.totals.violations], ["Auto-fixed", D.totals.auto_fixed],
+  ["Scripts", D.totals.scripts], ["Failed", D.totals.failed]].map(([k, v]) => `<div class="card">${k}<b>${v}</b></div>`).join("");
+function barTable(id, head, labels, counts, limit) {
+  const max = Math.max(1, ...counts.slice(0, limit));
+  const rows = labels.slice(0, limit).map((l, i) =>
+    `<tr><td>${esc(l)}</td><td>${counts[i]}</td><td class="bar"><span style="width:${100 * counts[i] / max}%"></span></td></tr>`);
+  document.getElementById(id).innerHTML = `<tr><th>${head}</th><th>Count</th><th></th></tr>` + rows.join("");
+}
+const S = D.scripts;
+document.getElementById("scripts").innerHTML = "<tr><th>Script</th><th>Category</th><th>Status</th><th>Seconds</th></tr>" +
+  S.name.map((n, i) => `<tr><td>${esc(n)}</td><td>${esc(S.category[i])}</td><td class="${S.status[i]}">${S.status[i]}</td><td>${S.seconds[i]}</td></tr>`).join("");
+barTable("rules", "Rule", D.by_rule.rule, D.by_rule.counts.map(c => c.reduce((a, b) => a + b, 0)), 200);
+barTable("owners", "Owner", D.by_owner.owner, D.by_owner.count, 200);
+barTable("dates", "Day", D.by_date.date.slice().reverse(), D.by_date.count.slice().reverse(), 60);
+const F = D.by_file, ROW = 22, viewport = document.getElementById("viewport");
+let visible = F.file.map((_, i) => i);
+function draw() {
+  const first = Math.floor(viewport.scrollTop / ROW), count = Math.ceil(viewport.clientHeight / ROW) + 1;
+  const rows = document.getElementById("rows");
+  rows.style.top = first * ROW + "px";
+  rows.innerHTML = visible.slice(first, first + count).map(i =>
+    `<div class="row"><div class="f">${esc(F.file[i])}</div><div class="o">${esc(D.owners[F.owner[i]])}</div><div class="c">${F.count[i]}</div></div>`).join("");
+}
+function applyFilter() {
+  const q = document.getElementById("filter").value.toLowerCase();
+  visible = [];
+  for (let i = 0; i < F.file.length; i++) {
+    if (!q || F.file[i].toLowerCase().includes(q) || D.owners[F.owner[i]].toLowerCase().includes(q)) visible.push(i);
+  }
+  document.getElementById("spacer").style.height = visible.length * ROW + "px";
+  document.getElementById("shown").textContent = visible.length + " of " + F.file.length + " files";
+  viewport.scrollTop = 0;
+  draw();
+}
+viewport.addEventListener("scroll", () => requestAnimationFrame(draw));
+document.getElementById("filter").addEventListener("input", applyFilter);
+applyFilter();
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client for Integrations
+- One pooled keep-alive requests.Session per host, with default timeouts
+- Jittered exponential retries (tenacity) on connection errors, 429 and 5xx responses for idempotent methods;
+  POST/PATCH are only retried when the request never reached the server (connect errors) or the server
+  asked for a retry (429, rate-limit 403, Retry-After), unless the caller passes idempotent=True
+- Per-host token-bucket rate limiter fed by GitHub X-RateLimit-* and Retry-After headers
+- Used by the Slack, GitHub issue, PR bot and board sync scripts
+Category: automation
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from tenacity import (Retrying, stop_after_attempt, wait_random_exponential, retry_if_exception, retry_if_exception_type,
+                      retry_if_result)
+
+# GitHub Actions sets GITHUB_API_URL (also used to point the bots at a local stand-in).
+GITHUB_API = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+MAX_ATTEMPTS = 5
+BACKOFF_MULTIPLIER = 0.5
+MAX_BACKOFF = 30
+POOL_SIZE = 16
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Requests per second and burst size before any rate-limit headers have been seen.
+DEFAULT_RATE = (10.0, 10)
+HOST_RATES = {
+    "hooks.slack.com": (1.0, 1),
+}
+
+RETRYABLE_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. acquire() blocks until a token is available.
+    update_from_headers() re-tunes the rate so the remaining quota is spread
+    evenly until the reset time, and pauses entirely on Retry-After or an
+    exhausted quota.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.paused_until = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    wait = (1 - self.tokens) / self.rate if self.rate > 0 else 1.0
+            self._sleep(wait)
+
+    def pause(self, seconds):
+        with self._lock:
+            self.paused_until = max(self.paused_until, self._clock() + seconds)
+
+    def update_from_headers(self, headers, wall_clock=time.time):
+        retry_after = headers.get("Retry-After")
+        if retry_after:
+            try:
+                self.pause(float(retry_after))
+            except ValueError:
+                pass
+        remaining, reset = headers.get("X-RateLimit-Remaining"), headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining, window = int(remaining), max(float(reset) - wall_clock(), 1.0)
+        except ValueError:
+            return
+        if remaining <= 0:
+            self.pause(window)
+            return
+        with self._lock:
+            self.rate = remaining / window
+            self.tokens = min(self.tokens, float(remaining))
+
+
+_sessions = {}
+_limiters = {}
+_registry_lock = threading.Lock()
+
+
+def _host(url):
+    return urlsplit(url).netloc
+
+
+def get_session(url):
+    """Pooled keep-alive session shared by every request to url's host."""
+    host = _host(url)
+    with _registry_lock:
+        if host not in _sessions:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[host] = session
+        return _sessions[host]
+
+
+def get_limiter(url):
+    host = _host(url)
+    with _registry_lock:
+        if host not in _limiters:
+            _limiters[host] = TokenBucket(*HOST_RATES.get(host, DEFAULT_RATE))
+        return _limiters[host]
+
+
+def rate_limited(resp):
+    """The server refused the request and asked for a retry; it was not processed."""
+    if resp.status_code == 429 or "Retry-After" in resp.headers:
+        return True
+    # GitHub reports primary and secondary rate limits as 403s.
+    return resp.status_code == 403 and resp.headers.get("X-RateLimit-Remaining") == "0"
+
+
+def should_retry(resp):
+    return resp.status_code in RETRY_STATUSES or rate_limited(resp)
+
+
+def not_sent(exc):
+    """True for connection errors raised before the request reached the server."""
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if isinstance(exc, requests.ConnectionError) and exc.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def request(method, url, timeout=DEFAULT_TIMEOUT, max_attempts=MAX_ATTEMPTS, idempotent=None, **kwargs):
+    """
+    Send a request through the host's pooled session and rate limiter.
+    Retryable failures are retried with jittered backoff; once attempts run
+    out the last response is returned (or the last connection error raised).
+    idempotent defaults to the method's semantics; a non-idempotent request that
+    may have been processed (read timeout, 5xx) is never sent twice.
+    """
+    if idempotent is None:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+    session, limiter = get_session(url), get_limiter(url)
+
+    def send():
+        limiter.acquire()
+        resp = session.request(method, url, timeout=timeout, **kwargs)
+        limiter.update_from_headers(resp.headers)
+        return resp
+
+    retrying = Retrying(
+        stop=stop_after_attempt(max_attempts),
+        wait=wait_random_exponential(multiplier=BACKOFF_MULTIPLIER, max=MAX_BACKOFF),
+        retry=(retry_if_exception_type(RETRYABLE_EXCEPTIONS) | retry_if_result(should_retry)) if idempotent
+        else (retry_if_exception(not_sent) | retry_if_result(rate_limited)),
+        retry_error_callback=lambda state: state.outcome.result(),
+    )
+    return retrying(send)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def patch(url, **kwargs):
+    return request("PATCH", url, **kwargs)
+
+
+def github_headers(token, accept="application/vnd.github+json"):
+    return {"Authorization": f"token {token}", "Accept": accept}
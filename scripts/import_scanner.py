@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+In-process import scanner for dependency checks.
+- Extracts top-level absolute imports from every project .py file with the ast module
+- Caches results per file in .smartai_cache/import_scan.json, keyed by content hash, so re-runs only parse changed files
+- Maps import names to distributions via importlib.metadata.packages_distributions() and IMPORT_OVERRIDES
+- Filters out the standard library and the project's own modules
+Category: dependencies
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import ast
+import hashlib
+import json
+import re
+from importlib import metadata
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+CACHE_PATH = ROOT / ".smartai_cache" / "import_scan.json"
+EXCLUDE_DIRS = {".git", ".venv", "venv", "env", "node_modules", "__pycache__", ".smartai_cache",
+                "build", "dist", ".tox", ".mypy_cache", ".pytest_cache"}
+
+# Import names whose distribution name differs; consulted before installed metadata,
+# so the check gives the same answer whether or not the package is installed.
+IMPORT_OVERRIDES = {
+    "bs4": "beautifulsoup4",
+    "cv2": "opencv-python",
+    "dateutil": "python-dateutil",
+    "dotenv": "python-dotenv",
+    "git": "GitPython",
+    "github": "PyGithub",
+    "jwt": "PyJWT",
+    "PIL": "Pillow",
+    "sklearn": "scikit-learn",
+    "yaml": "PyYAML",
+}
+
+STDLIB = set(getattr(sys, "stdlib_module_names", ())) | set(sys.builtin_module_names) | {"__future__"}
+
+
+def normalize_name(name):
+    """PEP 503 normalised distribution name."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def extract_imports(source, filename="<unknown>"):
+    """Top-level names of absolute imports in source."""
+    tree = ast.parse(source, filename=filename)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module.split(".")[0])
+    return names
+
+def iter_python_files(root=ROOT):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDE_DIRS and not d.endswith(".egg-info"))
+        for name in sorted(filenames):
+            if name.endswith(".py"):
+                yield Path(dirpath) / name
+
+def load_cache(path=CACHE_PATH):
+    if Path(path).exists():
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {}
+
+def save_cache(cache, path=CACHE_PATH):
+    Path(path).parent.mkdir(exist_ok=True)
+    tmp = Path(path).with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(cache, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp, path)
+
+def scan_project(root=ROOT, cache_path=CACHE_PATH):
+    """
+    {relative path: sorted import names} for every project file. Only files whose
+    content hash changed since the last scan are parsed. Unparseable files map to None.
+    """
+    root = Path(root)
+    cache = load_cache(cache_path)
+    results, changed = {}, False
+    for path in iter_python_files(root):
+        rel = path.relative_to(root).as_posix()
+        data = path.read_bytes()
+        digest = hashlib.sha1(data).hexdigest()
+        entry = cache.get(rel)
+        if not entry or entry["hash"] != digest:
+            try:
+                imports = sorted(extract_imports(data, rel))
+            except (SyntaxError, ValueError):
+                imports = None
+            entry = {"hash": digest, "imports": imports}
+            cache[rel], changed = entry, True
+        results[rel] = entry["imports"]
+    for stale in set(cache) - set(results):
+        del cache[stale]
+        changed = True
+    if changed:
+        save_cache(cache, cache_path)
+    return results
+
+def local_modules(files):
+    """Names importable from the project itself: every module stem and package directory."""
+    names = set()
+    for rel in files:
+        parts = rel.split("/")
+        names.add(parts[-1][:-3])
+        names.update(parts[:-1])
+    return names
+
+def third_party_imports(scan):
+    """{import name: [files]} for imports that are neither stdlib nor project modules."""
+    local = local_modules(scan)
+    found = {}
+    for rel, imports in scan.items():
+        for name in imports or ():
+            if name not in STDLIB and name not in local:
+                found.setdefault(name, []).append(rel)
+    return found
+
+def distributions_for(import_names):
+    """{import name: distribution name}: override table, then installed metadata, then the import name itself."""
+    installed = metadata.packages_distributions()
+    mapping = {}
+    for name in import_names:
+        dists = sorted(installed.get(name) or [name])
+        mapping[name] = IMPORT_OVERRIDES.get(name, dists[0])
+    return mapping
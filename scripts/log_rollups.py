@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Incremental Log Rollups
+- Maintains pre-aggregated tables for the JSONL logs in logs/ (violations, performance, adoption, drift)
+- Reads only the bytes appended since the last refresh; rebuilds a source if it was truncated or rotated
+- Rollups live in .smartai_cache/log_rollups.json and carry a data version for downstream caches
+Category: automation
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import hashlib
+import math
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+from scripts.central_logger import get_logger
+from scripts.central_args import get_arg_parser
+
+LOGS_DIR = Path(__file__).parent.parent / "logs"
+CACHE_DIR = Path(__file__).parent.parent / ".smartai_cache"
+ROLLUP_PATH = CACHE_DIR / "log_rollups.json"
+
+SOURCES = {
+    "violations": "rule_violations.jsonl",
+    "performance": "rule_performance.jsonl",
+    "adoption": "rule_adoption.jsonl",
+    "drift": "rule_drift.jsonl",
+}
+
+# Runtime histogram: log10(ms) from 10^-1 to 10^6, 8 bins per decade (plus under/overflow).
+HIST_MIN_LOG, HIST_MAX_LOG, HIST_BINS_PER_DECADE = -1, 6, 8
+HIST_BINS = (HIST_MAX_LOG - HIST_MIN_LOG) * HIST_BINS_PER_DECADE + 2
+READ_BLOCK = 1 << 20
+
+
+def empty_aggregate(kind):
+    if kind == "violations":
+        return {"total": 0, "auto_fixed": 0, "by_rule": {}, "by_file": {}, "by_date": {}}
+    return {}
+
+
+def day_of(entry):
+    """Best-effort YYYY-MM-DD for a log entry ('date', 'timestamp' or epoch 'ts')."""
+    for key in ("date", "timestamp"):
+        if entry.get(key):
+            return str(entry[key])[:10]
+    if isinstance(entry.get("ts"), (int, float)):
+        return datetime.fromtimestamp(entry["ts"], tz=timezone.utc).strftime("%Y-%m-%d")
+    return "unknown"
+
+
+def runtime_ms(entry):
+    if "runtime_ms" in entry:
+        return float(entry["runtime_ms"])
+    return float(entry.get("duration", 0.0)) * 1000.0
+
+
+def hist_bin(ms):
+    if ms <= 0:
+        return 0
+    pos = (math.log10(ms) - HIST_MIN_LOG) * HIST_BINS_PER_DECADE
+    return int(min(max(pos + 1, 0), HIST_BINS - 1))
+
+
+def hist_value(idx):
+    """Representative runtime (ms) for histogram bin idx (geometric bin centre)."""
+    return 10 ** (HIST_MIN_LOG + (idx - 0.5) / HIST_BINS_PER_DECADE)
+
+
+def hist_quantiles(hist, qs):
+    counts = np.asarray(hist, dtype=np.float64)
+    cum = np.cumsum(counts)
+    if cum[-1] == 0:
+        return [0.0 for _ in qs]
+    return [hist_value(int(np.searchsorted(cum, q * cum[-1]))) for q in qs]
+
+
+def add_entry(kind, agg, entry):
+    if kind == "violations":
+        rule, sev = entry.get("rule", "unknown"), entry.get("severity", "unknown")
+        by_sev = agg["by_rule"].setdefault(rule, {})
+        by_sev[sev] = by_sev.get(sev, 0) + 1
+        file = entry.get("file", "unknown")
+        agg["by_file"][file] = agg["by_file"].get(file, 0) + 1
+        day = day_of(entry)
+        agg["by_date"][day] = agg["by_date"].get(day, 0) + 1
+        agg["total"] += 1
+        agg["auto_fixed"] += 1 if entry.get("auto_fixed") else 0
+    elif kind == "performance":
+        ms = runtime_ms(entry)
+        stats = agg.setdefault(entry.get("rule", "unknown"), {
+            "count": 0, "sum": 0.0, "min": ms, "max": ms, "hist": [0] * HIST_BINS})
+        stats["count"] += 1
+        stats["sum"] += ms
+        stats["min"] = min(stats["min"], ms)
+        stats["max"] = max(stats["max"], ms)
+        stats["hist"][hist_bin(ms)] += 1
+    elif kind == "adoption":
+        if "adoption_rate" in entry:
+            agg[entry.get("rule", "unknown")] = entry["adoption_rate"]
+    elif kind == "drift":
+        days = agg.setdefault(entry.get("rule", "unknown"), {})
+        bucket = days.setdefault(day_of(entry), [0.0, 0])
+        bucket[0] += float(entry.get("drift_score", 0.0))
+        bucket[1] += 1
+
+
+def aggregate(kind, entries):
+    """Aggregate for kind over entries, as refresh_source would build it from a log holding only them."""
+    agg = empty_aggregate(kind)
+    for entry in entries:
+        add_entry(kind, agg, entry)
+    return agg
+
+
+def load_rollups(path=ROLLUP_PATH):
+    if Path(path).exists():
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {"sources": {}, "tables": {}}
+
+
+def refresh_source(rollups, kind, log_path):
+    """Fold lines appended to log_path since the last refresh into rollups. Returns lines read."""
+    state = rollups["sources"].get(kind)
+    if not log_path.exists():
+        rollups["sources"][kind] = {"offset": 0, "inode": None}
+        rollups["tables"][kind] = empty_aggregate(kind)
+        return 0
+    st = log_path.stat()
+    if state is None or state.get("inode") != st.st_ino or st.st_size < state.get("offset", 0):
+        state = {"offset": 0, "inode": st.st_ino}
+        rollups["tables"][kind] = empty_aggregate(kind)
+    agg = rollups["tables"].setdefault(kind, empty_aggregate(kind))
+    read = 0
+    with open(log_path, "rb") as f:
+        f.seek(state["offset"])
+        pending = b""
+        while True:
+            block = f.read(READ_BLOCK)
+            if not block:
+                break
+            pending += block
+            cut = pending.rfind(b"\n") + 1
+            for line in pending[:cut].splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    add_entry(kind, agg, json.loads(line))
+                    read += 1
+                except ValueError:
+                    continue
+            state["offset"] += cut
+            pending = pending[cut:]
+    rollups["sources"][kind] = state
+    return read
+
+
+def data_version(rollups):
+    key = json.dumps(rollups.get("sources", {}), sort_keys=True)
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def refresh_rollups(path=ROLLUP_PATH, logs_dir=LOGS_DIR):
+    """Bring all rollups up to date with logs_dir and persist them if anything changed."""
+    rollups = load_rollups(path)
+    before = data_version(rollups)
+    for kind, name in SOURCES.items():
+        refresh_source(rollups, kind, Path(logs_dir) / name)
+    rollups["version"] = data_version(rollups)
+    if rollups["version"] != before or not Path(path).exists():
+        Path(path).parent.mkdir(exist_ok=True)
+        # A private temp file per writer: concurrent refreshes must not interleave writes to one .tmp path.
+        with tempfile.NamedTemporaryFile("w", dir=Path(path).parent, prefix=Path(path).name, suffix=".tmp",
+                                         delete=False) as f:
+            json.dump(rollups, f, separators=(",", ":"))
+        os.replace(f.name, path)
+    return rollups
+
+
+def downsample(xs, ys, max_points):
+    """Bucket-average a series down to at most max_points points (keeps first x of each bucket)."""
+    if len(xs) <= max_points:
+        return list(xs), list(ys)
+    idx = np.array_split(np.arange(len(xs)), max_points)
+    values = np.asarray(ys, dtype=np.float64)
+    return [xs[i[0]] for i in idx], [float(values[i].mean()) for i in idx]
+
+
+def main():
+    parser = get_arg_parser()
+    parser.add_argument('--update', action='store_true', help='Refresh rollups from logs/')
+    args = parser.parse_args()
+    logger = get_logger(debug=args.debug)
+    if args.update:
+        rollups = refresh_rollups()
+        total = rollups["tables"].get("violations", {}).get("total", 0)
+        logger.info(f"Rollups refreshed (version {rollups['version']}, {total} violations).")
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Notification Outbox
+- Durable SQLite outbox: checks enqueue Slack/email/GitHub notifications instead of sending inline
+- An asyncio dispatcher drains the outbox, fanning out to every channel concurrently; senders yield one
+  result per digest and each digest gets its own timeout
+- Bursts queued for the same channel are coalesced into digests; email digests share one SMTP connection
+- Failed sends stay queued and are retried on the next dispatch (up to MAX_ATTEMPTS)
+- A send that times out may still be delivered by its worker thread, so it is marked unknown and not
+  re-sent automatically; --retry-unknown queues unknown messages again once they have been checked.
+  A timeout or error stops that channel: the digests after it stay queued without an attempt counted
+- Usage: python scripts/notification_outbox.py --dispatch
+Category: automation
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+from scripts.central_logger import get_logger
+from scripts.central_args import get_arg_parser
+
+OUTBOX_PATH = Path(__file__).parent.parent / ".smartai_cache" / "notification_outbox.db"
+CHANNELS = ("slack", "email", "github")
+MAX_ATTEMPTS = 5
+DISPATCH_TIMEOUT = 60  # seconds per digest
+_DONE = object()
+# Messages per digest; Slack truncates very long messages, so larger bursts become several digests.
+DIGEST_SIZE = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    source TEXT,
+    created REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    sent REAL,
+    unknown REAL,
+    last_error TEXT
+)
+"""
+
+
+def connect(path=OUTBOX_PATH):
+    Path(path).parent.mkdir(exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30)
+    conn.execute(SCHEMA)
+    if "unknown" not in {row[1] for row in conn.execute("PRAGMA table_info(outbox)")}:
+        conn.execute("ALTER TABLE outbox ADD COLUMN unknown REAL")
+    return conn
+
+def enqueue(channel, body, subject="SmartAIPlatform Notification", source=None, path=OUTBOX_PATH):
+    """Queue a notification for the next dispatch. Returns its outbox id."""
+    if channel not in CHANNELS:
+        raise ValueError(f"Unknown notification channel: {channel}")
+    with connect(path) as conn:
+        cur = conn.execute(
+            "INSERT INTO outbox (channel, subject, body, source, created) VALUES (?, ?, ?, ?, ?)",
+            (channel, subject, body, source, time.time()))
+        return cur.lastrowid
+
+def pending(path=OUTBOX_PATH):
+    """Unsent messages grouped by channel, oldest first: {channel: [(id, subject, body), ...]}."""
+    with connect(path) as conn:
+        rows = conn.execute(
+            "SELECT id, channel, subject, body FROM outbox WHERE sent IS NULL AND unknown IS NULL AND attempts < ? "
+            "ORDER BY id",
+            (MAX_ATTEMPTS,)).fetchall()
+    grouped = {}
+    for msg_id, channel, subject, body in rows:
+        grouped.setdefault(channel, []).append((msg_id, subject, body))
+    return grouped
+
+def coalesce(messages, size=DIGEST_SIZE):
+    """
+    Collapse queued messages into digests of up to size messages.
+    Returns [(ids, subject, body)]; a lone message is passed through unchanged.
+    """
+    digests = []
+    for i in range(0, len(messages), size):
+        batch = messages[i:i + size]
+        ids = [m[0] for m in batch]
+        if len(batch) == 1:
+            digests.append((ids, batch[0][1], batch[0][2]))
+            continue
+        subjects = sorted({m[1] for m in batch})
+        subject = f"SmartAIPlatform digest: {len(batch)} notifications ({', '.join(subjects)})"
+        body = "\n\n".join(f"*{m[1]}*\n{m[2]}" for m in batch)
+        digests.append((ids, subject, body))
+    return digests
+
+# Senders take a channel's digests and yield one ok per digest, in order, as each is sent.
+
+def send_slack(digests):
+    from scripts.notify_slack import send_slack_notification
+    for _, _, body in digests:
+        yield send_slack_notification(body)
+
+def send_email(digests):
+    from scripts.notify_email import iter_email_batch
+    yield from iter_email_batch([(subject, body) for _, subject, body in digests])
+
+def send_github(digests):
+    from scripts import http_client
+    token, repo = os.environ.get("GITHUB_TOKEN"), os.environ.get("GITHUB_REPOSITORY")
+    if not (token and repo):
+        get_logger().error("GITHUB_TOKEN and GITHUB_REPOSITORY must be set for GitHub notifications.")
+        yield from (False for _ in digests)
+        return
+    url = f"{http_client.GITHUB_API}/repos/{repo}/issues"
+    for _, subject, body in digests:
+        resp = http_client.post(url, json={"title": subject, "body": body}, headers=http_client.github_headers(token))
+        yield resp.status_code in (200, 201)
+
+SENDERS = {
+    "slack": send_slack,
+    "email": send_email,
+    "github": send_github,
+}
+
+def mark(results, path=OUTBOX_PATH):
+    """
+    results: [(ids, ok, error)]. Sent messages are stamped; failures count an attempt; ok None (timed out,
+    outcome unknown) stamps the unknown column so the message is not sent twice.
+    """
+    now = time.time()
+    with connect(path) as conn:
+        for ids, ok, error in results:
+            for msg_id in ids:
+                if ok:
+                    conn.execute("UPDATE outbox SET sent = ?, attempts = attempts + 1, last_error = NULL WHERE id = ?",
+                                 (now, msg_id))
+                elif ok is None:
+                    conn.execute("UPDATE outbox SET unknown = ?, attempts = attempts + 1, last_error = ? WHERE id = ?",
+                                 (now, error, msg_id))
+                else:
+                    conn.execute("UPDATE outbox SET attempts = attempts + 1, last_error = ? WHERE id = ?",
+                                 (error, msg_id))
+
+async def dispatch_channel(channel, digests, timeout, senders):
+    """
+    [(ids, ok, error)] for the digests the channel's sender got to. Each digest has its own timeout;
+    a timeout or error stops the channel, leaving the later digests queued and unattempted.
+    """
+    outcomes = []
+
+    def step():
+        # Senders are blocking (requests/smtplib); every step runs off the event loop.
+        if not outcomes:
+            outcomes.append(iter(senders[channel](digests)))
+        return next(outcomes[0], _DONE)
+
+    results = []
+    for ids, _, _ in digests:
+        try:
+            ok = await asyncio.wait_for(asyncio.to_thread(step), timeout)
+        except asyncio.TimeoutError:
+            # The worker thread cannot be cancelled and may still deliver: the outcome is unknown.
+            # It stops at the sender's next yield, so nothing after this digest is sent.
+            results.append((ids, None, f"timed out after {timeout}s"))
+            break
+        except Exception as e:
+            results.append((ids, False, str(e)))
+            break
+        if ok is _DONE:
+            break
+        results.append((ids, bool(ok), None if ok else "send failed"))
+    return results
+
+async def dispatch_async(path=OUTBOX_PATH, timeout=DISPATCH_TIMEOUT, senders=SENDERS):
+    """Send and mark everything queued. Returns ([(ids, ok, error)] for attempted digests, messages queued)."""
+    queued = {channel: messages for channel, messages in pending(path).items() if channel in senders}
+    jobs = [dispatch_channel(channel, coalesce(messages), timeout, senders) for channel, messages in queued.items()]
+    results = [r for channel_results in await asyncio.gather(*jobs) for r in channel_results]
+    mark(results, path)
+    return results, sum(len(messages) for messages in queued.values())
+
+def dispatch(path=OUTBOX_PATH, timeout=DISPATCH_TIMEOUT, senders=SENDERS):
+    """Drain the outbox. Returns (messages sent, messages still queued, messages with unknown outcome)."""
+    results, queued = asyncio.run(dispatch_async(path, timeout, senders))
+    sent = sum(len(ids) for ids, ok, _ in results if ok)
+    unknown = sum(len(ids) for ids, ok, _ in results if ok is None)
+    return sent, queued - sent - unknown, unknown
+
+def retry_unknown(path=OUTBOX_PATH):
+    """Queue messages whose send timed out again. Returns how many were re-queued."""
+    with connect(path) as conn:
+        return conn.execute("UPDATE outbox SET unknown = NULL WHERE sent IS NULL AND unknown IS NOT NULL").rowcount
+
+def status(path=OUTBOX_PATH):
+    with connect(path) as conn:
+        return conn.execute(
+            "SELECT channel, SUM(sent IS NULL AND unknown IS NULL AND attempts < ?), SUM(sent IS NOT NULL), "
+            "SUM(sent IS NULL AND unknown IS NULL AND attempts >= ?), SUM(sent IS NULL AND unknown IS NOT NULL) "
+            "FROM outbox GROUP BY channel", (MAX_ATTEMPTS, MAX_ATTEMPTS)).fetchall()
+
+def main():
+    parser = get_arg_parser()
+    parser.add_argument('--dispatch', action='store_true', help='Send all queued notifications')
+    parser.add_argument('--status', action='store_true', help='Show queued/sent/failed counts per channel')
+    parser.add_argument('--retry-unknown', action='store_true', help='Re-queue messages whose send timed out')
+    parser.add_argument('--timeout', type=float, default=DISPATCH_TIMEOUT, help='Per-digest send timeout in seconds')
+    args = parser.parse_args()
+    logger = get_logger(debug=args.debug)
+    if args.dispatch:
+        sent, failed, unknown = dispatch(timeout=args.timeout)
+        logger.info(f"Notifications dispatched: {sent} sent, {failed} still queued.")
+        if unknown:
+            logger.warning(f"{unknown} notification(s) timed out and may have been delivered; "
+                           "check, then --retry-unknown to send them again.")
+    elif args.retry_unknown:
+        logger.info(f"Re-queued {retry_unknown()} notification(s) with unknown outcome.")
+    elif args.status:
+        for channel, queued, sent, failed, unknown in status():
+            logger.info(f"{channel}: {queued} queued, {sent} sent, {failed} failed, {unknown} unknown")
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
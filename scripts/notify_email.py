@@ -12,35 +12,61 @@ from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
 
 parser = get_arg_parser()
-args = parser.parse_args()
+args, _ = parser.parse_known_args()
 logger = get_logger(debug=args.debug)
-def send_email_notification(subject, body, to_email=None):
-    """Minimal stub for import compatibility. Sends an email notification if environment is set."""
-    smtp_server = os.environ.get("SMTP_SERVER")
-    smtp_port = int(os.environ.get("SMTP_PORT", "587"))
-    smtp_user = os.environ.get("SMTP_USER")
-    smtp_pass = os.environ.get("SMTP_PASS")
-    notify_email = to_email or os.environ.get("NOTIFY_EMAIL")
-    if not (smtp_server and smtp_user and smtp_pass and notify_email):
+def smtp_settings():
+    settings = {
+        "server": os.environ.get("SMTP_SERVER"),
+        "port": int(os.environ.get("SMTP_PORT", "587")),
+        "user": os.environ.get("SMTP_USER"),
+        "password": os.environ.get("SMTP_PASS"),
+        "to": os.environ.get("NOTIFY_EMAIL"),
+    }
+    if not (settings["server"] and settings["user"] and settings["password"] and settings["to"]):
         logger.error("SMTP_SERVER, SMTP_USER, SMTP_PASS, and NOTIFY_EMAIL must be set.")
         logger.error("Missing environment variables. Please set SMTP_SERVER, SMTP_USER, SMTP_PASS, and NOTIFY_EMAIL in your .env file or environment.")
         logger.error("See docs/email_setup.md for details.")
-        return False
-    msg = EmailMessage()
-    msg.set_content(body)
-    msg["Subject"] = subject
-    msg["From"] = smtp_user
-    msg["To"] = notify_email
-    try:
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(smtp_user, smtp_pass)
+        return None
+    return settings
+
+def iter_email_batch(messages, to_email=None):
+    """
+    Send (subject, body) pairs over a single SMTP connection (one STARTTLS
+    handshake and login for the whole batch), yielding once per message as it
+    is sent: True when delivered, False for every message if SMTP is not
+    configured. Connection and send errors are raised to the caller.
+    """
+    settings = smtp_settings() if messages else None
+    if settings is None:
+        yield from (False for _ in messages)
+        return
+    with smtplib.SMTP(settings["server"], settings["port"]) as server:
+        server.starttls()
+        server.login(settings["user"], settings["password"])
+        for subject, body in messages:
+            msg = EmailMessage()
+            msg.set_content(body)
+            msg["Subject"] = subject
+            msg["From"] = settings["user"]
+            msg["To"] = to_email or settings["to"]
             server.send_message(msg)
-        logger.info("Email notification sent.")
-        return True
+            yield True
+
+def send_email_batch(messages, to_email=None):
+    """Send (subject, body) pairs over a single SMTP connection. Returns the number sent."""
+    sent = 0
+    try:
+        for ok in iter_email_batch(messages, to_email):
+            sent += ok
+        if sent:
+            logger.info(f"Email notifications sent: {sent}.")
     except Exception as e:
         logger.error(f"Failed to send email: {e}")
-        return False
+    return sent
+
+def send_email_notification(subject, body, to_email=None):
+    """Sends an email notification if environment is set."""
+    return send_email_batch([(subject, body)], to_email) == 1
 
 def main():
     logger = get_logger(debug=args.debug)
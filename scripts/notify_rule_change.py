@@ -3,6 +3,7 @@
 Rule Change Notification Script
 - Detects changes to rule_mapping.json or .smartai_rules.yaml
 - Notifies via Slack and/or email if rules are added, removed, or modified
+  (queued in the notification outbox; see notification_outbox.py)
 Category: automation
 """
 import os
@@ -13,8 +14,7 @@ import difflib
 from pathlib import Path
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
-from scripts.notify_slack import send_slack_notification
-from scripts.notify_email import send_email_notification
+from scripts.notification_outbox import enqueue
 
 RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
 RULE_CONFIG_PATH = Path(__file__).parent.parent / ".smartai_rules.yaml"
@@ -95,9 +95,9 @@ def main():
     logger.info(full_msg)
     # Notify
     if args.slack:
-        send_slack_notification(full_msg)
+        enqueue("slack", full_msg, subject="Rule Change Notification", source="notify_rule_change")
     if args.email:
-        send_email_notification(subject="Rule Change Notification", body=full_msg)
+        enqueue("email", full_msg, subject="Rule Change Notification", source="notify_rule_change")
     # Update snapshots if requested
     if args.update_snapshots:
         save_snapshot("rule_mapping.json", mapping)
@@ -6,13 +6,13 @@ Category: automation
 import os
 import sys
 import smtplib
-import requests
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts import http_client
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
 
 parser = get_arg_parser()
-args = parser.parse_args()
+args, _ = parser.parse_known_args()
 logger = get_logger(debug=args.debug)
 def send_slack_notification(message, webhook_url=None):
     """
@@ -27,7 +27,7 @@ def send_slack_notification(message, webhook_url=None):
         logger.error("SLACK_WEBHOOK_URL not set.")
         return False
     payload = {"text": message}
-    resp = requests.post(webhook_url, json=payload)
+    resp = http_client.post(webhook_url, json=payload)
     if resp.status_code != 200:
         logger.error(f"Failed to send Slack notification: {resp.text}")
         return False
@@ -42,7 +42,7 @@ def main():
             sys.exit(1)
         message = sys.stdin.read()
         payload = {"text": message}
-        resp = requests.post(webhook_url, json=payload)
+        resp = http_client.post(webhook_url, json=payload)
         if resp.status_code != 200:
             logger.error(f"Failed to send Slack notification: {resp.text}")
         else:
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+CODEOWNERS-style file ownership
+- file_ownership.json maps patterns to owners, in order; the last matching pattern wins
+- Patterns: exact paths ("scripts/run_all_checks.py"), directories ("scripts/plugins/"), bare names matched at any
+  depth ("README.md", "docs/"), and globs ("*.md", "tests/**/test_*.py"); a leading "/" anchors a bare name to the root
+- Literal patterns are dict lookups and directory patterns (literal or glob) are resolved once per directory;
+  file globs are compiled into one anchored regex per literal directory prefix, so a path is only matched
+  against the globs that can apply to its directory
+- Usage: from scripts.ownership import get_ownership; get_ownership().owners_for(paths)
+Category: automation
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import re
+from pathlib import Path
+
+FILE_OWNERSHIP_PATH = Path(__file__).parent.parent / "file_ownership.json"
+GLOB_CHARS = set("*?[")
+
+
+def glob_to_regex(glob):
+    """Regex source for a path glob: * and ? stay within a path segment, ** spans segments."""
+    out, i = [], 0
+    while i < len(glob):
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif glob[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif glob[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif glob[i] == "[" and "]" in glob[i + 1:]:
+            end = glob.index("]", i + 1)
+            inner = glob[i + 1:end].replace("\\", "\\\\")
+            out.append("[" + ("^" + inner[1:] if inner.startswith("!") else inner) + "]")
+            i = end + 1
+        else:
+            out.append(re.escape(glob[i]))
+            i += 1
+    return "".join(out)
+
+
+class Ownership:
+    """Compiled matcher for an ordered {pattern: owner} mapping. Use get_ownership() for the cached instance."""
+
+    def __init__(self, patterns):
+        if not isinstance(patterns, dict):
+            raise ValueError("file ownership must be a JSON object of pattern -> owner")
+        self.patterns = patterns
+        self.owners = list(patterns.values())
+        self.exact, self.names = {}, {}          # whole path / basename at any depth -> rule index
+        self.dir_paths, self.dir_names = {}, {}  # directory path / directory name at any depth -> rule index
+        dir_globs, file_globs = {}, {}           # literal directory prefix -> [(rule index, regex source)]
+        for index, (pattern, owner) in enumerate(patterns.items()):
+            directory = pattern.endswith("/") or pattern.endswith("/**")
+            body = pattern[:-3] if pattern.endswith("/**") else pattern.rstrip("/")
+            anchored = body.startswith("/") or "/" in body
+            body = body.lstrip("/")
+            if GLOB_CHARS & set(body):
+                prefix = []
+                if anchored:
+                    for segment in body.split("/"):
+                        if GLOB_CHARS & set(segment):
+                            break
+                        prefix.append(segment)
+                source = ("" if anchored else "(?:.*/)?") + glob_to_regex(body)
+                (dir_globs if directory else file_globs).setdefault("/".join(prefix), []).append((index, source))
+                continue
+            if not directory:
+                (self.exact if anchored else self.names)[body] = index
+            (self.dir_paths if anchored else self.dir_names)[body] = index
+        # A directory glob matches a file iff it matches one of the file's ancestor directories, so it is
+        # evaluated once per directory (against "dir/"); file globs are tried per file, but only the
+        # buckets whose literal prefix is an ancestor of the file's directory
+        self.dir_globs = {prefix: self._compile(rules, "/.*") for prefix, rules in dir_globs.items()}
+        self.file_globs = {prefix: self._compile(rules, "(?:/.*)?") for prefix, rules in file_globs.items()}
+        self._dir_memo = {}
+
+    @staticmethod
+    def _compile(rules, suffix):
+        """
+        One regex for rules, last rule first, so the first alternative that matches is the winning rule.
+        The whole alternation is anchored: use it with fullmatch().
+        """
+        return re.compile("(?:" + "|".join(f"(?P<r{index}>{source}{suffix})" for index, source in reversed(rules)) + ")")
+
+    @staticmethod
+    def _glob_index(regex, text):
+        match = regex.fullmatch(text)
+        return int(match.lastgroup[1:]) if match else -1
+
+    def _dir_entry(self, directory):
+        """(winning directory-rule index, applicable file-glob regexes) for files directly inside directory."""
+        entry = self._dir_memo.get(directory)
+        if entry is None:
+            if directory:
+                parent, _, name = directory.rpartition("/")
+                index, regexes = self._dir_entry(parent)
+                index = max(index, self.dir_paths.get(directory, -1), self.dir_names.get(name, -1))
+            else:
+                index, regexes = -1, ()
+            for prefix, regex in self.dir_globs.items():
+                if not prefix or directory == prefix or directory.startswith(prefix + "/"):
+                    index = max(index, self._glob_index(regex, directory + "/"))
+            if directory in self.file_globs:
+                regexes = regexes + (self.file_globs[directory],)
+            entry = self._dir_memo[directory] = (index, regexes)
+        return entry
+
+    def rule_index(self, path):
+        """Index of the last pattern matching path, or -1."""
+        path = str(path).replace("\\", "/")
+        if path.startswith("./"):
+            path = path[2:]
+        directory, _, name = path.rpartition("/")
+        best, regexes = self._dir_entry(directory)
+        best = max(best, self.exact.get(path, -1), self.names.get(name, -1))
+        for regex in regexes:
+            best = max(best, self._glob_index(regex, path))
+        return best
+
+    def owner_of(self, path):
+        index = self.rule_index(path)
+        return self.owners[index] if index >= 0 else None
+
+    def get(self, path, default=None):
+        owner = self.owner_of(path)
+        return default if owner is None else owner
+
+    def owners_for(self, paths):
+        """{path: owner} for the paths that have an owner."""
+        owners = {}
+        for path in paths:
+            index = self.rule_index(path)
+            if index >= 0:
+                owners[path] = self.owners[index]
+        return owners
+
+
+_cache = {}
+
+
+def get_ownership(path=FILE_OWNERSHIP_PATH):
+    """Ownership for path ({} if missing), recompiled only when the file's mtime or size changes."""
+    path = Path(path)
+    try:
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        key = None
+    cached = _cache.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    patterns = {}
+    if key is not None:
+        with open(path) as f:
+            patterns = json.load(f)
+    ownership = Ownership(patterns)
+    _cache[path] = (key, ownership)
+    return ownership
@@ -3,6 +3,13 @@
 Automated PR Feedback Bot
 - Posts inline comments on pull requests for rule violations
 - Summarizes violations and suggests fixes with doc links
+- Reports the violations of the latest recorded run (logs/latest_run.json, or --run-summary), not the
+  whole violation log
+- Sends the comments as one pull-request review, split into several when the body would pass GitHub's
+  65,536-character limit; diff positions come from one fetch of the PR's file patches
+- Remembers posted violations in .smartai_cache, so re-runs on new pushes only post what is new;
+  each review body carries <!-- fingerprint:... --> markers, so a cold cache (e.g. a fresh CI
+  runner) is rebuilt from the PR's existing reviews
 - Integrates with GitHub API (requires GITHUB_TOKEN)
 Category: automation
 """
@@ -10,18 +17,15 @@ import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import json
+import re
 from pathlib import Path
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts import http_client
+from scripts.run_history import LATEST_RUN, fingerprint, load_latest_summary, load_latest_violations
 
-try:
-    from github import Github
-except ImportError:
-    print("PyGithub required. Install with: pip install PyGithub")
-    sys.exit(1)
-
-LOGS_DIR = Path(__file__).parent.parent / "logs"
-VIOLATION_LOG = LOGS_DIR / "rule_violations.jsonl"
+ROOT = Path(__file__).parent.parent
+POSTED_CACHE = ROOT / ".smartai_cache" / "pr_feedback_posted.json"
 
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
 REPO_NAME = os.environ.get("GITHUB_REPOSITORY")  # e.g. 'owner/repo'
@@ -29,16 +33,181 @@ PR_NUMBER = os.environ.get("PR_NUMBER")
 
 DOCS_BASE = "https://github.com/OWNER/REPO/blob/main/docs/python_script_coding_rules.md"
 
+HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+FINGERPRINT_RE = re.compile(r"<!-- fingerprint:([0-9a-f]{16}) -->")
+# GitHub rejects review bodies over 65,536 characters.
+MAX_BODY_CHARS = 65536
+# Room for the "## Rule Violations (N) (part i/n)" heading.
+HEADING_CHARS = 64
+
+
+def load_posted(path=POSTED_CACHE):
+    if Path(path).exists():
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+def save_posted(posted, path=POSTED_CACHE):
+    Path(path).parent.mkdir(exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(posted, f, indent=2, sort_keys=True)
+
+def seed_posted(repo, pr_number, token, logger, api=http_client.GITHUB_API):
+    """Fingerprints recorded in the markers of the PR's existing reviews (cold cache)."""
+    seen = set()
+    url = f"{api}/repos/{repo}/pulls/{pr_number}/reviews?per_page=100"
+    while url:
+        resp = http_client.get(url, headers=http_client.github_headers(token))
+        if resp.status_code != 200:
+            logger.error(f"Failed to list reviews on PR #{pr_number}: {resp.text}")
+            return seen
+        for review in resp.json():
+            seen.update(FINGERPRINT_RE.findall(review.get("body") or ""))
+        url = (resp.links or {}).get("next", {}).get("url")
+    return seen
+
+def relative_path(file):
+    """Violation paths may be absolute; the GitHub API wants repo-relative paths."""
+    path = Path(file)
+    if path.is_absolute():
+        try:
+            return path.resolve().relative_to(ROOT.resolve()).as_posix()
+        except ValueError:
+            pass
+    return path.as_posix()
+
+def patch_positions(patch):
+    """Map new-file line numbers to diff positions for one file's patch."""
+    positions, position, line = {}, 0, None
+    for text in patch.splitlines():
+        match = HUNK_RE.match(text)
+        if match:
+            # The first hunk header is position 0; later headers count as diff lines.
+            if line is not None:
+                position += 1
+            line = int(match.group(1))
+            continue
+        if line is None:
+            continue
+        position += 1
+        if text.startswith("-") or text.startswith("\\"):
+            continue
+        positions[line] = position
+        line += 1
+    return positions
+
+def build_position_index(files):
+    return {f["filename"]: patch_positions(f.get("patch") or "") for f in files}
+
+def fetch_pr(repo, pr_number, token, api=http_client.GITHUB_API):
+    """Head SHA and changed files (with patches) of a pull request."""
+    headers = http_client.github_headers(token)
+    resp = http_client.get(f"{api}/repos/{repo}/pulls/{pr_number}", headers=headers)
+    resp.raise_for_status()
+    head_sha = resp.json()["head"]["sha"]
+    files = []
+    url = f"{api}/repos/{repo}/pulls/{pr_number}/files?per_page=100"
+    while url:
+        resp = http_client.get(url, headers=headers)
+        resp.raise_for_status()
+        files.extend(resp.json())
+        url = (resp.links or {}).get("next", {}).get("url")
+    return head_sha, files
+
+def violation_message(v):
+    msg = f"Rule violation: **{v['rule']}**\n{v.get('message','')}\n"
+    if v.get('auto_fix_suggestion'):
+        msg += f"Suggested fix: `{v['auto_fix_suggestion']}`\n"
+    msg += f"[See docs]({DOCS_BASE}#{v['rule']})"
+    return msg
 
-def load_violations():
-    if not VIOLATION_LOG.exists():
+def outside_line(path, v):
+    return f"- **{v['rule']}** in `{path}`: {v.get('message','')}\n"
+
+def marker(v):
+    return f"<!-- fingerprint:{fingerprint(v)} -->\n"
+
+def build_review(violations, index, head_sha, part=None):
+    """
+    One review payload: inline comments for violations on lines in the diff
+    (grouped by file/line), everything else listed in the review body, which
+    ends with a fingerprint marker per violation.
+    """
+    comments, outside = {}, []
+    for v in violations:
+        path = relative_path(v['file'])
+        position = index.get(path, {}).get(v.get('line') or 1)
+        if position is None:
+            outside.append((path, v))
+        else:
+            comments.setdefault((path, position), []).append(violation_message(v))
+    body = f"## Rule Violations ({len(violations)})"
+    if part:
+        body += f" (part {part[0]}/{part[1]})"
+    body += "\n" + "".join(outside_line(path, v) for path, v in outside)
+    body += "".join(marker(v) for v in violations)
+    return {
+        "commit_id": head_sha,
+        "event": "COMMENT",
+        "body": body,
+        "comments": [{"path": path, "position": position, "body": '\n---\n'.join(msgs)}
+                     for (path, position), msgs in comments.items()],
+    }
+
+def build_reviews(violations, index, head_sha, max_body=MAX_BODY_CHARS):
+    """Review payloads covering violations, split so that no review body is longer than max_body."""
+    chunks, used = [[]], HEADING_CHARS
+    for v in violations:
+        # Each violation adds its fingerprint marker, plus a body line when it is outside the diff.
+        path = relative_path(v['file'])
+        cost = len(marker(v))
+        if index.get(path, {}).get(v.get('line') or 1) is None:
+            cost += len(outside_line(path, v))
+        if chunks[-1] and used + cost > max_body:
+            chunks.append([])
+            used = HEADING_CHARS
+        chunks[-1].append(v)
+        used += cost
+    if len(chunks) == 1:
+        return [build_review(chunks[0], index, head_sha)]
+    return [build_review(chunk, index, head_sha, (i, len(chunks))) for i, chunk in enumerate(chunks, 1)]
+
+def post_feedback(repo, pr_number, token, violations, logger, api=http_client.GITHUB_API, cache_path=POSTED_CACHE):
+    """
+    Post violations not already posted on this PR as reviews (one unless the body limit splits them).
+    Returns the review payloads posted; each is recorded as soon as it is accepted.
+    """
+    posted = load_posted(cache_path)
+    key = f"{repo}#{pr_number}"
+    if key not in posted:
+        posted[key] = sorted(seed_posted(repo, pr_number, token, logger, api))
+    seen = set(posted[key])
+    new = [v for v in violations if fingerprint(v) not in seen]
+    if not new:
+        logger.info("No new rule violations to report.")
+        save_posted(posted, cache_path)
         return []
-    with open(VIOLATION_LOG) as f:
-        return [json.loads(line) for line in f if line.strip()]
+    head_sha, files = fetch_pr(repo, pr_number, token, api)
+    sent = []
+    for review in build_reviews(new, build_position_index(files), head_sha):
+        resp = http_client.post(f"{api}/repos/{repo}/pulls/{pr_number}/reviews", json=review,
+                                headers=http_client.github_headers(token))
+        if resp.status_code not in (200, 201):
+            logger.error(f"Failed to post review on PR #{pr_number}: {resp.text}")
+            break
+        seen.update(FINGERPRINT_RE.findall(review["body"]))
+        posted[key] = sorted(seen)
+        save_posted(posted, cache_path)
+        sent.append(review)
+    comments = sum(len(review["comments"]) for review in sent)
+    logger.info(f"PR feedback posted: {len(sent)} review(s), {comments} inline comments, {len(new)} new violations.")
+    return sent
 
 def main():
     parser = get_arg_parser()
     parser.add_argument('--pr', type=int, help='PR number (overrides env)')
+    parser.add_argument('--run-summary', type=str, default=str(LATEST_RUN),
+                        help='Run summary whose violations are reported (default: logs/latest_run.json)')
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
     pr_number = args.pr if args.pr is not None else os.environ.get("PR_NUMBER")
@@ -49,35 +218,14 @@ def main():
         print("Missing environment variables. Please set GITHUB_TOKEN, GITHUB_REPOSITORY, and PR_NUMBER in your .env file or environment.")
         print("See docs/github_setup.md for details.")
         sys.exit(1)
-    g = Github(GITHUB_TOKEN)
-    repo = g.get_repo(REPO_NAME)
-    pr = repo.get_pull(int(pr_number))
-    violations = load_violations()
+    summary, violations = load_latest_violations(load_latest_summary(args.run_summary))
+    if summary is None:
+        logger.info("No run summary recorded; run scripts/run_all_checks.py first.")
+        return
     if not violations:
         logger.info("No rule violations to report.")
         return
-    # Group by file/line
-    comments = {}
-    for v in violations:
-        key = (v['file'], v.get('line', 1))
-        msg = f"Rule violation: **{v['rule']}**\n{v.get('message','')}\n"
-        if v.get('auto_fix_suggestion'):
-            msg += f"Suggested fix: `{v['auto_fix_suggestion']}`\n"
-        msg += f"[See docs]({DOCS_BASE}#{v['rule']})"
-        comments.setdefault(key, []).append(msg)
-    # Post review comments
-    for (file, line), msgs in comments.items():
-        body = '\n---\n'.join(msgs)
-        try:
-            pr.create_review_comment(body, pr.get_commits()[0].sha, file, line)
-        except Exception as e:
-            logger.error(f"Failed to comment on {file}:{line}: {e}")
-    # Post summary
-    summary = f"## Rule Violations ({len(violations)})\n"
-    for v in violations:
-        summary += f"- **{v['rule']}** in `{v['file']}`: {v.get('message','')}\n"
-    pr.create_issue_comment(summary)
-    logger.info("PR feedback posted.")
+    post_feedback(repo_name, int(pr_number), github_token, violations, logger)
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
 Bot to comment on PRs with rule violations and suggestions (GitHub Actions usage).
+- Reads the latest run summary and its violations (see run_history.py); a markdown report on stdin is still accepted
+- --run-summary reads a saved copy of a run summary instead, so later runs cannot swap in their results
+- Uploads file/line annotations to the check run in 50-per-request chunks, sent in parallel
 Category: automation
 """
 
@@ -8,11 +11,18 @@ Category: automation
 import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-import requests
-import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts import http_client
+from scripts.run_history import LATEST_RUN, load_latest_summary, load_latest_violations
+from scripts.pr_feedback_bot import relative_path
+
+# GitHub accepts at most 50 annotations per check-run update.
+ANNOTATIONS_PER_REQUEST = 50
+CHECK_RUN_TITLE = "Rule Violation Report"
+ANNOTATION_LEVELS = {"error": "failure", "critical": "failure", "warning": "warning"}
 
 
 def parse_violations(markdown):
@@ -43,38 +53,73 @@ def parse_violations(markdown):
     return violations
 
 def post_pr_comment(pr_url, token, body, logger):
-    headers = {"Authorization": f"token {token}"}
-    resp = requests.post(f"{pr_url}/comments", json={"body": body}, headers=headers)
+    resp = http_client.post(f"{pr_url}/comments", json={"body": body}, headers=http_client.github_headers(token))
     if resp.status_code not in (200, 201):
         logger.error(f"Failed to comment on PR: {resp.text}")
     else:
         logger.info("Commented on PR with rule violations.")
 
-def post_check_run_annotations(token, check_run_id, repo, sha, violations, logger):
+def load_structured_results(path=LATEST_RUN):
+    """Failed scripts and violations of the run summarized in path, or (None, []) if there is none."""
+    summary, violations = load_latest_violations(load_latest_summary(path))
+    if summary is None:
+        return None, []
+    return summary.get("failed_scripts", []), violations
+
+def render_comment(failed, violations):
+    lines = [f"## Rule Violations ({len(violations)})", "", "| Script | Category | Status |", "|---|---|---|"]
+    lines += [f"| {r['script']} | {r.get('category') or ''} | {r['status']} |" for r in failed]
+    return "\n".join(lines) + "\n"
+
+def build_annotations(violations):
+    annotations = []
+    for v in violations:
+        line = v.get("line") or 1
+        annotations.append({
+            "path": relative_path(v["file"]),
+            "start_line": line,
+            "end_line": line,
+            "annotation_level": ANNOTATION_LEVELS.get(v.get("severity"), "notice"),
+            "title": v["rule"],
+            "message": v.get("message") or v["rule"],
+        })
+    return annotations
+
+def post_check_run_annotations(token, check_run_id, repo, sha, violations, logger, failed=None,
+                               api=http_client.GITHUB_API, workers=8):
     """
-    Post annotations to GitHub Checks API for each violation (summary only, not true inline).
+    Upload violations to a check run as file/line annotations.
+    Every update carries the same title and summary; the first chunk goes out
+    alone so the output exists before the remaining chunks append to it in parallel.
+    Returns the number of annotations accepted.
     """
-    url = f"https://api.github.com/repos/{repo}/check-runs/{check_run_id}"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github+json"
-    }
-    summary = f"Rule violations detected: {len(violations)}\n" + '\n'.join(f"- {v['script']} [{v['category']}]" for v in violations)
-    data = {
-        "output": {
-            "title": "Rule Violation Report",
-            "summary": summary,
-            "annotations": []  # Could be filled with file/line if available
-        }
-    }
-    resp = requests.patch(url, headers=headers, data=json.dumps(data))
-    if resp.status_code not in (200, 201):
-        logger.error(f"Failed to update check run: {resp.text}")
-    else:
-        logger.info("Updated GitHub Check Run with summary.")
+    url = f"{api}/repos/{repo}/check-runs/{check_run_id}"
+    headers = http_client.github_headers(token)
+    failed = failed or []
+    summary = f"Rule violations detected: {len(violations)}\n" + '\n'.join(
+        f"- {r['script']} [{r.get('category') or ''}]" for r in failed)
+    annotations = build_annotations(violations)
+    chunks = [annotations[i:i + ANNOTATIONS_PER_REQUEST] for i in range(0, len(annotations), ANNOTATIONS_PER_REQUEST)] or [[]]
+
+    def send(chunk):
+        data = {"output": {"title": CHECK_RUN_TITLE, "summary": summary, "annotations": chunk}}
+        resp = http_client.patch(url, headers=headers, json=data)
+        if resp.status_code not in (200, 201):
+            logger.error(f"Failed to update check run: {resp.text}")
+            return 0
+        return len(chunk)
+
+    posted = send(chunks[0])
+    if len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            posted += sum(executor.map(send, chunks[1:]))
+    logger.info(f"Updated GitHub Check Run with {posted} annotations in {len(chunks)} requests.")
+    return posted
 
 def main():
     parser = get_arg_parser()
+    parser.add_argument('--run-summary', type=str, default=str(LATEST_RUN),
+                        help='Run summary to report (default: logs/latest_run.json)')
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
     try:
@@ -88,13 +133,18 @@ def main():
             print("Missing environment variables. Please set GITHUB_PR_URL and GITHUB_TOKEN in your .env file or environment.")
             print("See docs/github_setup.md for details.")
             sys.exit(1)
-        comment = sys.stdin.read()
-        violations = parse_violations(comment)
+        comment = "" if sys.stdin.isatty() else sys.stdin.read()
+        failed, violations = load_structured_results(args.run_summary)
+        if failed is None:
+            # No recorded run: fall back to the markdown report (script-level summary only).
+            failed = parse_violations(comment)
+        if not comment.strip():
+            comment = render_comment(failed, violations)
         # Post summary comment
         post_pr_comment(pr_url, token, comment, logger)
-        # If running in a GitHub Check context, update check run with summary
-        if check_run_id and repo and sha and violations:
-            post_check_run_annotations(token, check_run_id, repo, sha, violations, logger)
+        # If running in a GitHub Check context, annotate the check run
+        if check_run_id and repo and sha and (failed or violations):
+            post_check_run_annotations(token, check_run_id, repo, sha, violations, logger, failed=failed)
     except Exception as e:
         logger.error(f"Exception in pr_rule_violation_bot: {e}")
         sys.exit(1)
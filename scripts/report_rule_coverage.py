@@ -1,72 +1,158 @@
 #!/usr/bin/env python3
 """
 Generate a report of rule coverage per file and per rule.
-- Shows which files are checked by which rules, and which are skipped/suppressed.
-- Outputs a Markdown table and summary.
+- Shows which files are checked by which rules, and which are skipped/suppressed (with the suppression reason).
+- Rules come from the rule registry (rule_mapping.json); coverage comes from the persisted
+  applicability matrix, so it is only recomputed when files, config or rules change.
+- Exports the full file x rule matrix as a columnar CSV.gz and rolls coverage up by rule, folder and owner.
+- --update-docs regenerates docs/rule_coverage.md (written only when its content changes).
 Category: automation
 """
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import csv
+import gzip
+import io
 from pathlib import Path
-from scripts.rule_config import load_rule_config, get_file_rule_settings, is_rule_suppressed
+from scripts.rule_config import CompiledRuleConfig, load_rule_config
+from scripts.rule_registry import get_registry
+from scripts.applicability_matrix import load_matrix
+from scripts.docs_pipeline import write_if_changed
+from scripts.ownership import get_ownership
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
 
-# List of all rule scripts and their rule names
-RULE_SCRIPTS = [
-    ("check_py_length.py", "check_py_length"),
-    ("check_shebang_and_imports.py", "check_shebang"),
-    ("check_shebang_and_imports.py", "check_imports_at_top"),
-    ("check_dependencies.py", "check_dependencies"),
-    ("check_python_utilities.py", "check_python_utilities"),
-    ("setup_env.py", "setup_env"),
-    ("manage_services.py", "manage_services"),
-    ("check_onboarding.py", "check_onboarding"),
-    ("check_docstrings.py", "check_docstrings"),
-]
+ROOT = Path(__file__).parent.parent
+FILE_OWNERSHIP_PATH = ROOT / "file_ownership.json"
+COVERAGE_DOC = ROOT / "docs/rule_coverage.md"
+COVERAGE_CSV = ROOT / "docs/rule_coverage.csv.gz"
 
 
+def folder_of(rel):
+    return rel.rsplit("/", 1)[0] + "/" if "/" in rel else "./"
+
+def rollup(matrix, masks):
+    """{label: {"files", "checked", "skipped", "suppressed"}} counting file x rule cells per label."""
+    rows = {}
+    for label, mask in sorted(masks.items()):
+        files = matrix.count(mask)
+        row = {"files": files, "checked": 0, "skipped": 0, "suppressed": 0}
+        for rule in matrix.rules:
+            suppressed = matrix.count(matrix.suppressed.get(rule, 0) & mask)
+            checked = matrix.count(matrix.scope[rule] & ~matrix.suppressed.get(rule, 0) & mask)
+            row["suppressed"] += suppressed
+            row["checked"] += checked
+            row["skipped"] += files - suppressed - checked
+        rows[label] = row
+    return rows
+
+def rule_rollup(matrix):
+    """{rule: {"files", "checked", "skipped", "suppressed"}} over all files."""
+    rows = {}
+    for rule in matrix.rules:
+        suppressed = matrix.count(matrix.suppressed.get(rule, 0))
+        checked = matrix.count(matrix.scope[rule] & ~matrix.suppressed.get(rule, 0))
+        rows[rule] = {"files": len(matrix.files), "checked": checked, "skipped": len(matrix.files) - checked - suppressed,
+                      "suppressed": suppressed}
+    return rows
+
+def percent(row):
+    total = row["checked"] + row["skipped"] + row["suppressed"]
+    return row["checked"] * 100 // total if total else 0
+
+def status_label(matrix, compiled, rule, i):
+    """matrix.status() for files[i], with the reason from the file's config appended to 'suppressed'."""
+    status = matrix.status(rule, i)
+    if status == "suppressed":
+        settings = compiled.settings[compiled.group_of(matrix.files[i])]
+        reason = (settings.get("suppressed_rules") or {}).get(rule)
+        if reason:
+            return f"suppressed ({reason})"
+    return status
+
+def render_csv(matrix):
+    """Gzipped CSV, one row per file and one column per rule; byte-identical for identical coverage."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(["file"] + matrix.rules)
+    for i, rel in enumerate(matrix.files):
+        writer.writerow([rel] + [matrix.status(rule, i) for rule in matrix.rules])
+    return gzip.compress(buf.getvalue().encode(), mtime=0)
+
+def export_csv(matrix, path=COVERAGE_CSV):
+    """Write render_csv(matrix) to path if its bytes changed; returns True if written."""
+    return write_if_changed(path, render_csv(matrix))
+
+def table(title, label, rows):
+    lines = [f"### {title}", "", f"| {label} | Files | Checked | Skipped | Suppressed | Coverage |", "|---|---|---|---|---|---|"]
+    for key, row in rows.items():
+        lines.append(f"| {key} | {row['files']} | {row['checked']} | {row['skipped']} | {row['suppressed']} | {percent(row)}% |")
+    return lines + [""]
+
+def render_doc(matrix, by_rule, by_folder, by_owner):
+    total = {k: sum(r[k] for r in by_rule.values()) for k in ("checked", "skipped", "suppressed")}
+    lines = [
+        "# Rule Coverage Report", "",
+        "This document is auto-generated by `scripts/report_rule_coverage.py`.", "",
+        "To update, run:", "", "```bash", "python3 scripts/report_rule_coverage.py --update-docs", "```", "",
+        "---", "",
+        f"**{len(matrix.files)} files x {len(matrix.rules)} rules: {total['checked']} checks active "
+        f"({percent(total)}%), {total['skipped']} skipped, {total['suppressed']} suppressed.**", "",
+        f"The full per-file matrix is in [{COVERAGE_CSV.name}]({COVERAGE_CSV.name}) (one column per rule).", "",
+    ]
+    lines += table("By rule", "Rule", by_rule)
+    lines += table("By folder", "Folder", by_folder)
+    lines += table("By owner", "Owner", by_owner)
+    lines += ["---", "", "**Summary:**", "",
+              "- Each cell counts file x rule pairs that are `checked`, `skipped`, or `suppressed`.",
+              "- Use this report to identify gaps in rule enforcement and improve code quality coverage.", ""]
+    return "\n".join(lines)
+
+def render_outputs(matrix, file_owners):
+    """{path: content} for docs/rule_coverage.md and its CSV.gz export; file_owners is {file: owner}."""
+    by_folder = rollup(matrix, matrix.masks_by(folder_of))
+    by_owner = rollup(matrix, matrix.masks_by(lambda f: file_owners.get(f, "-")))
+    return {COVERAGE_DOC: render_doc(matrix, rule_rollup(matrix), by_folder, by_owner), COVERAGE_CSV: render_csv(matrix)}
+
 def main():
     parser = get_arg_parser()
-    parser.add_argument('--report', type=str, default="markdown", choices=["markdown", "plain"], help="Output format")
+    parser.add_argument('--report', type=str, default=None, choices=["markdown", "plain"], help="Also print the per-file matrix in this format")
+    parser.add_argument('--update-docs', action='store_true', help='Regenerate docs/rule_coverage.md and the CSV.gz export')
+    parser.add_argument('--export', type=str, default=None, help='Write the per-file matrix as CSV.gz to this path')
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
     config = load_rule_config()
-    root = Path(__file__).parent.parent
-    py_files = sorted([f for f in root.glob('**/*.py') if 'plugins/' not in str(f)])
-    # Build coverage matrix: file -> rule -> status
-    coverage = {}
-    for py_file in py_files:
-        rel = str(py_file.relative_to(root))
-        coverage[rel] = {}
-        for script, rule in RULE_SCRIPTS:
-            settings = get_file_rule_settings(py_file, config)
-            suppressed, reason = is_rule_suppressed(rule, config, py_file)
-            if suppressed:
-                coverage[rel][rule] = f"suppressed ({reason})" if reason else "suppressed"
-            elif rule in (settings.get('skip_rules') or []):
-                coverage[rel][rule] = "skipped"
-            else:
-                coverage[rel][rule] = "checked"
-    # Output report
-    rules = [r for _, r in RULE_SCRIPTS]
+    matrix = load_matrix(config=config, rules=get_registry())
+    compiled = CompiledRuleConfig(config)
+    rules = matrix.rules
     if args.report == "markdown":
-        header = "| File | " + " | ".join(rules) + " |"
-        sep = "|---" * (len(rules)+1) + "|"
-        logger.info(header)
-        logger.info(sep)
-        for f, row in coverage.items():
-            logger.info("| " + f + " | " + " | ".join(row[r] for r in rules) + " |")
-    else:
-        for f, row in coverage.items():
+        logger.info("| File | " + " | ".join(rules) + " |")
+        logger.info("|---" * (len(rules)+1) + "|")
+        for i, f in enumerate(matrix.files):
+            logger.info("| " + f + " | " + " | ".join(status_label(matrix, compiled, r, i) for r in rules) + " |")
+    elif args.report == "plain":
+        for i, f in enumerate(matrix.files):
             logger.info(f"{f}:")
             for r in rules:
-                logger.info(f"  {r}: {row[r]}")
+                logger.info(f"  {r}: {status_label(matrix, compiled, r, i)}")
+    by_rule = rule_rollup(matrix)
+    by_folder = rollup(matrix, matrix.masks_by(folder_of))
+    file_owners = get_ownership(FILE_OWNERSHIP_PATH).owners_for(matrix.files)
+    by_owner = rollup(matrix, matrix.masks_by(lambda f: file_owners.get(f, "-")))
+    if args.export:
+        export_csv(matrix, args.export)
+        logger.info(f"Coverage matrix exported to {args.export}")
+    if args.update_docs:
+        changed = export_csv(matrix)
+        changed = write_if_changed(COVERAGE_DOC, render_doc(matrix, by_rule, by_folder, by_owner)) or changed
+        logger.info(f"Coverage docs {'updated' if changed else 'already up to date'}: {COVERAGE_DOC}")
     # Summary
-    checked_count = sum(row[r] == "checked" for row in coverage.values() for r in rules)
-    total = len(coverage) * len(rules)
+    checked_count = sum(row["checked"] for row in by_rule.values())
+    total = len(matrix.files) * len(rules)
     logger.info(f"\nRule coverage: {checked_count}/{total} checks active ({checked_count*100//total if total else 0}%)")
+    for folder, row in by_folder.items():
+        logger.info(f"  {folder}: {percent(row)}% of {row['files']} files x {len(rules)} rules checked")
 
 if __name__ == "__main__":
     main()
@@ -13,18 +13,15 @@ from pathlib import Path
 from collections import Counter
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts.rule_registry import get_registry
+from scripts.ownership import get_ownership
+from scripts.applicability_matrix import get_py_files
 
 RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
 FILE_OWNERSHIP_PATH = Path(__file__).parent.parent / "file_ownership.json"
 VIOLATION_LOG = Path(__file__).parent.parent / "logs/rule_violations.jsonl"
 
 
-def load_json(path):
-    if path.exists():
-        with open(path) as f:
-            return json.load(f)
-    return {}
-
 def load_violations():
     if not VIOLATION_LOG.exists():
         return []
@@ -36,8 +33,9 @@ def main():
     parser.add_argument('--report', action='store_true', help='Show rule adoption analytics')
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
-    mapping = load_json(RULE_MAPPING_PATH)
-    file_owners = load_json(FILE_OWNERSHIP_PATH)
+    mapping = get_registry(RULE_MAPPING_PATH)
+    root = Path(__file__).parent.parent
+    file_owners = get_ownership(FILE_OWNERSHIP_PATH).owners_for(f.relative_to(root).as_posix() for f in get_py_files(root))
     violations = load_violations()
     # Count rule usage (by violation and by config presence)
     rule_counts = Counter(v['rule'] for v in violations)
@@ -45,11 +43,12 @@ def main():
     logger.info("Rule Adoption Analytics Report:")
     logger.info("Rule | Violations | Owner(s)")
     logger.info("-----|-----------|---------")
+    # The ownership condition only depends on the rule, so collect the owner set once
+    all_owners = set(file_owners.values())
     for rule in mapping:
-        owners = set()
-        for file, owner in file_owners.items():
-            if rule in (mapping.get(rule, {}).get('applies_to', []) or []) or rule in (mapping.get(rule, {}).get('script', '')):
-                owners.add(owner)
+        meta = mapping[rule]
+        applies = rule in (meta.get('applies_to', []) or []) or rule in (meta.get('script', '') or '')
+        owners = all_owners if applies else set()
         logger.info(f"{rule} | {rule_counts.get(rule,0)} | {', '.join(owners) if owners else '-'}")
     # Recommend deprecation/promotion
     least_used = [r for r, c in rule_counts.items() if c == min(rule_counts.values())]
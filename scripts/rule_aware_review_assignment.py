@@ -8,22 +8,17 @@ Category: automation
 import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-import json
 from pathlib import Path
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts.rule_registry import get_registry
+from scripts.ownership import get_ownership
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 FILE_OWNERSHIP_PATH = Path(__file__).parent.parent / "file_ownership.json"
 RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
 
 
-def load_json(path):
-    if path.exists():
-        with open(path) as f:
-            return json.load(f)
-    return {}
-
 def get_changed_files():
     # Use git to get changed files in the PR (or last commit)
     import subprocess
@@ -38,21 +33,16 @@ def main():
     parser.add_argument('--assign', action='store_true', help='Suggest reviewers for changed files')
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
-    file_owners = load_json(FILE_OWNERSHIP_PATH)
-    rule_mapping = load_json(RULE_MAPPING_PATH)
+    ownership = get_ownership(FILE_OWNERSHIP_PATH)
+    registry = get_registry(RULE_MAPPING_PATH)
     if args.assign:
         changed = get_changed_files()
-        reviewers = set()
+        reviewers = set(ownership.owners_for(changed).values())
         for f in changed:
-            owner = file_owners.get(f)
-            if owner:
-                reviewers.add(owner)
-            # Also add rule owners for rules that apply to this file
-            for rule, meta in rule_mapping.items():
-                if meta.get('owner'):
-                    # Simple heuristic: if rule script name in file name
-                    if rule in f:
-                        reviewers.add(meta['owner'])
+            # Also add owners of the rules implemented by (or named after) this file
+            for rule in registry.rules_for_path(f):
+                if registry[rule].get('owner'):
+                    reviewers.add(registry[rule]['owner'])
         if reviewers:
             logger.info(f"Suggested reviewers: {', '.join(reviewers)}")
         else:
@@ -16,7 +16,7 @@ import yaml
 from pathlib import Path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 parser = get_arg_parser()
-args = parser.parse_args()
+args, _ = parser.parse_known_args()
 logger = get_logger(debug=args.debug)
 
 def save_rule_config(config):
@@ -56,6 +56,41 @@ def get_file_rule_settings(file_path, config):
             return merged
     return config
 
+class CompiledRuleConfig:
+    """
+    Config resolved once per folder override instead of once per file.
+    Folder order matches get_file_rule_settings(): the first folder prefix that matches wins.
+    """
+
+    def __init__(self, config):
+        self.folders = list((config.get("folders") or {}).keys())
+        self.settings = []
+        for folder in self.folders:
+            overrides = config["folders"][folder] or {}
+            merged = {**config, **overrides}
+            if "suppressed_rules" in overrides:
+                merged["suppressed_rules"] = {**config.get("suppressed_rules", {}), **overrides["suppressed_rules"]}
+            self.settings.append(merged)
+        self.settings.append(config)
+        self.skipped = [self._skipped(settings) for settings in self.settings]
+        self.suppressed = [set(settings.get("suppressed_rules") or {}) for settings in self.settings]
+
+    @staticmethod
+    def _skipped(settings):
+        skipped = set(settings.get("skip_rules") or [])
+        overrides = settings.get("overrides") or {}
+        if isinstance(overrides, dict):
+            skipped.update(overrides.get("skip_rules") or [])
+        return skipped
+
+    def group_of(self, rel_path):
+        """Index into settings/skipped/suppressed for a path relative to the project root."""
+        rel_path = str(rel_path)
+        for i, folder in enumerate(self.folders):
+            if rel_path.startswith(folder):
+                return i
+        return len(self.folders)
+
 def is_rule_suppressed(rule_name, config, file_path=None):
     """
     Returns True if rule_name is suppressed globally or for the given file_path.
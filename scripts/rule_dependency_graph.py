@@ -6,24 +6,19 @@ Rule Dependency Graph Visualization
 Category: automation
 """
 import sys
-import json
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from pathlib import Path
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts.rule_registry import get_registry
 from scripts.renderMermaidDiagram import renderMermaidDiagram
+from scripts.docs_pipeline import write_if_changed
 
 RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
 GRAPH_MD = Path(__file__).parent.parent / "docs/rule_dependency_graph.md"
 
 
-def load_rule_mapping():
-    if RULE_MAPPING_PATH.exists():
-        with open(RULE_MAPPING_PATH) as f:
-            return json.load(f)
-    return {}
-
 def build_mermaid_graph(mapping):
     lines = ["graph TD"]
     for rule, meta in mapping.items():
@@ -35,17 +30,24 @@ def build_mermaid_graph(mapping):
             lines.append(f"    {rule} -.-> {conf}")
     return '\n'.join(lines)
 
+def render_graph_doc(mapping):
+    return (f"# Rule Dependency Graph\n\n```mermaid\n{build_mermaid_graph(mapping)}\n```\n\n"
+            "- Solid arrows (-->): dependency (A must run before B)\n"
+            "- Dashed arrows (-.->): conflict (A and B should not be enabled together)\n\n"
+            "Run `python3 scripts/rule_dependency_graph.py --update-graph` to update this diagram.\n")
+
 def main():
     parser = get_arg_parser()
     parser.add_argument('--update-graph', action='store_true', help='Update dependency graph markdown')
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
-    mapping = load_rule_mapping()
+    mapping = get_registry(RULE_MAPPING_PATH)
     mermaid = build_mermaid_graph(mapping)
     if args.update_graph:
-        md = f"# Rule Dependency Graph\n\n```mermaid\n{mermaid}\n```\n"
-        GRAPH_MD.write_text(md)
-        logger.info(f"Dependency graph updated: {GRAPH_MD}")
+        if write_if_changed(GRAPH_MD, render_graph_doc(mapping)):
+            logger.info(f"Dependency graph updated: {GRAPH_MD}")
+        else:
+            logger.info(f"Dependency graph already up to date: {GRAPH_MD}")
     else:
         print(mermaid)
 
@@ -8,13 +8,13 @@ Rule Deprecation/Upgrade Automation
 Category: automation
 """
 import sys
-import json
 import os
 from pathlib import Path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from scripts.central_logger import get_logger
 import os
 from scripts.central_args import get_arg_parser
+from scripts.rule_registry import get_registry
 from scripts.rule_config import load_rule_config, save_rule_config
 from scripts.notify_slack import send_slack_notification
 from scripts.notify_email import send_email_notification
@@ -24,12 +24,6 @@ RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
 RULE_CONFIG_PATH = Path(__file__).parent.parent / ".smartai_rules.yaml"
 
 
-def load_rule_mapping():
-    if RULE_MAPPING_PATH.exists():
-        with open(RULE_MAPPING_PATH) as f:
-            return json.load(f)
-    return {}
-
 def main():
     parser = get_arg_parser()
     parser.add_argument('--slack', action='store_true', help='Notify via Slack')
@@ -38,8 +32,8 @@ def main():
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
     config = load_rule_config()
-    mapping = load_rule_mapping()
-    deprecated = {k: v for k, v in mapping.items() if v.get('deprecated')}
+    mapping = get_registry(RULE_MAPPING_PATH)
+    deprecated = {rule: mapping[rule] for rule in mapping.deprecated}
     if not deprecated:
         logger.info("No deprecated rules found.")
         return
@@ -58,13 +52,12 @@ def main():
         info = deprecated[rule]
         msg.append(f"- {rule}: {info.get('deprecation_message', 'No message')}")
         if info.get('upgrade_to'):
-            msg.append(f"  Suggested upgrade: {info['upgrade_to']}")
+            msg.append(f"  Suggested upgrade: {' -> '.join(mapping.upgrade_chain(rule))}")
     # Auto-upgrade if requested
     upgraded = []
     if args.auto_upgrade:
         for rule in in_use:
-            info = deprecated[rule]
-            new_rule = info.get('upgrade_to')
+            new_rule = mapping.final_upgrade(rule)
             if new_rule:
                 # Move config from old rule to new rule
                 if 'suppressed_rules' in config and rule in config['suppressed_rules']:
@@ -9,12 +9,13 @@ Category: automation
 import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-import json
 from pathlib import Path
 import os
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts.rule_registry import get_registry
 from scripts.rule_config import load_rule_config
+from scripts.docs_pipeline import write_if_changed
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
@@ -23,14 +24,12 @@ DOC_RULES_PATH = Path(__file__).parent.parent / "docs/python_script_coding_rules
 DOC_COVERAGE_PATH = Path(__file__).parent.parent / "docs/rule_coverage.md"
 
 
-def load_rule_mapping():
-    if RULE_MAPPING_PATH.exists():
-        with open(RULE_MAPPING_PATH) as f:
-            return json.load(f)
-    return {}
+def render_rule_lines(rules):
+    return [f"- **{k}**: {v.get('description','')}{' (DEPRECATED)' if v.get('deprecated') else ''}" for k, v in rules.items()]
 
-def update_rules_section(doc_path, rules):
-    lines = doc_path.read_text().splitlines()
+def render_rules_section(text, rules):
+    """text with its '## Rule List' section (up to the next '---') replaced by the current rule list."""
+    lines = text.splitlines()
     start = None
     end = None
     for i, line in enumerate(lines):
@@ -39,24 +38,28 @@ def update_rules_section(doc_path, rules):
         if start is not None and line.strip() == '---':
             end = i
             break
-    rule_lines = [f"- **{k}**: {v.get('description','')}{' (DEPRECATED)' if v.get('deprecated') else ''}" for k, v in rules.items()]
+    rule_lines = render_rule_lines(rules)
     if start is not None and end is not None:
         new_lines = lines[:start+1] + [''] + rule_lines + ['','---'] + lines[end+1:]
     else:
         # Append at end
         new_lines = lines + ['\n## Rule List',''] + rule_lines + ['','---']
-    doc_path.write_text('\n'.join(new_lines))
+    return '\n'.join(new_lines) + ('\n' if text.endswith('\n') else '')
+
+def update_rules_section(doc_path, rules):
+    """Rewrite the rule list in doc_path; returns True if the file changed."""
+    return write_if_changed(doc_path, render_rules_section(doc_path.read_text(), rules))
 
 def main():
     parser = get_arg_parser()
     parser.add_argument('--fix', action='store_true', help='Auto-fix documentation if out of sync')
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
-    mapping = load_rule_mapping()
+    mapping = get_registry(RULE_MAPPING_PATH)
     # Check and sync python_script_coding_rules.md
     doc_path = DOC_RULES_PATH
     doc_text = doc_path.read_text() if doc_path.exists() else ''
-    rule_lines = [f"- **{k}**: {v.get('description','')}{' (DEPRECATED)' if v.get('deprecated') else ''}" for k, v in mapping.items()]
+    rule_lines = render_rule_lines(mapping)
     rules_section = '\n'.join(rule_lines)
     if rules_section not in doc_text:
         logger.info("Rule documentation is out of sync.")
@@ -4,6 +4,7 @@ Rule Drift Detection
 - Alerts if code diverges from enforced rules over time
 - Compares current violations to historical baseline
 - Notifies if drift increases or new violations appear
+- Keeps per-run history and flags sustained drift with vectorized z-scores/EWMA/CUSUM (see drift_engine.py)
 Category: automation
 """
 import os
@@ -13,14 +14,17 @@ import json
 from pathlib import Path
 import os
 from datetime import datetime
+import numpy as np
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
-from scripts.notify_slack import send_slack_notification
-from scripts.notify_email import send_email_notification
+from scripts.notification_outbox import enqueue
+from scripts.drift_engine import ViolationHistory, analyze
+from scripts.run_history import load_latest_summary
 
 LOGS_DIR = Path(__file__).parent.parent / "logs"
 VIOLATION_LOG = LOGS_DIR / "rule_violations.jsonl"
 DRIFT_BASELINE = LOGS_DIR / "rule_drift_baseline.json"
+HISTORY_PATH = LOGS_DIR / "rule_violation_history.npz"
 
 
 def load_violations():
@@ -39,35 +43,102 @@ def save_baseline(data):
     with open(DRIFT_BASELINE, "w") as f:
         json.dump(data, f, indent=2)
 
-def main():
-    parser = get_arg_parser()
-    parser.add_argument('--update-baseline', action='store_true', help='Update drift baseline to current violations')
-    parser.add_argument('--slack', action='store_true', help='Notify via Slack if drift detected')
-    parser.add_argument('--email', action='store_true', help='Notify via email if drift detected')
-    args = parser.parse_args()
-    logger = get_logger(debug=args.debug)
-    violations = load_violations()
-    baseline = load_baseline()
-    # Aggregate by rule/file
-    current = {}
+def load_run_entries(run_id, untagged_offset=None):
+    """
+    Violations of one run: entries tagged with run_id, plus untagged entries written at or after
+    untagged_offset (the run's start in the log). Untagged entries are skipped when it is None, since
+    they cannot be attributed to a run.
+    """
+    if not VIOLATION_LOG.exists():
+        return []
+    entries = []
+    with open(VIOLATION_LOG, "rb") as f:
+        if untagged_offset:
+            f.seek(untagged_offset)
+        for line in f:
+            if not line.strip():
+                continue
+            v = json.loads(line)
+            if v.get('run_id') == run_id or (not v.get('run_id') and untagged_offset is not None):
+                entries.append(v)
+    return entries
+
+def count_pairs(violations):
+    """Aggregate violations into {(rule, file): count}."""
+    counts = {}
     for v in violations:
         key = (v['rule'], v['file'])
-        current[key] = current.get(key, 0) + 1
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+def detect_baseline_drift(current, baseline):
     drift = []
     for key, count in current.items():
         base = baseline.get(str(key), 0)
         if count > base:
             drift.append((key, base, count))
-    if drift:
-        msg = [f"Rule drift detected at {datetime.now().isoformat()}:"]
+    return drift
+
+def detect_history_drift(history, args):
+    result = analyze(history, window=args.window, persist=args.persist, z_threshold=args.z_threshold)
+    idx = np.flatnonzero(result["drifting"])
+    idx = idx[np.argsort(-result["z"][idx], kind="stable")]
+    drift = []
+    for i in idx:
+        cp = int(result["change_point"][i])
+        drift.append((history.series_labels(i), result["mean"][i], result["latest"][i],
+                      result["z"][i], history.runs[cp] if cp >= 0 else None))
+    return drift
+
+def main():
+    parser = get_arg_parser()
+    parser.add_argument('--update-baseline', action='store_true', help='Update drift baseline to current violations')
+    parser.add_argument('--record-run', action='store_true', help='Append the current violation counts to the per-run history')
+    parser.add_argument('--run-id', type=str, help='Run to record (default: the latest run summary)')
+    parser.add_argument('--window', type=int, default=10, help='Number of baseline runs for rolling statistics')
+    parser.add_argument('--persist', type=int, default=2, help='Consecutive elevated runs required before alerting')
+    parser.add_argument('--z-threshold', type=float, default=3.0, help='Z-score above baseline that counts as drift')
+    parser.add_argument('--max-report', type=int, default=50, help='Maximum drifting series to list')
+    parser.add_argument('--slack', action='store_true', help='Notify via Slack if drift detected')
+    parser.add_argument('--email', action='store_true', help='Notify via email if drift detected')
+    args = parser.parse_args()
+    logger = get_logger(debug=args.debug)
+    latest = load_latest_summary() or {}
+    run_id = args.run_id or latest.get('run_id')
+    if run_id:
+        # Untagged entries belong to the latest run only if they were written after it started
+        offset = latest.get('violation_offset', 0) if latest.get('run_id') == run_id else None
+        current = count_pairs(load_run_entries(run_id, offset))
+    else:
+        run_id = datetime.now().isoformat(timespec="seconds")
+        current = count_pairs(load_violations())
+    history = ViolationHistory.load(HISTORY_PATH)
+    if args.record_run:
+        if args.run_id or latest.get('run_id'):
+            history.add_run(run_id, current)
+            history.save(HISTORY_PATH)
+            logger.info(f"Recorded run {run_id}; history has {history.n_series} series x {history.n_runs} runs.")
+        else:
+            logger.warning("No run summary or --run-id: cannot tell which violations belong to this run; nothing recorded.")
+    msg = [f"Rule drift detected at {datetime.now().isoformat()}:"]
+    if history.n_runs > args.persist:
+        drift = detect_history_drift(history, args)
+        for (rule, file), mean, now, z, since in drift[:args.max_report]:
+            since_msg = f", since run {since}" if since else ""
+            msg.append(f"- {rule} in {file}: {now:.0f} violations (baseline {mean:.1f}, z={z:.1f}{since_msg})")
+        if len(drift) > args.max_report:
+            msg.append(f"... and {len(drift) - args.max_report} more drifting series")
+    else:
+        drift = detect_baseline_drift(current, load_baseline())
         for (rule, file), base, now in drift:
             msg.append(f"- {rule} in {file}: {now} violations (was {base})")
+    if drift:
         full_msg = "\n".join(msg)
         logger.info(full_msg)
         if args.slack:
-            send_slack_notification(full_msg)
+            enqueue("slack", full_msg, subject="Rule Drift Detected", source="rule_drift_detection")
         if args.email:
-            send_email_notification(subject="Rule Drift Detected", body=full_msg)
+            enqueue("email", full_msg, subject="Rule Drift Detected", source="rule_drift_detection")
     else:
         logger.info("No rule drift detected.")
     if args.update_baseline:
@@ -15,8 +15,7 @@ from datetime import datetime, timedelta
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
 from scripts.rule_config import load_rule_config, save_rule_config
-from scripts.notify_slack import send_slack_notification
-from scripts.notify_email import send_email_notification
+from scripts.notification_outbox import enqueue
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 RULE_CONFIG_PATH = Path(__file__).parent.parent / ".smartai_rules.yaml"
@@ -66,9 +65,9 @@ def main():
         full_msg = "\n".join(msg)
         logger.info(full_msg)
         if args.slack:
-            send_slack_notification(full_msg)
+            enqueue("slack", full_msg, subject="Rule Exception Review", source="rule_exception_review")
         if args.email:
-            send_email_notification(subject="Rule Exception Review", body=full_msg)
+            enqueue("email", full_msg, subject="Rule Exception Review", source="rule_exception_review")
     # Auto-remove expired
     if args.auto_remove and expired:
         for rule, _, _ in expired:
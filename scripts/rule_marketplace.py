@@ -3,54 +3,186 @@
 Rule Marketplace/Registry Integration
 - Discover, import, and share rules from a central registry (local or remote)
 - Supports listing, searching, importing, and publishing rules
+- rule_registry/index.json holds every rule's versions (content hash, category, description, dependencies)
+  and an inverted index of description terms, so --list and --search never scan the registry directory
+- Rule scripts are stored once per content hash under rule_registry/blobs/; imports are verified against
+  the recorded hash, vetted by rule_security_patch's scanner and skipped when scripts/ already has that exact content
 Category: automation
 """
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import ast
+import hashlib
 import json
-import shutil
+import re
 from pathlib import Path
-import os
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.import_scanner import STDLIB, distributions_for
+from scripts.rule_registry import get_registry, RULE_MAPPING_PATH
 
 # For demo: use a local directory as the registry
 REGISTRY_PATH = Path(__file__).parent.parent / "rule_registry"
 RULES_DIR = Path(__file__).parent
-RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
+INDEX_VERSION = 1
 
 
-def ensure_registry():
-    REGISTRY_PATH.mkdir(exist_ok=True)
+def ensure_registry(registry=REGISTRY_PATH):
+    (Path(registry) / "blobs").mkdir(parents=True, exist_ok=True)
 
-def list_registry():
-    ensure_registry()
-    return [f for f in REGISTRY_PATH.glob('check_*.py')]
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
 
-def import_rule(rule_name):
-    ensure_registry()
-    src = REGISTRY_PATH / rule_name
-    dest = RULES_DIR / rule_name
-    if not src.exists():
-        return False, f"Rule {rule_name} not found in registry."
-    shutil.copy(src, dest)
-    return True, f"Imported {rule_name} to scripts/."
+def blob_path(digest, registry=REGISTRY_PATH):
+    return Path(registry) / "blobs" / digest[:2] / digest
+
+def rule_name(name):
+    """Registry key for a rule given as 'check_x' or 'check_x.py'."""
+    return Path(name).stem
+
+def tokenize(text):
+    return set(re.findall(r"[a-z0-9]+", str(text or "").lower()))
 
-def publish_rule(rule_name):
-    src = RULES_DIR / rule_name
-    dest = REGISTRY_PATH / rule_name
+def load_index(registry=REGISTRY_PATH):
+    path = Path(registry) / "index.json"
+    if path.exists():
+        with open(path) as f:
+            return json.load(f)
+    return {"version": INDEX_VERSION, "rules": {}, "terms": {}}
+
+def save_index(index, registry=REGISTRY_PATH):
+    ensure_registry(registry)
+    path = Path(registry) / "index.json"
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def build_terms(rules):
+    """Inverted index {term: [rule names]} over each rule's name, category and description (latest version)."""
+    terms = {}
+    for name, entry in rules.items():
+        meta = entry["versions"][entry["latest"]]
+        for term in tokenize(name.replace("_", " ")) | tokenize(meta.get("category")) | tokenize(meta.get("description")):
+            terms.setdefault(term, set()).add(name)
+    return {term: sorted(names) for term, names in sorted(terms.items())}
+
+def rule_dependencies(source):
+    """{"packages": third-party distributions, "modules": project modules} imported by a rule script."""
+    packages, modules = set(), set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            top = name.split(".")[0]
+            if top == "scripts":
+                modules.add(name)
+            elif top not in STDLIB:
+                packages.add(top)
+    return {"packages": sorted(set(distributions_for(packages).values())), "modules": sorted(modules)}
+
+def describe(script, source):
+    """(category, description) from rule_mapping.json, falling back to the script's docstring."""
+    registry = get_registry(RULE_MAPPING_PATH)
+    for rule in sorted(registry.rules_for_path(script)):
+        meta = registry[rule]
+        if meta.get("description"):
+            return meta.get("category", ""), meta["description"]
+    doc = ast.get_docstring(ast.parse(source)) or ""
+    category = next((line.split(":", 1)[1].strip() for line in doc.splitlines() if line.startswith("Category:")), "")
+    description = next((line.strip() for line in doc.splitlines() if line.strip()), "")
+    return category, description
+
+def next_version(version):
+    """1.0.0 for a new rule, otherwise version with its last component bumped."""
+    if not version:
+        return "1.0.0"
+    parts = [int(p) for p in re.findall(r"\d+", version)] or [0]
+    parts[-1] += 1
+    return ".".join(str(p) for p in parts)
+
+def list_registry(registry=REGISTRY_PATH):
+    """[(rule, latest version, metadata)] straight from the index."""
+    index = load_index(registry)
+    return [(name, entry["latest"], entry["versions"][entry["latest"]]) for name, entry in sorted(index["rules"].items())]
+
+def search_registry(query, registry=REGISTRY_PATH):
+    """Rules whose name, category or description contain every term of query."""
+    index = load_index(registry)
+    found = None
+    for term in tokenize(query):
+        names = set(index["terms"].get(term, ()))
+        found = names if found is None else found & names
+    return sorted(found or ())
+
+def import_rule(rule, version=None, registry=REGISTRY_PATH, rules_dir=RULES_DIR, allow_unsafe=False):
+    # Imported here: rule_security_patch scans the registry through this module.
+    from scripts.rule_security_patch import scan_source
+    index = load_index(registry)
+    name = rule_name(rule)
+    entry = index["rules"].get(name)
+    if not entry:
+        return False, f"Rule {rule} not found in registry."
+    version = version or entry["latest"]
+    meta = entry["versions"].get(version)
+    if not meta:
+        return False, f"Rule {name} has no version {version} (available: {', '.join(sorted(entry['versions']))})."
+    dest = Path(rules_dir) / entry["script"]
+    if dest.exists() and content_hash(dest.read_bytes()) == meta["hash"]:
+        return True, f"{entry['script']} {version} already present in scripts/; skipped."
+    blob = blob_path(meta["hash"], registry)
+    if not blob.exists():
+        return False, f"Blob for {name} {version} is missing from the registry."
+    data = blob.read_bytes()
+    if content_hash(data) != meta["hash"]:
+        return False, f"Integrity check failed for {name} {version}: content does not match {meta['hash']}."
+    unsafe = [f"{i['name']} at line {i['line']}" for i in scan_source(data, entry["script"]) if i["kind"] != "import"]
+    if unsafe and not allow_unsafe:
+        return False, f"Security vetting failed for {name} {version}: {', '.join(unsafe)}. Use --allow-unsafe to import anyway."
+    dest.write_bytes(data)
+    return True, f"Imported {entry['script']} {version} to scripts/."
+
+def publish_rule(rule, version=None, registry=REGISTRY_PATH, rules_dir=RULES_DIR):
+    script = rule_name(rule) + ".py"
+    src = Path(rules_dir) / script
     if not src.exists():
-        return False, f"Rule {rule_name} not found in scripts/."
-    shutil.copy(src, dest)
-    return True, f"Published {rule_name} to registry."
+        return False, f"Rule {script} not found in scripts/."
+    data = src.read_bytes()
+    digest = content_hash(data)
+    index = load_index(registry)
+    name = rule_name(rule)
+    entry = index["rules"].setdefault(name, {"script": script, "latest": None, "versions": {}})
+    if entry["latest"] and entry["versions"][entry["latest"]]["hash"] == digest and not version:
+        return True, f"{script} is unchanged since {entry['latest']}; nothing to publish."
+    version = version or next_version(entry["latest"])
+    if version in entry["versions"] and entry["versions"][version]["hash"] != digest:
+        return False, f"{name} {version} is already published with different content; pick a new version."
+    blob = blob_path(digest, registry)
+    if not blob.exists():
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        blob.write_bytes(data)
+    source = data.decode("utf-8")
+    category, description = describe(src, source)
+    entry["versions"][version] = {"hash": digest, "category": category, "description": description,
+                                  "dependencies": rule_dependencies(source)}
+    entry["latest"] = max(entry["versions"], key=lambda v: [int(p) for p in re.findall(r"\d+", v)])
+    index["terms"] = build_terms(index["rules"])
+    save_index(index, registry)
+    return True, f"Published {script} {version} to registry."
 
 def main():
     parser = get_arg_parser()
     parser.add_argument('--list', action='store_true', help='List rules in registry')
+    parser.add_argument('--search', type=str, help='Search rule names, categories and descriptions')
     parser.add_argument('--import-rule', type=str, help='Import rule from registry')
     parser.add_argument('--publish-rule', type=str, help='Publish rule to registry')
+    parser.add_argument('--rule-version', type=str, default=None, help='Version to import or publish (default: latest / next)')
+    parser.add_argument('--allow-unsafe', action='store_true', help='Import even if the security scan flags dangerous calls')
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
     if args.list:
@@ -59,14 +191,27 @@ def main():
             logger.info("No rules found in registry.")
         else:
             logger.info("Rules in registry:")
-            for r in rules:
-                logger.info(f"- {r.name}")
+            for name, version, meta in rules:
+                logger.info(f"- {name} {version} [{meta.get('category') or 'uncategorized'}]: {meta.get('description', '')}")
+    elif args.search:
+        matches = search_registry(args.search)
+        index = load_index()
+        logger.info(f"{len(matches)} rule(s) match '{args.search}':")
+        for name in matches:
+            entry = index["rules"][name]
+            logger.info(f"- {name} {entry['latest']}: {entry['versions'][entry['latest']].get('description', '')}")
     elif args.import_rule:
-        ok, msg = import_rule(args.import_rule)
-        logger.info(msg)
+        ok, msg = import_rule(args.import_rule, args.rule_version, allow_unsafe=args.allow_unsafe)
+        if ok:
+            logger.info(msg)
+        else:
+            logger.error(msg)
     elif args.publish_rule:
-        ok, msg = publish_rule(args.publish_rule)
-        logger.info(msg)
+        ok, msg = publish_rule(args.publish_rule, args.rule_version)
+        if ok:
+            logger.info(msg)
+        else:
+            logger.error(msg)
     else:
         parser.print_help()
 
@@ -8,11 +8,11 @@ Category: automation
 import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-import json
 from pathlib import Path
 import os
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts.rule_registry import get_registry
 from scripts.rule_config import load_rule_config, save_rule_config
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -20,12 +20,6 @@ RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
 RULE_CONFIG_PATH = Path(__file__).parent.parent / ".smartai_rules.yaml"
 
 
-def load_rule_mapping():
-    if RULE_MAPPING_PATH.exists():
-        with open(RULE_MAPPING_PATH) as f:
-            return json.load(f)
-    return {}
-
 def main():
     parser = get_arg_parser()
     parser.add_argument('--suggest', action='store_true', help='Suggest rule migrations')
@@ -33,12 +27,12 @@ def main():
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
     config = load_rule_config()
-    mapping = load_rule_mapping()
-    deprecated = {k: v for k, v in mapping.items() if v.get('deprecated') and v.get('upgrade_to')}
+    mapping = get_registry(RULE_MAPPING_PATH)
     migrations = []
-    for rule, meta in deprecated.items():
+    for rule in mapping.deprecated & mapping.upgrade_to.keys():
         if rule in (config.get('suppressed_rules') or {}) or rule in (config.get('overrides') or {}):
-            migrations.append((rule, meta['upgrade_to']))
+            migrations.append((rule, mapping.final_upgrade(rule)))
+    migrations.sort()
     if args.suggest:
         if not migrations:
             logger.info("No rule migrations needed.")
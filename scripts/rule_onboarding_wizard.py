@@ -14,17 +14,12 @@ import os
 from scripts.rule_config import load_rule_config, save_rule_config
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts.rule_registry import get_registry
 
 RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
 RULE_CONFIG_PATH = Path(__file__).parent.parent / ".smartai_rules.yaml"
 
 
-def load_rule_mapping():
-    if RULE_MAPPING_PATH.exists():
-        with open(RULE_MAPPING_PATH) as f:
-            return json.load(f)
-    return {}
-
 def prompt(msg, default=None):
     if default is not None:
         msg = f"{msg} [{default}]"
@@ -37,7 +32,7 @@ def main():
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
     config = load_rule_config()
-    mapping = load_rule_mapping()
+    mapping = get_registry(RULE_MAPPING_PATH)
     logger.info("Welcome to the Rule Onboarding Wizard!\n")
     # List available rules
     rules = list(mapping.keys())
@@ -3,21 +3,33 @@
 User/Team Ownership Mapping
 - Assigns rule and file ownership for targeted notifications and accountability
 - Updates rule_mapping.json and a new file_ownership.json
+- File owners are CODEOWNERS-style patterns (paths, directories, globs); the last matching pattern wins
 - Provides CLI to set, list, and query ownership
+- --infer regenerates file_ownership.json from git blame: recency-weighted line authorship per file, aggregated
+  per directory; blame results are cached per (path, blob id) in .smartai_cache/blame_cache.json and run in parallel
+- Patterns written by --infer are also recorded in file_ownership.inferred.json; every other entry of
+  file_ownership.json is manual and is kept after the inferred patterns, so it still takes precedence
 Category: automation
 """
 import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import json
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import os
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts.ownership import get_ownership
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
 FILE_OWNERSHIP_PATH = Path(__file__).parent.parent / "file_ownership.json"
+INFERRED_OWNERSHIP_PATH = Path(__file__).parent.parent / "file_ownership.inferred.json"
+BLAME_CACHE_PATH = Path(__file__).parent.parent / ".smartai_cache" / "blame_cache.json"
+HALF_LIFE_DAYS = 180
 
 
 def load_json(path):
@@ -30,13 +42,123 @@ def save_json(path, data):
     with open(path, "w") as f:
         json.dump(data, f, indent=2)
 
+def head_blobs(root):
+    """{path: blob id} for every file in HEAD."""
+    out = subprocess.check_output(["git", "ls-tree", "-r", "-z", "HEAD"], cwd=root, text=True)
+    blobs = {}
+    for entry in out.split("\0"):
+        meta, _, path = entry.partition("\t")
+        parts = meta.split()
+        if len(parts) == 3 and parts[1] == "blob":
+            blobs[path] = parts[2]
+    return blobs
+
+def blame_file(root, path):
+    """{author email: [[author time, lines], ...]} for path at HEAD; {} if it cannot be blamed."""
+    result = subprocess.run(["git", "blame", "--line-porcelain", "-w", "HEAD", "--", path], cwd=root,
+                            capture_output=True, text=True, errors="replace")
+    if result.returncode != 0:
+        return {}
+    counts, author = {}, None
+    for line in result.stdout.splitlines():
+        if line.startswith("author-mail "):
+            author = line[len("author-mail "):].strip("<>")
+        elif line.startswith("author-time ") and author:
+            key = (author, int(line[len("author-time "):]))
+            counts[key] = counts.get(key, 0) + 1
+    authors = {}
+    for (author, when), lines in sorted(counts.items()):
+        authors.setdefault(author, []).append([when, lines])
+    return authors
+
+def cache_key(path, blob):
+    # Blame depends on the file's history, not just its content: identical blobs at two paths differ.
+    return f"{blob} {path}"
+
+def blame_all(root, blobs, cache, workers=8):
+    """
+    {path: blame_file() result} for {path: blob id}. Files already in cache ({"<blob id> <path>": result}) are
+    not blamed again; the rest are blamed in parallel. cache is updated in place and pruned to the given files.
+    """
+    keys = {path: cache_key(path, blob) for path, blob in blobs.items()}
+    pending = [path for path, key in keys.items() if key not in cache]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        cache.update(zip((keys[path] for path in pending), pool.map(lambda path: blame_file(root, path), pending)))
+    for stale in set(cache) - set(keys.values()):
+        del cache[stale]
+    return {path: cache[key] for path, key in keys.items()}
+
+def author_weights(authors, now, half_life_days=HALF_LIFE_DAYS):
+    """{author: lines weighted by 0.5 ** (age / half-life)}, so recent authorship counts for more."""
+    weights = {}
+    for author, entries in authors.items():
+        weights[author] = sum(lines * 0.5 ** (max(0, now - when) / 86400 / half_life_days) for when, lines in entries)
+    return weights
+
+def top_owner(weights):
+    return max(sorted(weights), key=lambda author: weights[author]) if weights else None
+
+def infer_patterns(blames, now, half_life_days=HALF_LIFE_DAYS):
+    """
+    Ownership patterns ({pattern: owner}, last match wins) from {path: blame}. Each directory is owned by the top
+    author of everything beneath it; a directory or file gets its own pattern only where its owner differs.
+    """
+    file_weights = {path: author_weights(authors, now, half_life_days) for path, authors in blames.items()}
+    dir_weights = {}
+    for path, weights in file_weights.items():
+        parts = path.split("/")[:-1]
+        for depth in range(len(parts) + 1):
+            totals = dir_weights.setdefault("/".join(parts[:depth]), {})
+            for author, weight in weights.items():
+                totals[author] = totals.get(author, 0.0) + weight
+    dir_owner = {d: top_owner(w) for d, w in dir_weights.items()}
+    patterns = {}
+    if dir_owner.get(""):
+        patterns["*"] = dir_owner[""]
+    for d in sorted(dir_owner, key=lambda d: (d.count("/"), d)):
+        if d and dir_owner[d] and dir_owner[d] != dir_owner[d.rpartition("/")[0]]:
+            patterns[f"/{d}/" if "/" not in d else f"{d}/"] = dir_owner[d]
+    for path, weights in sorted(file_weights.items()):
+        owner = top_owner(weights)
+        if owner and owner != dir_owner[path.rpartition("/")[0]]:
+            patterns[path if "/" in path else f"/{path}"] = owner
+    return patterns
+
+def infer_ownership(root, cache_path=BLAME_CACHE_PATH, workers=8, half_life_days=HALF_LIFE_DAYS, now=None):
+    """Blame every file in HEAD (reusing cached blobs) and return (patterns, number of files blamed now)."""
+    cache = load_json(Path(cache_path))
+    blobs = head_blobs(root)
+    fresh = sum(cache_key(path, blob) not in cache for path, blob in blobs.items())
+    blames = blame_all(root, blobs, cache, workers)
+    Path(cache_path).parent.mkdir(exist_ok=True)
+    tmp = Path(cache_path).with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(cache, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp, cache_path)
+    return infer_patterns(blames, time.time() if now is None else now, half_life_days), fresh
+
+def merge_inferred(current, previous, inferred):
+    """
+    New file_ownership patterns: inferred, then the manual entries of current (those that differ from the
+    previously inferred patterns), so manual entries keep winning over inferred ones.
+    """
+    merged = dict(inferred)
+    for pattern, owner in current.items():
+        if previous.get(pattern) != owner:
+            merged.pop(pattern, None)
+            merged[pattern] = owner
+    return merged
+
 def main():
     parser = get_arg_parser()
     parser.add_argument('--set-rule-owner', nargs=2, metavar=('RULE', 'OWNER'), help='Assign owner to a rule')
-    parser.add_argument('--set-file-owner', nargs=2, metavar=('FILE', 'OWNER'), help='Assign owner to a file')
+    parser.add_argument('--set-file-owner', nargs=2, metavar=('PATTERN', 'OWNER'), help='Assign owner to a file, directory (dir/) or glob')
     parser.add_argument('--list-rule-owners', action='store_true', help='List rule owners')
     parser.add_argument('--list-file-owners', action='store_true', help='List file owners')
     parser.add_argument('--query', type=str, help='Query owner for a rule or file')
+    parser.add_argument('--infer', action='store_true', help='Regenerate file_ownership.json from git blame')
+    parser.add_argument('--half-life-days', type=float, default=HALF_LIFE_DAYS, help='Age at which a line counts half (--infer)')
+    parser.add_argument('--workers', type=int, default=8, help='Parallel git blame processes (--infer)')
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
     # Rule ownership
@@ -56,25 +178,35 @@ def main():
             logger.info(f"{rule} | {meta.get('owner','-')}")
     # File ownership
     file_owners = load_json(FILE_OWNERSHIP_PATH)
-    if args.set_file_owner:
+    if args.infer:
+        inferred, fresh = infer_ownership(Path(__file__).parent.parent, workers=args.workers, half_life_days=args.half_life_days)
+        merged = merge_inferred(file_owners, load_json(INFERRED_OWNERSHIP_PATH), inferred)
+        save_json(FILE_OWNERSHIP_PATH, merged)
+        save_json(INFERRED_OWNERSHIP_PATH, inferred)
+        logger.info(f"Inferred {len(inferred)} ownership patterns ({fresh} files blamed, the rest from cache); "
+                    f"kept {len(merged) - len(inferred)} manual entries after them.")
+    elif args.set_file_owner:
         file, owner = args.set_file_owner
+        # Re-adding moves the pattern to the end, where it takes precedence
+        file_owners.pop(file, None)
         file_owners[file] = owner
         save_json(FILE_OWNERSHIP_PATH, file_owners)
         logger.info(f"Set owner of file '{file}' to {owner}")
     elif args.list_file_owners:
-        logger.info("File | Owner")
-        logger.info("-----|------")
+        logger.info("Pattern | Owner")
+        logger.info("--------|------")
         for file, owner in file_owners.items():
             logger.info(f"{file} | {owner}")
     # Query
     if args.query:
+        file_owner = get_ownership(FILE_OWNERSHIP_PATH).owner_of(args.query)
         if args.query in mapping:
             logger.info(f"Rule '{args.query}' owner: {mapping[args.query].get('owner','-')}")
-        elif args.query in file_owners:
-            logger.info(f"File '{args.query}' owner: {file_owners[args.query]}")
+        elif file_owner:
+            logger.info(f"File '{args.query}' owner: {file_owner}")
         else:
             logger.info(f"No owner found for '{args.query}'")
-    if not any([args.set_rule_owner, args.set_file_owner, args.list_rule_owners, args.list_file_owners, args.query]):
+    if not any([args.set_rule_owner, args.set_file_owner, args.list_rule_owners, args.list_file_owners, args.query, args.infer]):
         parser.print_help()
 
 if __name__ == "__main__":
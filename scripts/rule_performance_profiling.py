@@ -4,16 +4,21 @@ Automated Rule Performance Profiling
 - Tracks and reports the runtime/performance impact of each rule
 - Aggregates timing data from all rule scripts
 - Alerts if a rule becomes a bottleneck
+- Detects runtime regressions (latest N runs vs. history, Mann-Whitney U test),
+  normalised against a calibration workload and attributed to a commit range
 Category: automation
 """
 import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import json
+import math
 import time
+import subprocess
 from pathlib import Path
 from collections import defaultdict
 import os
+import numpy as np
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -24,27 +29,140 @@ RULES_DIR = Path(__file__).parent
 RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
 
 
-def log_performance(rule, duration):
+# Fixed CPU workload used to normalise timings across runners of different speed.
+CALIBRATION_LOOPS = 200_000
+_calibration = None
+
+
+def calibrate():
+    """Best-of-3 runtime (seconds) of a fixed workload, measured once per process."""
+    global _calibration
+    if _calibration is None:
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            sum(i * i for i in range(CALIBRATION_LOOPS))
+            best = min(best, time.perf_counter() - start)
+        _calibration = best
+    return _calibration
+
+def current_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return os.environ.get("GITHUB_SHA")
+
+def log_performance(rule, duration, commit=None, calibration=None):
     LOGS_DIR.mkdir(exist_ok=True)
+    entry = {
+        "rule": rule,
+        "duration": duration,
+        "ts": time.time(),
+        "commit": commit or current_commit(),
+        "calibration": calibration or calibrate(),
+    }
     with open(PERF_LOG, "a") as f:
-        f.write(json.dumps({"rule": rule, "duration": duration, "ts": time.time()}) + "\n")
+        f.write(json.dumps(entry) + "\n")
 
-def aggregate_performance():
+def load_performance():
     if not PERF_LOG.exists():
-        return {}
-    data = defaultdict(list)
+        return []
     with open(PERF_LOG) as f:
-        for line in f:
-            if line.strip():
-                entry = json.loads(line)
-                data[entry["rule"]].append(entry["duration"])
+        return [json.loads(line) for line in f if line.strip()]
+
+def aggregate_performance():
+    data = defaultdict(list)
+    for entry in load_performance():
+        data[entry["rule"]].append(entry["duration"])
     return {rule: sum(times)/len(times) for rule, times in data.items()}
 
+def rankdata(values):
+    """Ranks with ties averaged, plus the tie group sizes."""
+    values = np.asarray(values, dtype=np.float64)
+    order = np.argsort(values, kind="mergesort")
+    _, inverse, counts = np.unique(values[order], return_inverse=True, return_counts=True)
+    ranks = np.empty(len(values))
+    ranks[order] = (np.cumsum(counts) - (counts - 1) / 2.0)[inverse]
+    return ranks, counts
+
+def mann_whitney_greater(recent, history):
+    """
+    One-sided Mann-Whitney U test that `recent` tends to be larger than `history`.
+    Uses the tie-corrected normal approximation; returns the p-value.
+    """
+    n1, n2 = len(recent), len(history)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    ranks, ties = rankdata(np.concatenate([recent, history]))
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2.0
+    n = n1 + n2
+    tie_term = (ties ** 3 - ties).sum() / (n * (n - 1))
+    sigma = math.sqrt(n1 * n2 / 12.0 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return 1.0
+    z = (u - n1 * n2 / 2.0 - 0.5) / sigma
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def normalised_durations(entries):
+    """Durations divided by the runner's calibration time (raw seconds if uncalibrated)."""
+    return np.array([e["duration"] / e["calibration"] if e.get("calibration") else e["duration"] for e in entries])
+
+def slowdown_commit_range(entries, values, threshold):
+    """Return 'good..bad' for the commit where the trailing run of slow timings started."""
+    start = len(values)
+    while start > 0 and values[start - 1] > threshold:
+        start -= 1
+    if start == len(values):
+        return None
+    bad = entries[start].get("commit")
+    good = entries[start - 1].get("commit") if start > 0 else None
+    if not bad:
+        return None
+    return f"{good[:12]}..{bad[:12]}" if good and good != bad else bad[:12]
+
+def detect_regressions(entries, recent=5, min_history=5, max_slowdown=0.3, alpha=0.05):
+    """
+    Compare the latest `recent` runs of each rule against its earlier runs.
+    A rule regresses when the test is significant at `alpha` and its median
+    normalised runtime grew by at least `max_slowdown` (0.3 = 30% slower).
+    """
+    by_rule = defaultdict(list)
+    for entry in entries:
+        by_rule[entry["rule"]].append(entry)
+    regressions = []
+    for rule, runs in by_rule.items():
+        runs.sort(key=lambda e: e.get("ts", 0))
+        if len(runs) < recent + min_history:
+            continue
+        values = normalised_durations(runs)
+        base_median = float(np.median(values[:-recent]))
+        recent_median = float(np.median(values[-recent:]))
+        if base_median <= 0:
+            continue
+        slowdown = recent_median / base_median - 1
+        if slowdown < max_slowdown:
+            continue
+        p_value = mann_whitney_greater(values[-recent:], values[:-recent])
+        if p_value < alpha:
+            threshold = base_median * (1 + max_slowdown)
+            regressions.append({
+                "rule": rule,
+                "slowdown": slowdown,
+                "p_value": p_value,
+                "commits": slowdown_commit_range(runs, values, threshold),
+            })
+    return sorted(regressions, key=lambda r: -r["slowdown"])
+
 def main():
     parser = get_arg_parser()
     parser.add_argument('--profile', type=str, help='Profile a rule script (by name)')
     parser.add_argument('--aggregate', action='store_true', help='Show aggregated performance report')
     parser.add_argument('--alert-threshold', type=float, default=2.0, help='Alert if rule avg runtime exceeds this (seconds)')
+    parser.add_argument('--regressions', action='store_true', help='Detect runtime regressions against each rule\'s history')
+    parser.add_argument('--recent', type=int, default=5, help='Number of latest runs compared against history')
+    parser.add_argument('--max-slowdown', type=float, default=0.3, help='Relative slowdown that counts as a regression (0.3 = 30%%)')
+    parser.add_argument('--alpha', type=float, default=0.05, help='Significance level for the regression test')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit 1 if any regression is detected')
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
     if args.profile:
@@ -53,7 +171,7 @@ def main():
             logger.error(f"Script {args.profile} not found.")
             sys.exit(1)
         start = time.time()
-        exit_code = sys.call([sys.executable, str(script)])
+        exit_code = subprocess.call([sys.executable, str(script)])
         duration = time.time() - start
         log_performance(args.profile, duration)
         logger.info(f"Profiled {args.profile}: {duration:.2f}s (exit {exit_code})")
@@ -67,6 +185,16 @@ def main():
         for rule, avg in perf.items():
             if avg > args.alert_threshold:
                 logger.warning(f"ALERT: {rule} avg runtime {avg:.2f}s exceeds threshold {args.alert_threshold}s!")
+    elif args.regressions:
+        regressions = detect_regressions(load_performance(), recent=args.recent,
+                                         max_slowdown=args.max_slowdown, alpha=args.alpha)
+        if not regressions:
+            logger.info("No rule runtime regressions detected.")
+        for r in regressions:
+            where = f", introduced in {r['commits']}" if r['commits'] else ""
+            logger.warning(f"REGRESSION: {r['rule']} is {r['slowdown']*100:.0f}% slower (p={r['p_value']:.4f}){where}")
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
     else:
         parser.print_help()
 
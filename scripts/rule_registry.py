@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Rule Registry
+- Loads rule_mapping.json once per change (cached by file mtime) and validates it
+- Precomputed indexes: by category, script, owner, severity and enforcement, plus deprecated rules
+  and resolved upgrade_to chains, so every lookup is a dict access
+- Usage: from scripts.rule_registry import get_registry; get_registry().rules_by_owner("team-a")
+Category: automation
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+from pathlib import Path
+from scripts.central_logger import get_logger
+from scripts.central_args import get_arg_parser
+
+RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
+SEVERITIES = {"error", "warning", "info"}
+ENFORCEMENTS = {"block", "warn", "off"}
+DEFAULT_SEVERITY = "error"
+DEFAULT_ENFORCEMENT = "block"
+
+
+class RuleRegistry:
+    """Read-only, indexed view of a rule mapping. Use get_registry() for the cached instance."""
+
+    def __init__(self, mapping):
+        if not isinstance(mapping, dict):
+            raise ValueError("rule mapping must be a JSON object of rule -> metadata")
+        bad = [rule for rule, meta in mapping.items() if not isinstance(meta, dict)]
+        if bad:
+            raise ValueError(f"rule metadata must be objects: {', '.join(sorted(bad))}")
+        self.rules = mapping
+        self.problems = []
+        self.by_category, self.by_script, self.by_owner = {}, {}, {}
+        self.by_severity, self.by_enforcement = {}, {}
+        self.deprecated = set()
+        self.upgrade_to = {}
+        for rule, meta in mapping.items():
+            severity = meta.get("severity", DEFAULT_SEVERITY)
+            enforcement = meta.get("enforcement", DEFAULT_ENFORCEMENT)
+            if severity not in SEVERITIES:
+                self.problems.append(f"{rule}: unknown severity '{severity}'")
+            if enforcement not in ENFORCEMENTS:
+                self.problems.append(f"{rule}: unknown enforcement '{enforcement}'")
+            self.by_severity.setdefault(severity, set()).add(rule)
+            self.by_enforcement.setdefault(enforcement, set()).add(rule)
+            for category in str(meta.get("category") or "uncategorized").split(","):
+                self.by_category.setdefault(category.strip().lower(), set()).add(rule)
+            if meta.get("script"):
+                self.by_script.setdefault(Path(meta["script"]).name, set()).add(rule)
+            if meta.get("owner"):
+                self.by_owner.setdefault(meta["owner"], set()).add(rule)
+            if meta.get("deprecated"):
+                self.deprecated.add(rule)
+            if meta.get("upgrade_to"):
+                self.upgrade_to[rule] = meta["upgrade_to"]
+                if meta["upgrade_to"] not in mapping:
+                    self.problems.append(f"{rule}: upgrade_to unknown rule '{meta['upgrade_to']}'")
+        self.upgrade_chains = {rule: self._resolve_chain(rule) for rule in self.upgrade_to}
+
+    def _resolve_chain(self, rule):
+        chain, seen = [], {rule}
+        while rule in self.upgrade_to:
+            rule = self.upgrade_to[rule]
+            if rule in seen:
+                self.problems.append(f"upgrade_to cycle: {' -> '.join(chain + [rule])}")
+                break
+            seen.add(rule)
+            chain.append(rule)
+        return chain
+
+    def __contains__(self, rule):
+        return rule in self.rules
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __getitem__(self, rule):
+        return self.rules[rule]
+
+    def get(self, rule, default=None):
+        return self.rules.get(rule, default)
+
+    def keys(self):
+        return self.rules.keys()
+
+    def items(self):
+        return self.rules.items()
+
+    def as_dict(self):
+        return self.rules
+
+    def rules_in_category(self, category):
+        return self.by_category.get(category.lower(), set())
+
+    def rules_for_script(self, script):
+        return self.by_script.get(Path(script).name, set())
+
+    def rules_by_owner(self, owner):
+        return self.by_owner.get(owner, set())
+
+    def rules_with_severity(self, severity):
+        return self.by_severity.get(severity, set())
+
+    def rules_with_enforcement(self, enforcement):
+        return self.by_enforcement.get(enforcement, set())
+
+    def blocking_rules(self):
+        """Rules whose violations fail a run: severity error and enforcement block."""
+        return self.rules_with_severity("error") & self.rules_with_enforcement("block")
+
+    def rules_for_path(self, path):
+        """Rules implemented by or named after the file at path."""
+        name = Path(path).name
+        found = set(self.by_script.get(name, ()))
+        stem = Path(path).stem
+        if stem in self.rules:
+            found.add(stem)
+        return found
+
+    def upgrade_chain(self, rule):
+        """Successive upgrade_to targets of rule, e.g. ['rule_v2', 'rule_v3']."""
+        return self.upgrade_chains.get(rule, [])
+
+    def final_upgrade(self, rule):
+        """Last rule in rule's upgrade chain, or None if it has no upgrade."""
+        chain = self.upgrade_chain(rule)
+        return chain[-1] if chain else None
+
+
+_cache = {}
+
+
+def load_rule_mapping(path=RULE_MAPPING_PATH):
+    """Raw rule mapping dict ({} if the file does not exist), served from the registry cache."""
+    return get_registry(path).as_dict()
+
+def get_registry(path=RULE_MAPPING_PATH):
+    """Registry for path, rebuilt only when the file's mtime or size changes."""
+    path = Path(path)
+    try:
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        key = None
+    cached = _cache.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    if key is None:
+        mapping = {}
+    else:
+        with open(path) as f:
+            mapping = json.load(f)
+    registry = RuleRegistry(mapping)
+    _cache[path] = (key, registry)
+    return registry
+
+def main():
+    parser = get_arg_parser()
+    parser.add_argument('--validate', action='store_true', help='Validate rule_mapping.json')
+    parser.add_argument('--summary', action='store_true', help='Show rule counts per index')
+    args = parser.parse_args()
+    logger = get_logger(debug=args.debug)
+    if args.validate:
+        registry = get_registry()
+        for problem in registry.problems:
+            logger.error(problem)
+        if registry.problems:
+            sys.exit(1)
+        logger.info(f"rule_mapping.json is valid ({len(registry)} rules).")
+    elif args.summary:
+        registry = get_registry()
+        for name in ("by_category", "by_severity", "by_enforcement", "by_owner"):
+            counts = {k: len(v) for k, v in sorted(getattr(registry, name).items())}
+            logger.info(f"{name}: {counts}")
+        logger.info(f"deprecated: {sorted(registry.deprecated)}")
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@
 Rule-Based Release Gates
 - Blocks releases if critical rules are violated, with override/escalation workflow
 - Integrates with CI/CD to enforce gates
+- Reads the latest per-run summary (logs/latest_run.json) written by run_all_checks.py; a summary recorded
+  for another commit is stale and blocks the release, and failed scripts of blocking rules count as violations
 Category: automation
 """
 import os
@@ -13,6 +15,8 @@ from pathlib import Path
 import os
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts.run_history import load_latest_summary, current_commit
+from scripts.rule_registry import get_registry
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 VIOLATION_LOG = Path(__file__).parent.parent / "logs/rule_violations.jsonl"
@@ -25,22 +29,49 @@ def load_violations():
     with open(VIOLATION_LOG) as f:
         return [json.loads(line) for line in f if line.strip()]
 
+def count_critical_violations(registry):
+    """Fallback when no run summary exists: scan the whole violation log."""
+    critical_rules = registry.blocking_rules()
+    return sum(1 for v in load_violations() if v['rule'] in critical_rules)
+
+def gate_problems(summary, registry, head):
+    """
+    Reasons the run in summary blocks a release at commit head: a stale summary, blocking violations,
+    and scripts of blocking rules that did not pass (they may fail without recording any violation).
+    """
+    if head and summary.get('commit') != head:
+        return [f"run {summary['run_id']} was recorded for commit {(summary.get('commit') or '-')[:12]}, "
+                f"not HEAD {head[:12]}; re-run scripts/run_all_checks.py"]
+    problems = []
+    if summary['blocking']['count']:
+        problems.append(f"{summary['blocking']['count']} critical rule violations")
+    blocking = registry.blocking_rules()
+    for failed in summary.get('failed_scripts', []):
+        rules = registry.rules_for_path(failed['script']) & blocking
+        if rules:
+            problems.append(f"{failed['script']} {failed['status']} (blocking rule {', '.join(sorted(rules))})")
+    return problems
+
 def main():
     parser = get_arg_parser()
     parser.add_argument('--enforce', action='store_true', help='Block release if critical rules are violated')
     parser.add_argument('--override', action='store_true', help='Override gate and allow release')
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
-    mapping = json.load(open(RULE_MAPPING_PATH))
-    violations = load_violations()
-    critical_rules = [r for r, meta in mapping.items() if meta.get('severity', 'error') == 'error' and meta.get('enforcement', 'block') == 'block']
-    critical_violations = [v for v in violations if v['rule'] in critical_rules]
     if args.enforce:
-        if critical_violations and not args.override:
-            logger.error(f"Release blocked: {len(critical_violations)} critical rule violations found.")
+        summary = load_latest_summary()
+        registry = get_registry(RULE_MAPPING_PATH)
+        if summary is not None:
+            logger.info(f"Gating on run {summary['run_id']} (commit {(summary.get('commit') or '-')[:12]}).")
+            problems = gate_problems(summary, registry, current_commit())
+        else:
+            critical = count_critical_violations(registry)
+            problems = [f"{critical} critical rule violations"] if critical else []
+        if problems and not args.override:
+            logger.error(f"Release blocked: {'; '.join(problems)}.")
             sys.exit(1)
-        elif critical_violations and args.override:
-            logger.warning(f"Release override: {len(critical_violations)} critical rule violations present.")
+        elif problems and args.override:
+            logger.warning(f"Release override: {'; '.join(problems)}.")
         else:
             logger.info("No critical rule violations. Release allowed.")
     else:
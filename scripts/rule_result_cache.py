@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Per-file rule result cache for counterfactual evaluation.
+- Rule scripts may expose check_file(path, config) -> [violation messages] as a per-file entry point
+- Results are cached in .smartai_cache/rule_results.json per rule and file, keyed by file content hash;
+  a rule's entries are dropped when its script or .smartai_rules.yaml changes
+- evaluate() runs a rule only on files without a cached result and reports which files it could not evaluate
+Category: automation
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import hashlib
+import importlib.util
+import json
+import time
+from pathlib import Path
+from scripts.central_logger import get_logger
+
+ROOT = Path(__file__).parent.parent
+SCRIPTS_DIR = Path(__file__).parent
+CACHE_PATH = ROOT / ".smartai_cache" / "rule_results.json"
+
+
+def file_hash(path):
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+
+def load_results(path=CACHE_PATH):
+    if Path(path).exists():
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {}
+
+def save_results(results, path=CACHE_PATH):
+    Path(path).parent.mkdir(exist_ok=True)
+    tmp = Path(path).with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(results, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp, path)
+
+def rule_script(rule, meta=None):
+    """Path of the script implementing rule (scripts/ or scripts/plugins/), or None."""
+    name = (meta or {}).get("script") or f"{rule}.py"
+    for folder in (SCRIPTS_DIR, SCRIPTS_DIR / "plugins"):
+        if (folder / Path(name).name).exists():
+            return folder / Path(name).name
+    return None
+
+def rule_checker(script):
+    """
+    The script's check_file(path, config) function, or None if it has no per-file entry point or fails to
+    import. Rule scripts are CLI programs: importing one may run code that raises or calls sys.exit().
+    """
+    if script is None:
+        return None
+    spec = importlib.util.spec_from_file_location(f"_rule_{Path(script).stem}", script)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except (Exception, SystemExit) as e:
+        get_logger().warning(f"Cannot load {Path(script).name} ({type(e).__name__}: {e}); its rule is not evaluated.")
+        return None
+    return getattr(module, "check_file", None)
+
+def rule_stamp(script, config):
+    """Changes whenever the rule's implementation or the rule config changes."""
+    digest = hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode())
+    if script is not None:
+        digest.update(Path(script).read_bytes())
+    return digest.hexdigest()
+
+def evaluate(rule, files, config, meta=None, root=ROOT, results=None, run=True):
+    """
+    Violation counts of rule on files (paths relative to root).
+    Cached results are reused; the rule runs only on the remaining files, if it has a check_file()
+    entry point and run is True. Returns
+    {"violations": {file: count}, "cached": n, "ran": n, "unknown": [files],
+     "seconds_per_file": mean check_file() runtime measured now or on an earlier evaluation, or None}.
+    results is the loaded cache dict; it is updated in place (save it with save_results).
+    """
+    results = load_results() if results is None else results
+    script = rule_script(rule, meta)
+    stamp = rule_stamp(script, config)
+    entries = results.get(rule)
+    if not entries or entries.get("stamp") != stamp:
+        entries = results[rule] = {"stamp": stamp, "files": {}}
+    report = {"violations": {}, "cached": 0, "ran": 0, "unknown": [], "seconds_per_file": entries.get("seconds_per_file")}
+    pending = []
+    for rel in files:
+        digest = file_hash(Path(root) / rel)
+        cached = entries["files"].get(rel)
+        if cached and cached[0] == digest:
+            report["violations"][rel] = cached[1]
+            report["cached"] += 1
+        else:
+            pending.append((rel, digest))
+    checker = rule_checker(script) if pending and run else None
+    if checker is None:
+        report["unknown"] = [rel for rel, _ in pending]
+        return report
+    start = time.perf_counter()
+    for rel, digest in pending:
+        try:
+            count = len(checker(Path(root) / rel, config))
+        except (Exception, SystemExit):
+            report["unknown"].append(rel)
+            continue
+        entries["files"][rel] = [digest, count]
+        report["violations"][rel] = count
+        report["ran"] += 1
+    if report["ran"]:
+        entries["seconds_per_file"] = report["seconds_per_file"] = (time.perf_counter() - start) / report["ran"]
+    return report
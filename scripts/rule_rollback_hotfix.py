@@ -4,6 +4,7 @@ Automated Rollback/Hotfix for Rule Failures
 - Detects if a new rule or config breaks CI (via logs or status)
 - Auto-reverts the last rule/config change and notifies maintainers
 - Optionally creates a hotfix branch or issue
+- Without --ci-log, uses the latest run summary (logs/latest_run.json) to decide whether CI failed
 Category: automation
 """
 import os
@@ -17,6 +18,7 @@ from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
 from scripts.notify_slack import send_slack_notification
 from scripts.notify_email import send_email_notification
+from scripts.run_history import load_latest_summary
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
@@ -48,8 +50,12 @@ def main():
         if log_path.exists() and 'FAIL' in log_path.read_text():
             failed = True
     else:
-        # Assume run from CI failure context
-        failed = True
+        summary = load_latest_summary()
+        if summary is not None:
+            failed = summary.get('status') != 'pass'
+        else:
+            # Assume run from CI failure context
+            failed = True
     if not failed:
         logger.info("No rule/config failure detected.")
         return
@@ -3,65 +3,177 @@
 Automated Security Patch for Rule Scripts
 - Scans rule scripts for vulnerabilities (e.g., insecure imports, eval, subprocess)
 - Auto-patches or notifies maintainers if issues are found
+- One NodeVisitor pass per file checks every pattern; call targets are resolved through import aliases,
+  so `import os as o; o.system(...)` and `from subprocess import run` are reported as os.system / subprocess.run
+- Covers scripts/check_*.py, scripts/plugins/ and every version in the marketplace registry
+- Results are cached by content hash in .smartai_cache/security_scan.json; new content is scanned in a process pool
 Category: automation
 """
 import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import ast
-import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import json
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
 from scripts.notify_slack import send_slack_notification
 from scripts.notify_email import send_email_notification
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.rule_marketplace import REGISTRY_PATH, blob_path, load_index
 
 RULES_DIR = Path(__file__).parent
+PLUGINS_DIR = RULES_DIR / "plugins"
+CACHE_PATH = Path(__file__).parent.parent / ".smartai_cache" / "security_scan.json"
 
-DANGEROUS = ["eval", "exec", "os.system", "subprocess", "input"]
+DANGEROUS = ["eval", "exec", "os.system", "os.popen", "subprocess", "input", "__import__", "pickle.loads", "marshal.loads"]
+DANGEROUS_IMPORTS = ("os", "subprocess")
+SCANNER_STAMP = hashlib.sha1(json.dumps([DANGEROUS, DANGEROUS_IMPORTS, 2]).encode()).hexdigest()
+PARALLEL_THRESHOLD = 16
 
 
-def scan_script(path):
-    with open(path) as f:
-        tree = ast.parse(f.read(), filename=str(path))
-    issues = []
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call):
-            func = getattr(node.func, 'id', None) or getattr(getattr(node.func, 'attr', None), 'id', None)
-            if func and func in DANGEROUS:
-                issues.append((func, node.lineno))
-        if isinstance(node, ast.Import):
+class SecurityVisitor(ast.NodeVisitor):
+    """Collects dangerous calls and imports in one pass, tracking import aliases as they are bound."""
+
+    def __init__(self):
+        self.aliases = {}
+        self.issues = []
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            if alias.asname:
+                self.aliases[alias.asname] = alias.name
+            else:
+                top = alias.name.split(".")[0]
+                self.aliases[top] = top
+            if alias.name in DANGEROUS_IMPORTS:
+                self.issues.append({"kind": "import", "name": f"import {alias.name}", "line": node.lineno})
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node):
+        if node.level == 0 and node.module:
             for alias in node.names:
-                if alias.name in ("os", "subprocess"):
-                    issues.append((f"import {alias.name}", node.lineno))
-        if isinstance(node, ast.ImportFrom):
-            if node.module in ("os", "subprocess"):
-                issues.append((f"from {node.module} import ...", node.lineno))
-    return issues
+                self.aliases[alias.asname or alias.name] = f"{node.module}.{alias.name}"
+            if node.module in DANGEROUS_IMPORTS:
+                self.issues.append({"kind": "import", "name": f"from {node.module} import ...", "line": node.lineno})
+        self.generic_visit(node)
+
+    def qualified_name(self, node):
+        """Dotted name of a call target with its root alias resolved, or None for computed targets."""
+        if isinstance(node, ast.Name):
+            return self.aliases.get(node.id, node.id)
+        if isinstance(node, ast.Attribute):
+            base = self.qualified_name(node.value)
+            return f"{base}.{node.attr}" if base else None
+        return None
+
+    def visit_Call(self, node):
+        name = self.qualified_name(node.func)
+        if name and any(name == p or name.startswith(p + ".") for p in DANGEROUS):
+            self.issues.append({"kind": "call", "name": name, "line": node.lineno})
+        self.generic_visit(node)
+
+
+def scan_source(source, filename="<unknown>"):
+    """Issues ({"kind": "call" | "import", "name", "line"}) in source, in line order."""
+    visitor = SecurityVisitor()
+    try:
+        visitor.visit(ast.parse(source, filename=filename))
+    except (SyntaxError, ValueError):
+        return [{"kind": "error", "name": "unparseable", "line": 0}]
+    return sorted(visitor.issues, key=lambda i: i["line"])
+
+def scan_script(path):
+    with open(path, "rb") as f:
+        return scan_source(f.read(), str(path))
+
+def _scan_item(item):
+    digest, path = item
+    return digest, scan_script(path)
+
+def scan_targets(targets, cache=None, workers=None):
+    """
+    {label: issues} for {label: path}. Content already in cache (SCANNER_STAMP + content sha1 -> issues)
+    is not parsed again; new content is scanned in a process pool when there is enough of it.
+    cache is updated in place and pruned to the content seen in this scan.
+    """
+    cache = {} if cache is None else cache
+    if cache.get("scanner") != SCANNER_STAMP:
+        cache.clear()
+        cache["scanner"] = SCANNER_STAMP
+    known = cache.setdefault("results", {})
+    digests, pending = {}, {}
+    for label, path in targets.items():
+        digest = hashlib.sha1(Path(path).read_bytes()).hexdigest()
+        digests[label] = digest
+        if digest not in known:
+            pending.setdefault(digest, path)
+    if len(pending) >= PARALLEL_THRESHOLD and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            known.update(pool.map(_scan_item, pending.items(), chunksize=8))
+    else:
+        known.update(map(_scan_item, pending.items()))
+    cache["results"] = {d: known[d] for d in set(digests.values())}
+    return {label: cache["results"][digest] for label, digest in digests.items()}
+
+def local_targets():
+    """{path: path} for rule scripts and plugins."""
+    files = sorted(RULES_DIR.glob('check_*.py')) + sorted(PLUGINS_DIR.glob('*.py'))
+    return {str(f): f for f in files}
+
+def registry_targets(registry=REGISTRY_PATH):
+    """{"registry:<rule>@<version>": blob path} for every published version whose blob exists."""
+    targets = {}
+    for name, entry in load_index(registry)["rules"].items():
+        for version, meta in entry["versions"].items():
+            blob = blob_path(meta["hash"], registry)
+            if blob.exists():
+                targets[f"registry:{name}@{version}"] = blob
+    return targets
+
+def load_cache(path=CACHE_PATH):
+    if Path(path).exists():
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {}
+
+def save_cache(cache, path=CACHE_PATH):
+    Path(path).parent.mkdir(exist_ok=True)
+    tmp = Path(path).with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(cache, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp, path)
 
 def main():
     parser = get_arg_parser()
     parser.add_argument('--scan', action='store_true', help='Scan all rule scripts for security issues')
     parser.add_argument('--patch', action='store_true', help='Auto-patch (comment out) dangerous lines')
     parser.add_argument('--notify', action='store_true', help='Notify maintainers if issues found')
+    parser.add_argument('--workers', type=int, default=None, help='Processes for scanning new content (default: CPU count)')
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
     issues_found = False
-    for script in RULES_DIR.glob('check_*.py'):
-        issues = scan_script(script)
+    local = local_targets()
+    cache = load_cache()
+    results = scan_targets({**local, **registry_targets()}, cache, args.workers)
+    save_cache(cache)
+    for target, issues in results.items():
         if issues:
             issues_found = True
-            logger.warning(f"Security issues in {script}:")
-            for func, lineno in issues:
-                logger.warning(f"  {func} at line {lineno}")
-            if args.patch:
-                # Comment out dangerous lines (simple, not perfect)
+            logger.warning(f"Security issues in {target}:")
+            for issue in issues:
+                logger.warning(f"  {issue['name']} at line {issue['line']}")
+            if args.patch and target in local:
+                # Comment out dangerous lines (simple, not perfect); registry blobs are content-addressed and never patched
+                script = local[target]
                 lines = script.read_text().splitlines()
-                for func, lineno in issues:
-                    idx = lineno - 1
-                    if not lines[idx].lstrip().startswith('#'):
+                for issue in issues:
+                    idx = issue["line"] - 1
+                    if idx >= 0 and not lines[idx].lstrip().startswith('#'):
                         lines[idx] = '# PATCHED: ' + lines[idx]
                 script.write_text('\n'.join(lines))
                 logger.info(f"Patched {script}")
@@ -3,60 +3,154 @@
 Rule Visualization Dashboard
 - Interactive web dashboard for rule analytics, coverage, drift, and trends
 - Visualizes rule violations, performance, adoption, and more
+- Reads pre-aggregated rollups (see log_rollups.py) and builds each tab lazily, so
+  startup time and memory stay flat as the logs grow
+- Rollups are refreshed at most once per --refresh-seconds and shared by all callbacks; the open tab
+  re-renders on the same interval
 Category: analytics, visualization
 """
+import os
 import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import threading
+import time
 from pathlib import Path
-import json
-import pandas as pd
-import plotly.express as px
+import plotly.graph_objects as go
 import dash
-from dash import dcc, html
+from dash import dcc, html, Input, Output
+from scripts.central_logger import get_logger
+from scripts.central_args import get_arg_parser
+from scripts.log_rollups import refresh_rollups, hist_quantiles, downsample
 
 LOGS_DIR = Path(__file__).parent.parent / "logs"
 
-# Helper to load JSONL logs
-def load_jsonl(path):
-    if not path.exists():
-        return []
-    with open(path) as f:
-        return [json.loads(line) for line in f if line.strip()]
-
-def build_dashboard():
-    # Load logs
-    violations = load_jsonl(LOGS_DIR / "rule_violations.jsonl")
-    performance = load_jsonl(LOGS_DIR / "rule_performance.jsonl")
-    adoption = load_jsonl(LOGS_DIR / "rule_adoption.jsonl")
-    drift = load_jsonl(LOGS_DIR / "rule_drift.jsonl")
-    # DataFrames
-    df_v = pd.DataFrame(violations)
-    df_p = pd.DataFrame(performance)
-    df_a = pd.DataFrame(adoption)
-    df_d = pd.DataFrame(drift)
-    # Layout
+# Server-side cap on points per drift line; longer series are bucket-averaged.
+MAX_POINTS = 500
+REFRESH_SECONDS = 30
+
+TABS = [
+    ("violations", "Violations"),
+    ("performance", "Performance"),
+    ("adoption", "Adoption"),
+    ("drift", "Drift"),
+]
+
+
+def violations_figure(table):
+    by_rule = table.get("by_rule") or {}
+    if not by_rule:
+        return None
+    rules = sorted(by_rule, key=lambda r: -sum(by_rule[r].values()))
+    severities = sorted({sev for counts in by_rule.values() for sev in counts})
+    fig = go.Figure([go.Bar(name=sev, x=rules, y=[by_rule[r].get(sev, 0) for r in rules]) for sev in severities])
+    fig.update_layout(barmode="stack", title="Rule Violations by Rule")
+    return fig
+
+
+def performance_figure(table):
+    if not table:
+        return None
+    rules = sorted(table)
+    quartiles = [hist_quantiles(table[r]["hist"], (0.25, 0.5, 0.75)) for r in rules]
+    fig = go.Figure(go.Box(
+        x=rules,
+        q1=[q[0] for q in quartiles],
+        median=[q[1] for q in quartiles],
+        q3=[q[2] for q in quartiles],
+        lowerfence=[table[r]["min"] for r in rules],
+        upperfence=[table[r]["max"] for r in rules],
+        mean=[table[r]["sum"] / table[r]["count"] for r in rules],
+    ))
+    fig.update_layout(title="Rule Performance (ms)")
+    return fig
+
+
+def adoption_figure(table):
+    if not table:
+        return None
+    rules = sorted(table)
+    fig = go.Figure(go.Bar(x=rules, y=[table[r] for r in rules]))
+    fig.update_layout(title="Rule Adoption Rate")
+    return fig
+
+
+def drift_figure(table):
+    if not table:
+        return None
+    fig = go.Figure()
+    for rule, days in sorted(table.items()):
+        dates = sorted(days)
+        scores = [days[d][0] / days[d][1] for d in dates]
+        xs, ys = downsample(dates, scores, MAX_POINTS)
+        fig.add_trace(go.Scatter(x=xs, y=ys, mode="lines", name=rule))
+    fig.update_layout(title="Rule Drift Over Time")
+    return fig
+
+
+FIGURES = {
+    "violations": violations_figure,
+    "performance": performance_figure,
+    "adoption": adoption_figure,
+    "drift": drift_figure,
+}
+
+# (tab, data version) -> rendered tab content; entries for stale versions are dropped.
+_figure_cache = {}
+
+
+def render_tab(tab, rollups):
+    key = (tab, rollups["version"])
+    if key not in _figure_cache:
+        for stale in [k for k in _figure_cache if k[1] != rollups["version"]]:
+            del _figure_cache[stale]
+        fig = FIGURES[tab](rollups["tables"].get(tab) or {})
+        _figure_cache[key] = dcc.Graph(figure=fig) if fig is not None else html.Div(f"No {tab} data.")
+    return _figure_cache[key]
+
+
+class RollupSnapshot:
+    """Rollups shared by every callback, refreshed (incrementally) at most once per interval seconds."""
+
+    def __init__(self, logs_dir=LOGS_DIR, interval=REFRESH_SECONDS, clock=time.monotonic):
+        self.logs_dir, self.interval, self._clock = logs_dir, interval, clock
+        self._rollups, self._refreshed = None, None
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            now = self._clock()
+            if self._rollups is None or now - self._refreshed >= self.interval:
+                self._rollups, self._refreshed = refresh_rollups(logs_dir=self.logs_dir), now
+            return self._rollups
+
+
+def build_dashboard(logs_dir=LOGS_DIR, refresh_seconds=REFRESH_SECONDS):
+    snapshot = RollupSnapshot(logs_dir, refresh_seconds)
     app = dash.Dash(__name__)
     app.layout = html.Div([
         html.H1("SmartAIPlatform Rule Visualization Dashboard"),
-        dcc.Tabs([
-            dcc.Tab(label='Violations', children=[
-                dcc.Graph(figure=px.histogram(df_v, x='rule', color='severity', title='Rule Violations by Rule')) if not df_v.empty else html.Div("No violation data.")
-            ]),
-            dcc.Tab(label='Performance', children=[
-                dcc.Graph(figure=px.box(df_p, x='rule', y='runtime_ms', title='Rule Performance (ms)')) if not df_p.empty else html.Div("No performance data.")
-            ]),
-            dcc.Tab(label='Adoption', children=[
-                dcc.Graph(figure=px.bar(df_a, x='rule', y='adoption_rate', title='Rule Adoption Rate')) if not df_a.empty else html.Div("No adoption data.")
-            ]),
-            dcc.Tab(label='Drift', children=[
-                dcc.Graph(figure=px.line(df_d, x='timestamp', y='drift_score', color='rule', title='Rule Drift Over Time')) if not df_d.empty else html.Div("No drift data.")
-            ]),
-        ])
+        dcc.Tabs(id="tabs", value=TABS[0][0], children=[dcc.Tab(label=label, value=tab) for tab, label in TABS]),
+        html.Div(id="tab-content"),
+        dcc.Interval(id="refresh", interval=int(refresh_seconds * 1000)),
     ])
+
+    @app.callback(Output("tab-content", "children"), Input("tabs", "value"), Input("refresh", "n_intervals"))
+    def show_tab(tab, _):
+        # Unchanged rollups keep their data version, so the cached figure is reused.
+        return render_tab(tab, snapshot.get())
+
     return app
 
+
 def main():
-    app = build_dashboard()
-    app.run(debug=True, port=8050)
+    parser = get_arg_parser()
+    parser.add_argument('--port', type=int, default=8050, help='Port to serve the dashboard on')
+    parser.add_argument('--refresh-seconds', type=float, default=REFRESH_SECONDS, help='How often to refresh rollups')
+    args = parser.parse_args()
+    logger = get_logger(debug=args.debug)
+    app = build_dashboard(refresh_seconds=args.refresh_seconds)
+    logger.info(f"Serving rule dashboard on http://127.0.0.1:{args.port}")
+    app.run(debug=args.debug, port=args.port)
 
 if __name__ == "__main__":
     main()
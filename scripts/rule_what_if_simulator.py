@@ -3,17 +3,24 @@
 Rule 'What-If' Simulator
 - Simulates the impact of enabling/disabling rules before applying changes
 - Shows which files, checks, and teams would be affected
+- Estimates the violations a change would add or remove from cached per-file results (rule_result_cache.py),
+  running the rule only on files without a cached result
+- Projects the CI wall-clock change from rule timings in logs/rule_performance.jsonl (via log rollups)
 Category: automation
 """
 import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-import json
 from pathlib import Path
 import os
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts.rule_registry import get_registry
 from scripts.rule_config import load_rule_config
+from scripts.applicability_matrix import load_matrix
+from scripts.rule_result_cache import evaluate, load_results, save_results
+from scripts.log_rollups import refresh_rollups
+from scripts.ownership import get_ownership
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
@@ -21,48 +28,76 @@ RULE_CONFIG_PATH = Path(__file__).parent.parent / ".smartai_rules.yaml"
 FILE_OWNERSHIP_PATH = Path(__file__).parent.parent / "file_ownership.json"
 
 
-def load_json(path):
-    if path.exists():
-        with open(path) as f:
-            return json.load(f)
-    return {}
-
-def get_py_files(root):
-    return sorted([f for f in root.glob('**/*.py') if 'plugins/' not in str(f)])
+def project_change(rule, mask, matrix, report, perf, enabling):
+    """
+    Projected effect of enabling/disabling rule on the files in mask.
+    report: rule_result_cache.evaluate() output for those files; perf: performance rollups {rule: stats}.
+    Violations for files that could not be evaluated are extrapolated from the evaluated ones.
+    CI time uses the rule's historical mean runtime spread over its scope, or else the per-file time
+    measured while evaluating files.
+    """
+    evaluated = len(report["violations"])
+    found = sum(report["violations"].values())
+    unknown = len(report["unknown"])
+    estimated = found + (found / evaluated * unknown if evaluated else 0.0)
+    stats = perf.get(rule) or {}
+    if stats.get("count"):
+        per_file, source = stats["sum"] / stats["count"] / 1000.0 / max(matrix.count(matrix.scope.get(rule, 0)), 1), "history"
+    elif report["seconds_per_file"] is not None:
+        per_file, source = report["seconds_per_file"], "measured"
+    else:
+        per_file, source = None, None
+    sign = 1 if enabling else -1
+    return {"files": matrix.count(mask), "violations": sign * found, "estimated_violations": sign * estimated,
+            "evaluated": evaluated, "unknown": unknown,
+            "ci_seconds": None if per_file is None else sign * per_file * matrix.count(mask), "timing_source": source}
 
 def main():
     parser = get_arg_parser()
     parser.add_argument('--enable', nargs='+', help='Simulate enabling these rules')
     parser.add_argument('--disable', nargs='+', help='Simulate disabling these rules')
+    parser.add_argument('--cached-only', action='store_true', help='Do not run rules on files without a cached result')
     args = parser.parse_args()
     logger = get_logger(debug=args.debug)
-    mapping = load_json(RULE_MAPPING_PATH)
+    mapping = get_registry(RULE_MAPPING_PATH)
     config = load_rule_config()
-    file_owners = load_json(FILE_OWNERSHIP_PATH)
-    root = Path(__file__).parent.parent
-    py_files = get_py_files(root)
-    # Simulate config
-    suppressed = set((config.get('suppressed_rules') or {}).keys())
-    if args.enable:
-        suppressed -= set(args.enable)
-    if args.disable:
-        suppressed |= set(args.disable)
-    # Build impact matrix
-    impact = {}
-    for py_file in py_files:
-        rel = str(py_file.relative_to(root))
-        impact[rel] = []
-        for rule in mapping:
-            if rule not in suppressed:
-                impact[rel].append(rule)
-    # Report
+    requested = (args.enable or []) + (args.disable or [])
+    matrix = load_matrix(config=config, rules=list(mapping) + [r for r in requested if r not in mapping])
+    owner_masks = matrix.owner_masks(get_ownership(FILE_OWNERSHIP_PATH).owners_for(matrix.files))
+    perf = refresh_rollups()["tables"].get("performance", {})
+    results = load_results()
+    # Report: enabling affects files in scope where the rule is currently suppressed (or, for a rule
+    # not in rule_mapping.json, every file in scope); disabling affects files where it is currently active
     logger.info("What-If Simulation Result:")
-    for rule in (args.enable or []) + (args.disable or []):
-        affected = [f for f, rules in impact.items() if rule in rules]
-        owners = set(file_owners.get(f, '-') for f in affected)
-        logger.info(f"Rule '{rule}': {len(affected)} files affected, owners: {', '.join(owners)}")
-        for f in affected:
+    changes = [(rule, matrix.affected_by_enabling([rule]) if rule in mapping else matrix.scope[rule], True)
+               for rule in (args.enable or [])]
+    changes += [(rule, matrix.affected_by_disabling([rule]), False) for rule in (args.disable or [])]
+    total_violations, total_seconds = 0.0, 0.0
+    for rule, mask, enabling in changes:
+        if rule not in mapping:
+            logger.warning(f"Rule '{rule}' is not in rule_mapping.json")
+        report = evaluate(rule, matrix.files_in(mask), config, mapping.get(rule), results=results, run=not args.cached_only)
+        change = project_change(rule, mask, matrix, report, perf, enabling)
+        owners = matrix.owners_of(mask, owner_masks)
+        logger.info(f"Rule '{rule}': {change['files']} files affected, owners: {', '.join(sorted(owners))}")
+        logger.info(f"  violations: {change['estimated_violations']:+.0f} ({change['evaluated']} files evaluated, "
+                    f"{report['cached']} from cache, {change['unknown']} not evaluable)")
+        if change["ci_seconds"] is None:
+            logger.info("  CI time: unknown (no timing history and nothing measured)")
+        else:
+            logger.info(f"  CI time: {change['ci_seconds']:+.2f}s (from {change['timing_source']} timings)")
+            total_seconds += change["ci_seconds"]
+        total_violations += change["estimated_violations"]
+        for f in matrix.files_in(mask):
             logger.info(f"  {f}")
+    save_results(results)
+    if len(changes) > 1:
+        total = matrix.affected_by_enabling([r for r in args.enable or [] if r in mapping]) | matrix.affected_by_disabling(args.disable or [])
+        for rule in args.enable or []:
+            if rule not in mapping:
+                total |= matrix.scope[rule]
+        logger.info(f"Combined: {matrix.count(total)} files affected, owners: {', '.join(sorted(matrix.owners_of(total, owner_masks)))}, "
+                    f"violations: {total_violations:+.0f}, CI time: {total_seconds:+.2f}s")
     logger.info("Simulation complete. No changes applied.")
 
 if __name__ == "__main__":
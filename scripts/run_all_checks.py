@@ -3,6 +3,8 @@
 Master script to run all rule checks for SmartAIPlatform.
 - Dynamically discovers check scripts in scripts/.
 - Supports categories and CLI options for extensibility.
+- `--report html-app` writes a self-contained static HTML report of this run's results and violations (see html_report.py).
+- Writes a per-run summary to logs/latest_run.json and logs/run_history.jsonl (see run_history.py).
 """
 import sys
 import os
@@ -12,6 +14,7 @@ try:
 except ImportError:
     pass
 import subprocess
+import time
 from pathlib import Path
 import re
 import importlib.util
@@ -21,6 +24,10 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts.html_report import write_html_report
+from scripts.log_rollups import aggregate
+from scripts.run_history import (RUN_ID_ENV, new_run_id, violation_log_offset, load_run_violations,
+                                 load_rule_mapping, build_run_summary, write_run_summary)
 
 # Define SCRIPT_DIR and CONFIG before discover_scripts()
 SCRIPT_DIR = Path(__file__).parent
@@ -70,15 +77,16 @@ def run_script(script, debug=False, autofix=False, dry_run=False):
             cmd.append("--autofix")
         if dry_run:
             cmd.append("--dry-run")
-        import time
         start = time.time()
         try:
             proc = subprocess.run(cmd, capture_output=True, text=True, timeout=180)
         except subprocess.TimeoutExpired:
+            result["duration"] = time.time() - start
             result["status"] = "TIMEOUT"
             result["output"] = f"Script timed out after 180 seconds: {script.name}"
             return result
         elapsed = time.time() - start
+        result["duration"] = elapsed
         if elapsed > 60:
             print(f"[SLOW SCRIPT] {script.name} took {elapsed:.1f} seconds.")
         result["output"] = proc.stdout + proc.stderr
@@ -91,6 +99,11 @@ def run_script(script, debug=False, autofix=False, dry_run=False):
         result["output"] = str(e)
     return result
 
+def write_html_app(results, violations, output, logger):
+    """HTML report for this run: results plus the violations tagged with its run id (not the cumulative rollups)."""
+    write_html_report(output, results, aggregate("violations", violations))
+    logger.info(f"HTML report written to {output}")
+
 def print_report(results, fmt="table", logger=None):
     headers = ["Script", "Category", "Status"]
     rows = [[r["script"], r["category"], r["status"]] for r in results]
@@ -116,7 +129,8 @@ def main():
     parser.add_argument('--category', type=str, help='Run all checks in a category')
     parser.add_argument('--script', type=str, help='Run a specific script by name')
     parser.add_argument('--list', action='store_true', help='List available categories and scripts')
-    parser.add_argument('--report', type=str, choices=["table", "markdown", "html", "plain"], default="table", help='Report format')
+    parser.add_argument('--report', type=str, choices=["table", "markdown", "html", "html-app", "plain"], default="table", help='Report format')
+    parser.add_argument('--output', type=str, default="rule_report.html", help='Output file for --report html-app')
     parser.add_argument('--parallel', action='store_true', help='Run checks in parallel')
     parser.add_argument('--autofix', action='store_true', help='Pass --autofix to all rule scripts')
     parser.add_argument('--dry-run', action='store_true', help='Pass --dry-run to all rule scripts')
@@ -154,6 +168,11 @@ def main():
             targets = cat_map[cat]
         else:
             targets = scripts
+        # Check scripts inherit the run id and tag the violations they record with it.
+        run_id = new_run_id()
+        os.environ[RUN_ID_ENV] = run_id
+        started = time.time()
+        log_offset = violation_log_offset()
         results = []
         if args.parallel and len(targets) > 1:
             with ThreadPoolExecutor() as executor:
@@ -163,7 +182,16 @@ def main():
         else:
             for script in targets:
                 results.append(run_script(script, args.debug, args.autofix, args.dry_run))
-        print_report(results, fmt=args.report, logger=logger)
+        violations = load_run_violations(run_id, log_offset)
+        summary = build_run_summary(run_id, results, violations, load_rule_mapping(), started=started,
+                                    log_offset=log_offset)
+        write_run_summary(summary)
+        logger.info(f"Run {run_id}: {summary['status']} ({summary['violations']} violations, "
+                    f"{summary['blocking']['count']} blocking)")
+        if args.report == "html-app":
+            write_html_app(results, violations, args.output, logger)
+        else:
+            print_report(results, fmt=args.report, logger=logger)
         print_full_failures(results, logger)
         # Custom exit codes: 0 if all pass, 1 if any fail, 2 if any error
         if any(r["status"] == "ERROR" for r in results):
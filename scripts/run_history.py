@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Run History & Per-Run Summaries
+- Gives every run_all_checks.py invocation a run id (exported to check scripts as SMARTAI_RUN_ID)
+- Tags violations recorded during a run with that id (record_violation)
+- Writes one compact summary per run: commit, counts by severity/enforcement, blocking fingerprints
+- logs/latest_run.json answers "did the current run pass?" without re-reading the violation log
+Category: automation
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import hashlib
+import subprocess
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from scripts.central_logger import get_logger
+from scripts.central_args import get_arg_parser
+from scripts.rule_registry import get_registry
+
+LOGS_DIR = Path(__file__).parent.parent / "logs"
+VIOLATION_LOG = LOGS_DIR / "rule_violations.jsonl"
+RUN_HISTORY = LOGS_DIR / "run_history.jsonl"
+LATEST_RUN = LOGS_DIR / "latest_run.json"
+RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
+
+RUN_ID_ENV = "SMARTAI_RUN_ID"
+
+
+def new_run_id():
+    return f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:8]}"
+
+def current_run_id():
+    return os.environ.get(RUN_ID_ENV)
+
+def current_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return os.environ.get("GITHUB_SHA")
+
+def fingerprint(violation):
+    """Stable id for a violation: rule, file, line and message."""
+    key = "|".join(str(violation.get(k, "")) for k in ("rule", "file", "line", "message"))
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+def record_violation(rule, file, line=None, message="", severity=None, **extra):
+    """Append a violation to logs/rule_violations.jsonl, tagged with the current run id."""
+    entry = {"rule": rule, "file": str(file), "line": line, "message": message, "ts": time.time()}
+    if severity:
+        entry["severity"] = severity
+    if current_run_id():
+        entry["run_id"] = current_run_id()
+    entry.update(extra)
+    LOGS_DIR.mkdir(exist_ok=True)
+    with open(VIOLATION_LOG, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+def violation_log_offset():
+    """Current size of the violation log; pass to load_run_violations to skip earlier runs."""
+    return VIOLATION_LOG.stat().st_size if VIOLATION_LOG.exists() else 0
+
+def load_run_violations(run_id, offset=0):
+    """Violations tagged with run_id, reading only bytes from offset onward."""
+    if not VIOLATION_LOG.exists():
+        return []
+    violations = []
+    with open(VIOLATION_LOG, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if line.strip():
+                v = json.loads(line)
+                if v.get("run_id") == run_id:
+                    violations.append(v)
+    return violations
+
+def load_rule_mapping():
+    return get_registry(RULE_MAPPING_PATH).as_dict()
+
+def build_run_summary(run_id, results, violations, mapping, started=None, commit=None, log_offset=0):
+    by_severity, by_enforcement, scripts = {}, {}, {}
+    blocking = set()
+    for v in violations:
+        meta = mapping.get(v.get("rule")) or {}
+        severity = v.get("severity") or meta.get("severity", "error")
+        enforcement = meta.get("enforcement", "block")
+        by_severity[severity] = by_severity.get(severity, 0) + 1
+        by_enforcement[enforcement] = by_enforcement.get(enforcement, 0) + 1
+        if severity == "error" and enforcement == "block":
+            blocking.add(fingerprint(v))
+    for r in results:
+        scripts[r["status"]] = scripts.get(r["status"], 0) + 1
+    if scripts.get("ERROR"):
+        status = "error"
+    elif scripts.get("FAIL") or scripts.get("TIMEOUT") or blocking:
+        status = "fail"
+    else:
+        status = "pass"
+    finished = time.time()
+    return {
+        "run_id": run_id,
+        "commit": commit or current_commit(),
+        "started": started,
+        "finished": finished,
+        "duration": round(finished - started, 3) if started else None,
+        "status": status,
+        "scripts": scripts,
+        "failed_scripts": [{"script": r["script"], "category": r.get("category"), "status": r["status"]}
+                           for r in sorted(results, key=lambda r: r["script"]) if r["status"] != "PASS"],
+        "violations": len(violations),
+        "violation_offset": log_offset,
+        "by_severity": by_severity,
+        "by_enforcement": by_enforcement,
+        "blocking": {"count": len(blocking), "fingerprints": sorted(blocking)},
+    }
+
+def write_run_summary(summary):
+    LOGS_DIR.mkdir(exist_ok=True)
+    with open(RUN_HISTORY, "a") as f:
+        f.write(json.dumps(summary, separators=(",", ":")) + "\n")
+    tmp = LATEST_RUN.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(summary, f, indent=2)
+    os.replace(tmp, LATEST_RUN)
+
+def load_latest_summary(path=LATEST_RUN):
+    if not Path(path).exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def load_latest_violations(summary=None):
+    """The latest run's summary and the violations it recorded."""
+    summary = summary or load_latest_summary()
+    if summary is None:
+        return None, []
+    return summary, load_run_violations(summary["run_id"], summary.get("violation_offset", 0))
+
+def main():
+    parser = get_arg_parser()
+    parser.add_argument('--latest', action='store_true', help='Show the latest run summary')
+    args = parser.parse_args()
+    logger = get_logger(debug=args.debug)
+    if args.latest:
+        summary = load_latest_summary()
+        if summary is None:
+            logger.info("No run summary recorded yet.")
+        else:
+            logger.info(json.dumps(summary, indent=2))
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
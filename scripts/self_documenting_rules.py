@@ -2,23 +2,29 @@
 """
 Self-Documenting Rules
 - Auto-generates human-friendly documentation/examples from rule code and config
-- Updates docs/python_script_coding_rules.md with extracted docstrings, usage, and examples
+- Writes docs/rule_reference.md with extracted docstrings, usage, and examples
+  (the hand-written docs/python_script_coding_rules.md is left alone)
+- Rule scripts are parsed only when their content hash changes (.smartai_cache/self_documenting_rules.json)
 Category: automation
 """
 import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-import json
 import ast
+import hashlib
+import json
 from pathlib import Path
 import os
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts.rule_registry import get_registry
+from scripts.docs_pipeline import write_if_changed
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 RULES_DIR = Path(__file__).parent
 RULE_MAPPING_PATH = Path(__file__).parent.parent / "rule_mapping.json"
-DOCS_PATH = Path(__file__).parent.parent / "docs/python_script_coding_rules.md"
+DOCS_PATH = Path(__file__).parent.parent / "docs/rule_reference.md"
+CACHE_PATH = Path(__file__).parent.parent / ".smartai_cache" / "self_documenting_rules.json"
 
 
 def extract_docstring_and_examples(script_path):
@@ -35,31 +41,59 @@ def extract_docstring_and_examples(script_path):
     except Exception:
         return "", ""
 
-def main():
-    parser = get_arg_parser()
-    parser.add_argument('--update-docs', action='store_true', help='Update rule documentation with extracted info')
-    args = parser.parse_args()
-    logger = get_logger(debug=args.debug)
-    mapping = json.load(open(RULE_MAPPING_PATH))
-    lines = ["# Python Script Coding Rules\n"]
-    for rule, meta in mapping.items():
-        script = meta.get('script')
-        if not script:
-            continue
-        script_path = RULES_DIR / script
-        doc, example = extract_docstring_and_examples(script_path)
+def cached_docstrings(scripts, cache_path=CACHE_PATH):
+    """{script path: (docstring, example)}, re-parsing only scripts whose content hash changed."""
+    cache = {}
+    if Path(cache_path).exists():
+        try:
+            with open(cache_path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+    out, changed = {}, False
+    for script in scripts:
+        key = str(script)
+        digest = hashlib.sha1(Path(script).read_bytes()).hexdigest() if Path(script).exists() else None
+        entry = cache.get(key)
+        if not entry or entry["hash"] != digest:
+            doc, example = extract_docstring_and_examples(script) if digest else ("", "")
+            entry = cache[key] = {"hash": digest, "doc": doc, "example": example}
+            changed = True
+        out[key] = (entry["doc"], entry["example"])
+    if changed:
+        Path(cache_path).parent.mkdir(exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(cache, f, sort_keys=True)
+    return out
+
+def render_docs(mapping, rules_dir=RULES_DIR, cache_path=CACHE_PATH):
+    scripts = {rule: rules_dir / meta['script'] for rule, meta in mapping.items() if meta.get('script')}
+    docs = cached_docstrings(scripts.values(), cache_path)
+    lines = ["# Rule Reference\n", "Generated by `scripts/self_documenting_rules.py` from rule_mapping.json and rule script docstrings.\n"]
+    for rule, script_path in scripts.items():
+        doc, example = docs[str(script_path)]
         lines.append(f"## {rule}\n")
-        lines.append(f"**Description:** {meta.get('description','')}")
+        lines.append(f"**Description:** {mapping[rule].get('description','')}")
         if doc:
             lines.append(f"\n**Docstring:**\n{doc}")
         if example:
             lines.append(f"\n**Example:**\n{example}")
         lines.append("")
+    return '\n'.join(lines)
+
+def main():
+    parser = get_arg_parser()
+    parser.add_argument('--update-docs', action='store_true', help='Update rule documentation with extracted info')
+    args = parser.parse_args()
+    logger = get_logger(debug=args.debug)
+    text = render_docs(get_registry(RULE_MAPPING_PATH))
     if args.update_docs:
-        DOCS_PATH.write_text('\n'.join(lines))
-        logger.info(f"Documentation updated: {DOCS_PATH}")
+        if write_if_changed(DOCS_PATH, text):
+            logger.info(f"Documentation updated: {DOCS_PATH}")
+        else:
+            logger.info(f"Documentation already up to date: {DOCS_PATH}")
     else:
-        print('\n'.join(lines))
+        print(text)
 
 if __name__ == "__main__":
     main()
@@ -4,22 +4,32 @@ import csv
 import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-import requests
 import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from pathlib import Path
 from scripts.central_logger import get_logger
 from scripts.central_args import get_arg_parser
+from scripts import http_client
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 """
 Script to sync SmartAIPlatform_Board.tsv with GitHub Issues.
-- Creates issues for new board items not already present as issues.
+- Creates issues for new board items and updates issues whose board row changed.
+- Keeps a local journal (row content hash -> issue number, last sync time), so
+  unchanged rows cost no API calls and issue listings only fetch issues updated since the last sync.
+- Creates and updates run concurrently under the shared rate limiter (see http_client.py).
 - Requires a GitHub personal access token (with repo scope) in the GITHUB_TOKEN environment variable.
 - Usage: python sync_board_to_github.py --repo patenile/SmartAIPlatForm --tsv docs/SmartAIPlatform_Board.tsv
 Category: board
 """
 
 
-GITHUB_API = "https://api.github.com"
+GITHUB_API = http_client.GITHUB_API
+JOURNAL_PATH = Path(__file__).parent.parent / ".smartai_cache" / "board_sync_journal.json"
+# Column order used when the TSV has no header row.
+BOARD_COLUMNS = ["Title", "URL", "Assignees", "Status"]
 
 def print_rule_and_fix(logger):
     mapping_path = Path(__file__).parent / "rule_mapping.json"
@@ -35,42 +45,151 @@ def print_rule_and_fix(logger):
         logger.info(f"See: {rule.get('doc','')}")
         logger.info(f"Suggested fix: {rule.get('fix','')}")
 
-def get_existing_issues(repo, token, logger):
-    issues = set()
-    page = 1
-    while True:
-        url = f"{GITHUB_API}/repos/{repo}/issues?page={page}&state=all&per_page=100"
-        resp = requests.get(url, headers={"Authorization": f"token {token}"})
+def load_journal(path):
+    if Path(path).exists():
+        with open(path) as f:
+            return json.load(f)
+    return {"rows": {}, "issues": {}, "since": None}
+
+def save_journal(path, journal):
+    Path(path).parent.mkdir(exist_ok=True)
+    tmp = Path(path).with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(journal, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def read_board(tsv_path):
+    """Board rows as dicts with Title/URL/Assignees/Status, with or without a header row."""
+    with open(tsv_path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f, delimiter='\t'))
+    if rows and "Title" in rows[0]:
+        header, rows = rows[0], rows[1:]
+    else:
+        header = BOARD_COLUMNS
+    board = []
+    for values in rows:
+        row = {col: (values[i].strip() if i < len(values) else "") for i, col in enumerate(header)}
+        if row.get("Title"):
+            board.append(row)
+    return board
+
+def row_payload(row):
+    url = row.get("URL", "")
+    body = f"Imported from board TSV.\n\n{url}" if url else "Imported from board TSV."
+    assignees = [a.strip() for a in row.get("Assignees", "").split(',') if a.strip()]
+    payload = {"title": row["Title"], "body": body}
+    if assignees:
+        payload["assignees"] = assignees
+    return payload
+
+def row_hash(row):
+    return hashlib.sha256(json.dumps(row_payload(row), sort_keys=True).encode()).hexdigest()
+
+def next_link(resp):
+    return (resp.links or {}).get("next", {}).get("url")
+
+def get_existing_issues(repo, token, logger, journal=None, api=GITHUB_API):
+    """
+    Return {title: issue number}. With a journal, only issues updated since the
+    last sync are listed (since=) and merged into the journal's issue index.
+    The since= URL differs on every run, so there is no ETag to revalidate.
+    """
+    journal = journal if journal is not None else {"issues": {}, "since": None}
+    issues = dict(journal.get("issues") or {})
+    headers = http_client.github_headers(token)
+    url = f"{api}/repos/{repo}/issues?state=all&per_page=100"
+    if journal.get("since"):
+        url += f"&since={journal['since']}"
+    started = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    while url:
+        resp = http_client.get(url, headers=headers)
         if resp.status_code != 200:
             logger.error(f"Failed to fetch issues: {resp.text}")
             print_rule_and_fix(logger)
             sys.exit(1)
-        data = resp.json()
-        if not data:
-            break
-        for issue in data:
-            issues.add(issue["title"].strip())
-        page += 1
+        for issue in resp.json():
+            issues[issue["title"].strip()] = issue["number"]
+        url = next_link(resp)
+    journal["issues"] = issues
+    journal["since"] = started
     return issues
 
-def create_issue(repo, token, title, logger, body=None, assignees=None):
-    url = f"{GITHUB_API}/repos/{repo}/issues"
+def create_issue(repo, token, title, logger, body=None, assignees=None, api=GITHUB_API):
+    url = f"{api}/repos/{repo}/issues"
     payload = {"title": title}
     if body:
         payload["body"] = body
     if assignees:
         payload["assignees"] = assignees
-    resp = requests.post(url, json=payload, headers={"Authorization": f"token {token}"})
+    resp = http_client.post(url, json=payload, headers=http_client.github_headers(token))
     if resp.status_code not in (200, 201):
         logger.error(f"Failed to create issue '{title}': {resp.text}")
         print_rule_and_fix(logger)
+        return None
+    logger.info(f"Created issue: {title}")
+    return resp.json().get("number")
+
+def update_issue(repo, token, number, payload, logger, api=GITHUB_API):
+    url = f"{api}/repos/{repo}/issues/{number}"
+    # Setting the same title/body/state twice is harmless, so updates may be retried on 5xx.
+    resp = http_client.patch(url, json=payload, headers=http_client.github_headers(token), idempotent=True)
+    if resp.status_code != 200:
+        logger.error(f"Failed to update issue #{number} '{payload['title']}': {resp.text}")
+        print_rule_and_fix(logger)
+        return None
+    logger.info(f"Updated issue #{number}: {payload['title']}")
+    return number
+
+def sync_board(repo, token, tsv_path, logger, journal_path=JOURNAL_PATH, api=GITHUB_API, workers=8, full=False):
+    """Sync new/changed board rows; returns counts of created, updated and adopted issues."""
+    journal = {"rows": {}, "issues": {}, "since": None} if full else load_journal(journal_path)
+    rows = {row["Title"]: row for row in read_board(tsv_path)}
+    pending = {t: r for t, r in rows.items() if (journal["rows"].get(t) or {}).get("hash") != row_hash(r)}
+    stats = {"created": 0, "updated": 0, "adopted": 0, "unchanged": len(rows) - len(pending)}
+    if not pending:
+        logger.info(f"Board in sync: {len(rows)} rows unchanged, no API calls needed.")
+        return stats
+    if any(not (journal["rows"].get(t) or {}).get("issue") for t in pending):
+        existing = get_existing_issues(repo, token, logger, journal, api)
     else:
-        logger.info(f"Created issue: {title}")
+        existing = journal.get("issues") or {}
+    lock = threading.Lock()
+
+    def apply(title, row):
+        entry = journal["rows"].get(title) or {}
+        if entry.get("issue"):
+            number, kind = update_issue(repo, token, entry["issue"], row_payload(row), logger, api), "updated"
+        elif title in existing:
+            # Issue predates the journal: adopt it as-is, like the title-matching sync did.
+            number, kind = existing[title], "adopted"
+            logger.info(f"Issue already exists: {title}")
+        else:
+            payload = row_payload(row)
+            number = create_issue(repo, token, title, logger, payload["body"], payload.get("assignees"), api)
+            kind = "created"
+        if number is None:
+            return
+        with lock:
+            journal["rows"][title] = {"hash": row_hash(row), "issue": number}
+            journal.setdefault("issues", {})[title] = number
+            stats[kind] += 1
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in as_completed([executor.submit(apply, t, r) for t, r in pending.items()]):
+                future.result()
+    finally:
+        save_journal(journal_path, journal)
+    return stats
 
 def main():
     parser = get_arg_parser()
     parser.add_argument("--repo", required=True, help="GitHub repo, e.g. patenile/SmartAIPlatForm")
     parser.add_argument("--tsv", required=True, help="Path to TSV board file")
+    parser.add_argument("--journal", default=str(JOURNAL_PATH), help="Path to the local sync journal")
+    parser.add_argument("--api-url", default=GITHUB_API, help="GitHub API base URL (e.g. a local stub server)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent create/update requests")
+    parser.add_argument("--full", action="store_true", help="Ignore the journal and re-list every issue")
     args = parser.parse_args()
     if not args.repo or not args.tsv:
         print("Error: --repo and --tsv arguments are required. Example usage: python sync_board_to_github.py --repo owner/repo --tsv docs/SmartAIPlatform_Board.tsv")
@@ -82,18 +201,10 @@ def main():
             logger.error("Set GITHUB_TOKEN environment variable with a GitHub personal access token.")
             print_rule_and_fix(logger)
             sys.exit(1)
-        existing = get_existing_issues(args.repo, token, logger)
-        with open(args.tsv, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='\t')
-            for row in reader:
-                title = row["Title"].strip()
-                url = row.get("URL", "").strip()
-                assignees = [a.strip() for a in row.get("Assignees", "").split(',') if a.strip()]
-                if title and title not in existing:
-                    body = f"Imported from board TSV.\n\n{url}" if url else "Imported from board TSV."
-                    create_issue(args.repo, token, title, logger, body, assignees if assignees else None)
-                else:
-                    logger.info(f"Issue already exists: {title}")
+        stats = sync_board(args.repo, token, args.tsv, logger, Path(args.journal), args.api_url.rstrip("/"),
+                           args.workers, args.full)
+        logger.info(f"Board sync: {stats['created']} created, {stats['updated']} updated, "
+                    f"{stats['adopted']} adopted, {stats['unchanged']} unchanged.")
     except Exception as e:
         logger.error(f"Exception in sync_board_to_github: {e}")
         sys.exit(1)
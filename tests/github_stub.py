@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the GitHub REST endpoints used by the integration scripts.
+- Issues (list with pagination/since/ETag, create, update), PR details/files/reviews/comments,
+  check runs
+- Injects latency, a request quota (X-RateLimit-* headers, 403 when exhausted) and random 503s
+  (Retry-After: 0)
+- Counts requests per route, so tests can assert on API cost, and logs (method, route, body) of
+  each request
+- queue_responses() scripts the next replies (e.g. a 502, then a 429), before any work is done
+Usage:
+    with GitHubStub(latency=0.01, error_rate=0.05) as gh:
+        sync_board(repo, token, tsv, logger, api=gh.url)
+        gh.counts[("POST", "issues")]
+"""
+import calendar
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ROUTES = [
+    ("issues", re.compile(r"^/repos/[^/]+/[^/]+/issues$")),
+    ("issue", re.compile(r"^/repos/[^/]+/[^/]+/issues/(\d+)$")),
+    ("comments", re.compile(r"^/repos/[^/]+/[^/]+/(?:issues|pulls)/(\d+)/comments$")),
+    ("pull", re.compile(r"^/repos/[^/]+/[^/]+/pulls/(\d+)$")),
+    ("pull_files", re.compile(r"^/repos/[^/]+/[^/]+/pulls/(\d+)/files$")),
+    ("reviews", re.compile(r"^/repos/[^/]+/[^/]+/pulls/(\d+)/reviews$")),
+    ("check_run", re.compile(r"^/repos/[^/]+/[^/]+/check-runs/(\d+)$")),
+]
+
+
+class GitHubStub:
+    """
+    latency: seconds added to every request.
+    rate_limit: (requests, window seconds) quota reported via X-RateLimit-*; None for unlimited.
+    error_rate: fraction of requests answered with a 503 + Retry-After before doing any work.
+    """
+
+    def __init__(self, latency=0.0, rate_limit=(1_000_000, 3600), error_rate=0.0, seed=0):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.log = []  # (method, route, request body) in arrival order
+        self.scripted = []  # (status, headers) replies to send before handling requests normally
+        self.issues = {}  # number -> issue dict
+        self.pull_files = {}  # pr number -> [{"filename", "patch"}]
+        self.reviews, self.comments, self.check_runs = [], [], {}
+        self.window_start, self.used = time.time(), 0
+        self.server = None
+
+    # Fixtures --------------------------------------------------------------
+    def add_issue(self, title, body="", labels=()):
+        with self.lock:
+            number = len(self.issues) + 1
+            self.issues[number] = {"number": number, "title": title, "body": body,
+                                   "labels": [{"name": label} for label in labels],
+                                   "updated": time.time()}
+            return number
+
+    def queue_responses(self, *responses):
+        """Answer the next requests with these (status, headers) replies, in order."""
+        with self.lock:
+            self.scripted.extend(responses)
+
+    # Server lifecycle ------------------------------------------------------
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub._handle(self, "GET")
+
+            def do_POST(self):
+                stub._handle(self, "POST")
+
+            def do_PATCH(self):
+                stub._handle(self, "PATCH")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def total_requests(self):
+        return sum(self.counts.values())
+
+    # Request handling ------------------------------------------------------
+    def _quota_headers(self):
+        if self.rate_limit is None:
+            return {}, True
+        limit, window = self.rate_limit
+        with self.lock:
+            now = time.time()
+            if now - self.window_start >= window:
+                self.window_start, self.used = now, 0
+            self.used += 1
+            remaining = max(limit - self.used, 0)
+            reset = int(self.window_start + window) + 1
+            allowed = self.used <= limit
+        return {"X-RateLimit-Limit": str(limit), "X-RateLimit-Remaining": str(remaining),
+                "X-RateLimit-Reset": str(reset)}, allowed
+
+    def _reply(self, handler, status, payload=None, headers=None):
+        body = b"" if payload is None else json.dumps(payload).encode()
+        handler.send_response(status)
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _handle(self, handler, method):
+        parts = urlsplit(handler.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        length = int(handler.headers.get("Content-Length") or 0)
+        data = json.loads(handler.rfile.read(length)) if length else None
+        route, match = next(((name, m) for name, rx in ROUTES for m in [rx.match(parts.path)] if m),
+                            (None, None))
+        with self.lock:
+            self.counts[(method, route)] += 1
+            self.log.append((method, route, data))
+        if self.latency:
+            time.sleep(self.latency)
+        headers, allowed = self._quota_headers()
+        if not allowed:
+            return self._reply(handler, 403, {"message": "API rate limit exceeded"}, headers)
+        with self.lock:
+            scripted = self.scripted.pop(0) if self.scripted else None
+            failed = self.random.random() < self.error_rate
+        if scripted:
+            status, extra = scripted
+            return self._reply(handler, status, {"message": "Scripted reply"}, {**headers, **extra})
+        if failed:
+            return self._reply(handler, 503, {"message": "Injected server error"},
+                               {**headers, "Retry-After": "0"})
+        if route is None:
+            return self._reply(handler, 404, {"message": "Not Found"}, headers)
+        handle = getattr(self, f"_{method.lower()}_{route}")
+        status, payload, extra = handle(match, query, data, handler)
+        self._reply(handler, status, payload, {**headers, **extra})
+
+    def _page(self, items, query, path):
+        per_page, page = int(query.get("per_page", 30)), int(query.get("page", 1))
+        chunk = items[(page - 1) * per_page:page * per_page]
+        extra = {}
+        if page * per_page < len(items):
+            next_query = "&".join(f"{k}={v}" for k, v in {**query, "page": page + 1}.items())
+            extra["Link"] = f'<{self.url}{path}?{next_query}>; rel="next"'
+        return chunk, extra
+
+    def _get_issues(self, match, query, data, handler):
+        with self.lock:
+            issues = sorted(self.issues.values(), key=lambda i: i["number"])
+        if "labels" in query:
+            wanted = set(query["labels"].split(","))
+            issues = [i for i in issues if wanted & {label["name"] for label in i["labels"]}]
+        if "since" in query:
+            since = calendar.timegm(time.strptime(query["since"], "%Y-%m-%dT%H:%M:%SZ"))
+            issues = [i for i in issues if i["updated"] >= since]
+        etag = '"%s"' % hashlib.sha1(json.dumps(issues, sort_keys=True).encode()).hexdigest()
+        if handler.headers.get("If-None-Match") == etag and int(query.get("page", 1)) == 1:
+            return 304, None, {"ETag": etag}
+        chunk, extra = self._page(issues, query, urlsplit(handler.path).path)
+        return 200, chunk, {**extra, "ETag": etag}
+
+    def _post_issues(self, match, query, data, handler):
+        number = self.add_issue(data["title"], data.get("body", ""), data.get("labels", ()))
+        return 201, self.issues[number], {}
+
+    def _patch_issue(self, match, query, data, handler):
+        number = int(match.group(1))
+        with self.lock:
+            if number not in self.issues:
+                return 404, {"message": "Not Found"}, {}
+            fields = {k: v for k, v in data.items() if k in ("title", "body", "state")}
+            self.issues[number].update(fields)
+            self.issues[number]["updated"] = time.time()
+            return 200, self.issues[number], {}
+
+    def _post_comments(self, match, query, data, handler):
+        with self.lock:
+            self.comments.append(data)
+        return 201, {"id": len(self.comments)}, {}
+
+    def _get_pull(self, match, query, data, handler):
+        return 200, {"number": int(match.group(1)), "head": {"sha": "0" * 40}}, {}
+
+    def _get_pull_files(self, match, query, data, handler):
+        files = self.pull_files.get(int(match.group(1)), [])
+        chunk, extra = self._page(files, query, urlsplit(handler.path).path)
+        return 200, chunk, extra
+
+    def _get_reviews(self, match, query, data, handler):
+        with self.lock:
+            reviews = [{"id": i, "body": r.get("body", "")} for i, r in enumerate(self.reviews, 1)]
+        chunk, extra = self._page(reviews, query, urlsplit(handler.path).path)
+        return 200, chunk, extra
+
+    def _post_reviews(self, match, query, data, handler):
+        with self.lock:
+            self.reviews.append(data)
+        return 200, {"id": len(self.reviews)}, {}
+
+    def _patch_check_run(self, match, query, data, handler):
+        run_id = int(match.group(1))
+        with self.lock:
+            run = self.check_runs.setdefault(run_id, {"annotations": []})
+            run["title"] = data["output"]["title"]
+            run["summary"] = data["output"]["summary"]
+            run["annotations"].extend(data["output"].get("annotations", []))
+        return 200, {"id": run_id}, {}
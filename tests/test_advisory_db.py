@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.advisory_db import AdvisoryDB, PackageIndex, osv_ranges
+
+def test_interval_index_lookups():
+    index = PackageIndex([
+        {"id": "A", "ranges": [["0", "1.26.17", False], ["2.0.0", "2.0.6", False]]},
+        {"id": "B", "ranges": [["2.0.3", "2.1.0", True]]},
+        {"id": "C", "ranges": [["3.0", None, False]], "versions": ["1.0"]},
+    ])
+    assert index.lookup("1.26.16") == {"A"}
+    assert index.lookup("1.26.17") == set()
+    assert index.lookup("2.0.5") == {"A", "B"}
+    assert index.lookup("2.1.0") == {"B"}
+    assert index.lookup("2.1.1") == set()
+    assert index.lookup("1.0") == {"A", "C"}
+    assert index.lookup("99.0") == {"C"}
+    assert len(index.starts) == 5
+
+def test_osv_import_and_normalised_names():
+    affected = {"ranges": [{"type": "ECOSYSTEM", "events": [
+        {"introduced": "0"}, {"fixed": "1.2"}, {"introduced": "2.0"}, {"last_affected": "2.3"}]}]}
+    assert osv_ranges(affected) == [["0", "1.2", False], ["2.0", "2.3", True]]
+    db = AdvisoryDB({"packages": {"py-yaml": [{"id": "X", "ranges": osv_ranges(affected)}]}})
+    assert [a["id"] for a in db.affected("Py_YAML", "2.3")] == ["X"]
+    assert db.affected("py.yaml", "1.5") == []
+
+def test_wildcard_pins_are_skipped_not_fatal(tmp_path):
+    from scripts.check_vulnerable_pins import find_vulnerable_pins
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("urllib3==1.*\nurllib3==1.26.5\n")
+    db = AdvisoryDB({"packages": {"urllib3": [{"id": "A", "ranges": [["0", "1.26.17", False]]}]}})
+    unresolved = []
+    findings = find_vulnerable_pins(requirements, db, unresolved)
+    found = [(lineno, version, adv["id"]) for lineno, _, version, adv in findings]
+    assert found == [(2, "1.26.5", "A")]
+    assert unresolved == [(1, "urllib3", "1.*")]
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.applicability_matrix import ApplicabilityMatrix, get_py_files, load_matrix
+
+CONFIG = {"skip_rules": [], "suppressed_rules": {"check_b": "noisy"},
+          "folders": {"tests/": {"skip_rules": ["check_a"]},
+                      "scripts/": {"suppressed_rules": {"check_c": "wip"}}}}
+
+def test_matrix_resolves_folder_groups_and_answers_what_if_queries():
+    files = ["scripts/a.py", "scripts/b.py", "tests/test_a.py", "setup.py"]
+    matrix = ApplicabilityMatrix.build(files, ["check_a", "check_b", "check_c"], CONFIG)
+    checked = matrix.files_in(matrix.files_for("check_a"))
+    assert checked == ["scripts/a.py", "scripts/b.py", "setup.py"]
+    enabled = matrix.files_in(matrix.affected_by_enabling(["check_c"]))
+    assert enabled == ["scripts/a.py", "scripts/b.py"]
+    assert matrix.count(matrix.affected_by_enabling(["check_b"])) == 4
+    disabled = matrix.affected_by_disabling(["check_a", "check_c"])
+    assert matrix.count(disabled) == 4
+    owners = matrix.owner_masks({"scripts/a.py": "team-a", "tests/test_a.py": "team-qa"})
+    assert matrix.owners_of(matrix.files_for("check_a"), owners) == {"team-a", "-"}
+    assert ApplicabilityMatrix.from_json(matrix.to_json()).active == matrix.active
+
+def test_load_matrix_is_persisted_and_rebuilt_on_change(tmp_path, monkeypatch):
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_x.py").write_text("")
+    cache = tmp_path / "matrix.json.gz"
+    first = load_matrix(tmp_path, cache, CONFIG, ["check_a"])
+    assert first.count(first.files_for("check_a")) == 0
+    monkeypatch.setattr(ApplicabilityMatrix, "build", None)
+    assert load_matrix(tmp_path, cache, CONFIG, ["check_a"]).key == first.key
+    monkeypatch.undo()
+    (tmp_path / "main.py").write_text("")
+    rebuilt = load_matrix(tmp_path, cache, CONFIG, ["check_a"])
+    assert rebuilt.files_in(rebuilt.files_for("check_a")) == ["main.py"]
+
+def test_py_files_skip_virtualenvs_and_dot_directories(tmp_path):
+    for rel in ("scripts/a.py", "scripts/plugins/p.py", ".venv/lib/site.py", "venv/x.py",
+                ".git/hooks/h.py", "build/b.py", "pkg.egg-info/e.py", "setup.py"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("")
+    found = [f.relative_to(tmp_path).as_posix() for f in get_py_files(tmp_path)]
+    assert found == ["scripts/a.py", "setup.py"]
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+import json
+import logging
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts import auto_create_security_issues as sec
+
+PIP_AUDIT = json.dumps({"dependencies": [
+    {"name": "requests", "version": "2.0.0",
+     "vulns": [{"id": "PYSEC-1", "fix_versions": ["2.31.0"], "description": "x"}]},
+    {"name": "idna", "version": "3.6", "vulns": []},
+]})
+SAFETY = json.dumps([["jinja2", "<3.1.3", "3.0.0", "XSS in xmlattr", "64227"]])
+
+def test_findings_are_parsed_and_deduplicated(tmp_path, monkeypatch):
+    assert [f["advisory"] for f in sec.iter_findings(PIP_AUDIT)] == ["PYSEC-1"]
+    parsed = [(f["package"], f["version"], f["advisory"]) for f in sec.iter_findings(SAFETY)]
+    assert parsed == [("jinja2", "3.0.0", "64227")]
+    filed = []
+
+    def create(repo, token, title, body, logger, labels=None):
+        filed.append(body)
+        return 7
+
+    monkeypatch.setattr(sec, "create_github_issue", create)
+    monkeypatch.setattr(sec, "seed_index", lambda index, repo, token, logger: index)
+    index, logger = tmp_path / "index.json", logging.getLogger("test_security")
+    assert len(sec.file_new_findings(PIP_AUDIT + "\n", "o/r", "t", logger, index)) == 1
+    assert sec.file_new_findings(PIP_AUDIT, "o/r", "t", logger, index) == []
+    assert len(filed) == 1
+    fingerprint = sec.finding_fingerprint("requests", "2.0.0", "PYSEC-1")
+    assert sec.FINGERPRINT_RE.findall(filed[0]) == [fingerprint]
+
+def test_oversized_finding_sets_are_split_across_issues(tmp_path, monkeypatch):
+    report = json.dumps({"dependencies": [
+        {"name": f"pkg{i}", "version": "1.0",
+         "vulns": [{"id": f"PYSEC-{i}", "description": "x" * 300}]}
+        for i in range(400)]})
+    filed = []
+
+    def create(repo, token, title, body, logger, labels=None):
+        filed.append((title, body))
+        return len(filed)
+
+    monkeypatch.setattr(sec, "create_github_issue", create)
+    monkeypatch.setattr(sec, "seed_index", lambda index, repo, token, logger: index)
+    index, logger = tmp_path / "index.json", logging.getLogger("test_security")
+    assert len(sec.file_new_findings(report, "o/r", "t", logger, index)) == 400
+    assert len(filed) > 1
+    assert all(len(body) <= sec.MAX_BODY_CHARS for _, body in filed)
+    assert filed[0][0].endswith(f"(part 1/{len(filed)})")
+    fingerprints = [fp for _, body in filed for fp in sec.FINGERPRINT_RE.findall(body)]
+    assert len(fingerprints) == len(set(fingerprints)) == 400
+    assert set(sec.load_index(index)["fingerprints"].values()) == set(range(1, len(filed) + 1))
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.auto_update_requirements import update_requirements, installed_distributions
+
+LINES = ["# pinned runtime deps\n", "requests==2.31.0  # http\n", "PyYAML==6.0.1\n",
+         "appnope==0.1.4 ; sys_platform == 'darwin'\n", "-r extra.txt\n"]
+INSTALLED = {"requests": ("requests", "2.32.5"), "pyyaml": ("PyYAML", "6.0.1"),
+             "numpy": ("numpy", "2.1.0")}
+
+def test_minimal_per_package_diff():
+    lines, changes = update_requirements(LINES, INSTALLED)
+    assert changes == [("requests", "2.31.0", "2.32.5")]
+    assert lines == [LINES[0], "requests==2.32.5  # http\n"] + LINES[2:]
+    lines, changes = update_requirements(LINES, INSTALLED, add_new=True, prune=True)
+    assert ("appnope", "0.1.4", None) in changes and lines[-1] == "numpy==2.1.0\n"
+    assert update_requirements(LINES[:1] + ["requests==2.32.5\n"], INSTALLED)[1] == []
+
+def test_installed_distributions_are_cached(tmp_path):
+    cache = tmp_path / "dists.json"
+    first = installed_distributions(cache)
+    assert "pytest" in first and cache.exists()
+    assert installed_distributions(cache) == first
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.cross_repo_rule_consistency import (
+    CONFIG_LEAF, drift_matrix, fingerprint_repo, merkle_root, scan)
+
+MAPPING = {"check_a": {"description": "A"}, "check_b": {"description": "B", "severity": "warning"}}
+CONFIG = "max_file_length: 350\nskip_rules: []\nfolders:\n  tests/:\n    skip_rules: [check_a]\n"
+
+def make_repo(path, mapping=MAPPING, config=CONFIG):
+    path.mkdir()
+    (path / "rule_mapping.json").write_text(json.dumps(mapping))
+    if config is not None:
+        (path / ".smartai_rules.yaml").write_text(config)
+    return path
+
+def test_merkle_root_depends_on_every_leaf_but_not_key_order():
+    root = merkle_root({"a": "1", "b": "2", "c": "3"})
+    assert root == merkle_root({"c": "3", "a": "1", "b": "2"})
+    assert root != merkle_root({"a": "1", "b": "2", "c": "4"})
+
+def test_scan_reports_only_drifting_rules(tmp_path):
+    base = make_repo(tmp_path / "base")
+    same = make_repo(tmp_path / "same")
+    changed = make_repo(tmp_path / "changed",
+                        {**MAPPING, "check_b": {"description": "B"}, "check_c": {}},
+                        CONFIG.replace("[check_a]", "[check_a]\n    max_file_length: 500"))
+    moved = make_repo(tmp_path / "moved", config=CONFIG.replace("tests/", "docs/"))
+    missing = make_repo(tmp_path / "missing", config=None)
+    cache = {}
+    results = scan([str(same), str(changed), str(moved), str(missing)], base, cache, workers=2)
+    assert results[str(same)] == {}
+    assert results[str(changed)] == {"check_b": "changed", "check_c": "added",
+                                     CONFIG_LEAF: "changed"}
+    assert results[str(moved)] == {"check_a": "changed", CONFIG_LEAF: "changed"}
+    assert results[str(missing)] is None
+    matrix = drift_matrix({"r": {"check_a": "removed"}, "s": {"check_b": "added"}, "t": None})
+    assert matrix[2:] == [
+        "| r | - | = |", "| s | = | + |", "| t | ? | ? |"]
+
+def test_fingerprints_are_reused_until_a_file_changes(tmp_path):
+    repo = make_repo(tmp_path / "repo")
+    entry = fingerprint_repo(repo)
+    assert fingerprint_repo(repo, {**entry, "root": "cached"})["root"] == "cached"
+    (repo / "rule_mapping.json").write_text(json.dumps({"check_a": {}}))
+    refreshed = fingerprint_repo(repo, {**entry, "root": "cached"})
+    assert refreshed["root"] not in ("cached", entry["root"])
+
+def test_unparseable_repos_are_not_comparable(tmp_path):
+    base = make_repo(tmp_path / "base")
+    broken = make_repo(tmp_path / "broken", config="skip_rules: [unclosed\n")
+    scalar = make_repo(tmp_path / "scalar", config="just a string\n")
+    listed = make_repo(tmp_path / "listed", mapping=["check_a"])
+    cache = {}
+    results = scan([str(broken), str(scalar), str(listed)], base, cache, workers=2)
+    assert results == {str(broken): None, str(scalar): None, str(listed): None}
+    assert "ParserError" in cache[str(broken.resolve())]["error"]
+    assert "mapping" in cache[str(scalar.resolve())]["error"]
+    assert scan([str(tmp_path / "base")], broken, {}) == {str(tmp_path / "base"): None}
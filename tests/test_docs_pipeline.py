@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.docs_pipeline import DocTarget, run_pipeline, up_to_date
+from scripts.rule_doc_sync import render_rules_section
+
+def test_pipeline_rebuilds_only_stale_targets_and_skips_identical_writes(tmp_path):
+    state = {"version": 1}
+    renders = []
+    out_a, out_b = tmp_path / "a.md", tmp_path / "b.md"
+    def render(name, path):
+        def build():
+            renders.append(name)
+            return {path: f"{name} v{state['version'] if name == 'a' else 1}\n"}
+        return build
+    targets = [DocTarget("a", lambda: {"version": state["version"]}, render("a", out_a)),
+               DocTarget("b", lambda: {}, render("b", out_b))]
+    stamps = tmp_path / "stamps"
+    assert run_pipeline(targets, stamps) == {"a": "written", "b": "written"}
+    assert run_pipeline(targets, stamps) == {"a": "up to date", "b": "up to date"}
+    state["version"] = 2
+    assert run_pipeline(targets, stamps, check=True) == {"b": "up to date", "a": "stale"}
+    assert out_a.read_text() == "a v1\n"
+    assert run_pipeline(targets, stamps)["a"] == "written"
+    out_b.write_text("edited by hand\n")
+    mtime = out_a.stat().st_mtime_ns
+    assert run_pipeline(targets, stamps, force=True) == {"a": "unchanged", "b": "written"}
+    assert out_a.stat().st_mtime_ns == mtime and out_b.read_text() == "b v1\n"
+    assert renders == ["a", "b", "a", "a", "a", "b"]
+
+def test_rule_list_section_is_replaced_in_place():
+    text = "# Doc\n\n## Rule List\n\n- old\n\n---\n\nTail\n"
+    new = render_rules_section(text, {"check_a": {"description": "A", "deprecated": True}})
+    assert new == "# Doc\n\n## Rule List\n\n- **check_a**: A (DEPRECATED)\n\n---\n\nTail\n"
+    assert render_rules_section(new, {"check_a": {"description": "A", "deprecated": True}}) == new
+
+def test_stamps_without_outputs_are_stale():
+    assert not up_to_date({"inputs": {"rollups": 3}, "outputs": {}}, {"rollups": 3})
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import numpy as np
+from scripts.drift_engine import ViolationHistory, analyze, ewma, rolling_mean
+
+def test_single_noisy_run_does_not_drift():
+    history = ViolationHistory()
+    for run in range(8):
+        history.add_run(f"run{run}", {("check_py_length", "a.py"): 40 if run == 7 else 1})
+    assert not analyze(history)["drifting"][0]
+    history.add_run("run8", {("check_py_length", "a.py"): 40})
+    result = analyze(history)
+    assert result["drifting"][0]
+    assert result["change_point"][0] == 7
+
+def test_rolling_mean_and_ewma():
+    x = np.array([[1, 2, 3, 4]])
+    assert rolling_mean(x, 2).tolist() == [[1.0, 1.5, 2.5, 3.5]]
+    assert ewma(x, 0.5)[0, -1] == 3.125
+
+def test_history_roundtrip(tmp_path):
+    history = ViolationHistory()
+    history.add_run("r1", {("a", "x.py"): 2})
+    history.add_run("r2", {("b", "y.py"): 1})
+    history.save(tmp_path / "h.npz")
+    loaded = ViolationHistory.load(tmp_path / "h.npz")
+    assert loaded.counts.tolist() == [[2, 0], [0, 1]]
+    assert loaded.as_cube().shape == (2, 2, 2)
+
+def test_analyze_100k_series_is_fast():
+    n_series, n_runs = 100_000, 20
+    counts = np.random.default_rng(0).poisson(2, (n_series, n_runs))
+    history = ViolationHistory(
+        rules=[f"r{i}" for i in range(1000)], files=[f"f{i}" for i in range(100)],
+        runs=[str(i) for i in range(n_runs)], series_rule=np.arange(n_series) % 1000,
+        series_file=np.arange(n_series) // 1000, counts=counts,
+    )
+    start = time.perf_counter()
+    analyze(history)
+    assert time.perf_counter() - start < 1.0
+
+def test_record_run_counts_only_the_current_runs_entries(tmp_path, monkeypatch):
+    import json
+    from scripts import rule_drift_detection as rdd
+    log = tmp_path / "rule_violations.jsonl"
+    old = [{"rule": "r", "file": "a.py"}, {"rule": "r", "file": "a.py", "run_id": "run1"}]
+    log.write_text("".join(json.dumps(v) + "\n" for v in old))
+    offset = log.stat().st_size
+    new = [{"rule": "r", "file": "a.py"}, {"rule": "r", "file": "b.py", "run_id": "run2"}]
+    with open(log, "a") as f:
+        f.write("".join(json.dumps(v) + "\n" for v in new))
+    monkeypatch.setattr(rdd, "VIOLATION_LOG", log)
+    pairs = rdd.count_pairs(rdd.load_run_entries("run2", offset))
+    assert pairs == {("r", "a.py"): 1, ("r", "b.py"): 1}
+    assert rdd.count_pairs(rdd.load_run_entries("run1")) == {("r", "a.py"): 1}
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+import json
+import os
+import re
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.html_report import UNOWNED, build_report_data, write_html_report
+from scripts.log_rollups import aggregate
+from scripts.ownership import Ownership
+
+RESULTS = [
+    {"script": "check_shebang.py", "category": "style", "status": "PASS", "duration": 0.5},
+    {"script": "check_py_length.py", "category": "style", "status": "FAIL", "duration": 1.25},
+]
+VIOLATIONS = [
+    {"rule": "check_py_length", "file": "scripts/a.py", "severity": "error", "date": "2024-01-02"},
+    {"rule": "check_py_length", "file": "scripts/a.py", "severity": "error", "date": "2024-01-02"},
+    {"rule": "check_shebang", "file": "docs/b.py", "severity": "warning", "date": "2024-01-01",
+     "auto_fixed": True},
+]
+OWNERS = Ownership({"scripts/": "platform"})
+
+def test_report_data_is_columnar_and_owner_encoded():
+    data = build_report_data(RESULTS, aggregate("violations", VIOLATIONS), OWNERS)
+    assert data["totals"] == {"violations": 3, "auto_fixed": 1, "scripts": 2, "failed": 1}
+    assert data["scripts"]["name"] == ["check_py_length.py", "check_shebang.py"]
+    assert data["scripts"]["seconds"] == [1.25, 0.5]
+    assert data["by_rule"] == {"rule": ["check_py_length", "check_shebang"],
+                               "severities": ["error", "warning"], "counts": [[2, 0], [0, 1]]}
+    assert data["owners"] == ["platform", UNOWNED]
+    by_file = {"file": ["scripts/a.py", "docs/b.py"], "owner": [0, 1], "count": [2, 1]}
+    assert data["by_file"] == by_file
+    assert data["by_owner"] == {"owner": ["platform", UNOWNED], "count": [2, 1]}
+    assert data["by_date"] == {"date": ["2024-01-01", "2024-01-02"], "count": [1, 2]}
+
+def test_written_html_embeds_the_payload(tmp_path):
+    violations = VIOLATIONS + [{"rule": "x", "file": "</script><b>.py", "severity": "error"}]
+    table = aggregate("violations", violations)
+    path = write_html_report(tmp_path / "report.html", RESULTS, table, OWNERS)
+    html = path.read_text(encoding="utf-8")
+    assert "__REPORT_DATA__" not in html and "</script><b>" not in html
+    payload = re.search(r'id="report-data">(.*?)</script>', html, re.DOTALL)
+    data = json.loads(payload.group(1))
+    assert data["totals"]["violations"] == 4 and "</script><b>.py" in data["by_file"]["file"]
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
+from github_stub import GitHubStub
+from scripts import http_client
+from scripts.http_client import TokenBucket
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+    def sleep(self, seconds):
+        self.now += seconds
+
+def test_token_bucket_follows_rate_limit_headers():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock, sleep=clock.sleep)
+    bucket.update_from_headers({"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "100"},
+                               wall_clock=lambda: 90)
+    assert bucket.rate == 1.0
+    for _ in range(4):
+        bucket.acquire()
+    assert clock.now == 2.0
+    bucket.update_from_headers({"Retry-After": "30"})
+    bucket.acquire()
+    assert clock.now >= 32.0
+
+def test_request_retries_server_errors(monkeypatch):
+    monkeypatch.setattr(http_client, "BACKOFF_MULTIPLIER", 0.01)
+    with GitHubStub() as gh:
+        gh.queue_responses((503, {}), (503, {}))
+        resp = http_client.get(f"{gh.url}/repos/o/r/issues")
+        assert resp.status_code == 200
+        assert gh.counts[("GET", "issues")] == 3
+
+def test_post_is_not_retried_after_a_server_error(monkeypatch):
+    monkeypatch.setattr(http_client, "BACKOFF_MULTIPLIER", 0.01)
+    with GitHubStub() as gh:
+        url = f"{gh.url}/repos/o/r/issues"
+        gh.queue_responses((502, {}))
+        assert http_client.post(url, json={"title": "a"}).status_code == 502
+        assert gh.counts[("POST", "issues")] == 1 and gh.issues == {}
+        # A rate-limited POST was not processed, so it is safe to send again.
+        gh.queue_responses((429, {}))
+        assert http_client.post(url, json={"title": "a"}).status_code == 201
+        assert gh.counts[("POST", "issues")] == 3 and len(gh.issues) == 1
+        gh.queue_responses((502, {}), (502, {}))
+        http_client.post(url, json={"title": "b"}, idempotent=True, max_attempts=2)
+        assert gh.counts[("POST", "issues")] == 5
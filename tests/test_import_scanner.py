@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts import import_scanner
+
+def test_scan_is_incremental_and_filters_local_and_stdlib(tmp_path, monkeypatch):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "helpers.py").write_text("import json\nfrom . import other\n")
+    (tmp_path / "main.py").write_text("import os, yaml\nfrom pkg.helpers import x\nimport helpers\n"
+                                      "try:\n    import github\nexcept ImportError:\n    pass\n")
+    cache = tmp_path / "cache.json"
+    parsed = []
+    extract = import_scanner.extract_imports
+    monkeypatch.setattr(import_scanner, "extract_imports",
+                        lambda src, name: parsed.append(name) or extract(src, name))
+    scan = import_scanner.scan_project(tmp_path, cache)
+    assert scan["main.py"] == ["github", "helpers", "os", "pkg", "yaml"]
+    third_party = import_scanner.third_party_imports(scan)
+    assert sorted(third_party) == ["github", "yaml"]
+    assert import_scanner.distributions_for(third_party) == {"github": "PyGithub", "yaml": "PyYAML"}
+    (tmp_path / "main.py").write_text("import requests\n")
+    assert import_scanner.scan_project(tmp_path, cache)["main.py"] == ["requests"]
+    assert parsed == ["main.py", "pkg/helpers.py", "main.py"]
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmarks of the GitHub integrations against the local stub (tests/github_stub.py).
+Size 10 always runs; 1k and 10k run with SMARTAI_BENCHMARKS=1, which also appends results to
+logs/integration_benchmarks.jsonl so throughput and request counts can be compared across commits.
+"""
+import json
+import logging
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import requests
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
+from github_stub import GitHubStub
+from scripts import http_client
+from scripts.sync_board_to_github import sync_board
+from scripts.pr_feedback_bot import post_feedback
+from scripts.pr_rule_violation_bot import post_check_run_annotations
+from scripts.auto_create_ci_issue import create_ci_issue
+
+RUN_LARGE = os.environ.get("SMARTAI_BENCHMARKS") == "1"
+RESULTS_PATH = os.path.join(os.path.dirname(__file__), "..", "logs", "integration_benchmarks.jsonl")
+LARGE = pytest.mark.skipif(not RUN_LARGE, reason="set SMARTAI_BENCHMARKS=1")
+SIZES = [10] + [pytest.param(n, marks=LARGE) for n in (1_000, 10_000)]
+LOGGER = logging.getLogger("integration_benchmarks")
+LOGGER.disabled = True
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(http_client, "BACKOFF_MULTIPLIER", 0.01)
+
+def report(name, size, seconds, stub):
+    result = {"bench": name, "items": size, "seconds": round(seconds, 3),
+              "items_per_s": round(size / seconds, 1) if seconds else None,
+              "requests": stub.total_requests,
+              "ts": time.time()}
+    print(json.dumps(result))
+    if RUN_LARGE:
+        os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+        with open(RESULTS_PATH, "a") as f:
+            f.write(json.dumps(result) + "\n")
+
+@pytest.mark.parametrize("size", SIZES)
+def test_board_sync(size, tmp_path):
+    tsv, journal = tmp_path / "board.tsv", tmp_path / "journal.json"
+    tsv.write_text("".join(f"Item {i}\t\t\tTodo\n" for i in range(size)))
+    with GitHubStub(error_rate=0.01) as gh:
+        start = time.perf_counter()
+        stats = sync_board("o/r", "t", tsv, LOGGER, journal, gh.url)
+        report("board_sync", size, time.perf_counter() - start, gh)
+        assert stats["created"] == size and len(gh.issues) == size
+        before = gh.total_requests
+        sync_board("o/r", "t", tsv, LOGGER, journal, gh.url)
+        assert gh.total_requests == before
+
+@pytest.mark.parametrize("size", SIZES)
+def test_pr_feedback_review(size, tmp_path):
+    files = max(1, size // 10)
+    patch = "@@ -1,0 +1,10 @@\n" + "".join(f"+line {i}\n" for i in range(10))
+    violations = [{"rule": "check_py_length", "file": f"scripts/f{i % files}.py",
+                   "line": i % 10 + 1, "message": f"violation {i}"} for i in range(size)]
+    with GitHubStub(error_rate=0.01) as gh:
+        gh.pull_files[1] = [{"filename": f"scripts/f{i}.py", "patch": patch} for i in range(files)]
+        start = time.perf_counter()
+        post_feedback("o/r", 1, "t", violations, LOGGER, gh.url, tmp_path / "posted.json")
+        report("pr_feedback_review", size, time.perf_counter() - start, gh)
+        assert all(len(review["body"]) <= 65536 for review in gh.reviews)
+        assert sum(review["body"].count("<!-- fingerprint:") for review in gh.reviews) == size
+        assert gh.counts[("GET", "pull_files")] >= math.ceil(files / 100)
+
+@pytest.mark.parametrize("size", SIZES)
+def test_check_run_annotations(size):
+    violations = [{"rule": "check_py_length", "file": f"scripts/f{i}.py", "line": 1, "message": "m",
+                   "severity": "error"} for i in range(size)]
+    with GitHubStub(error_rate=0.01) as gh:
+        start = time.perf_counter()
+        posted = post_check_run_annotations("t", 1, "o/r", "sha", violations, LOGGER, api=gh.url)
+        report("check_run_annotations", size, time.perf_counter() - start, gh)
+        assert posted == size and len(gh.check_runs[1]["annotations"]) == size
+        assert gh.counts[("PATCH", "check_run")] >= math.ceil(size / 50)
+
+@pytest.mark.parametrize("size", SIZES)
+def test_ci_issue_creation(size):
+    with GitHubStub(error_rate=0.01) as gh:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            numbers = list(executor.map(
+                lambda i: create_ci_issue("o/r", "t", f"CI failure {i}", "body", LOGGER, gh.url),
+                range(size)))
+        report("ci_issue_creation", size, time.perf_counter() - start, gh)
+        assert None not in numbers and len(gh.issues) == size
+
+def test_stub_latency_and_rate_limit():
+    with GitHubStub(latency=0.05, rate_limit=(2, 1)) as gh:
+        start = time.perf_counter()
+        assert create_ci_issue("o/r", "t", "a", "b", LOGGER, gh.url) == 1
+        assert time.perf_counter() - start >= 0.05
+        assert requests.get(f"{gh.url}/repos/o/r/issues").headers["X-RateLimit-Remaining"] == "0"
+        assert requests.get(f"{gh.url}/repos/o/r/issues").status_code == 403
+        # The shared client saw the exhausted quota and waits for the reset instead of failing.
+        reset = str(gh.window_start + 1)
+        http_client.get_limiter(gh.url).update_from_headers({"X-RateLimit-Remaining": "0",
+                                                             "X-RateLimit-Reset": reset})
+        assert http_client.get(f"{gh.url}/repos/o/r/issues").status_code == 200
+        assert time.perf_counter() - start >= 1.0
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.log_rollups import load_rollups, refresh_rollups
+
+def write(path, entries, mode="a"):
+    with open(path, mode) as f:
+        f.writelines(json.dumps(e) + "\n" for e in entries)
+
+def violation(rule, day="2024-01-01"):
+    return {"rule": rule, "file": "a.py", "severity": "error", "date": day}
+
+def test_appended_lines_are_folded_in_incrementally(tmp_path):
+    logs, path = tmp_path / "logs", tmp_path / "rollups.json"
+    logs.mkdir()
+    log = logs / "rule_violations.jsonl"
+    write(log, [violation("r1"), violation("r2")])
+    first = refresh_rollups(path, logs)
+    assert first["tables"]["violations"]["total"] == 2
+    with open(log, "a") as f:
+        f.write(json.dumps(violation("r1", "2024-01-02")) + "\n" + '{"rule": "partial"')
+    table = refresh_rollups(path, logs)["tables"]["violations"]
+    assert table["total"] == 3 and table["by_rule"]["r1"] == {"error": 2}
+    with open(log, "a") as f:
+        f.write(', "severity": "warning"}\n')
+    rollups = refresh_rollups(path, logs)
+    assert rollups["tables"]["violations"]["by_rule"]["partial"] == {"warning": 1}
+    assert rollups["version"] != first["version"] and load_rollups(path) == rollups
+
+def test_truncated_and_rotated_logs_are_rebuilt(tmp_path):
+    logs, path = tmp_path / "logs", tmp_path / "rollups.json"
+    logs.mkdir()
+    log = logs / "rule_violations.jsonl"
+    write(log, [violation("r1")] * 3)
+    assert refresh_rollups(path, logs)["tables"]["violations"]["total"] == 3
+    write(log, [violation("r2")], mode="w")
+    table = refresh_rollups(path, logs)["tables"]["violations"]
+    assert table["total"] == 1 and list(table["by_rule"]) == ["r2"]
+    # Rotation: a new file (new inode) at the same path, already longer than the old offset
+    os.rename(log, logs / "rule_violations.jsonl.1")
+    write(log, [violation("r3")] * 5)
+    table = refresh_rollups(path, logs)["tables"]["violations"]
+    assert table["total"] == 5 and list(table["by_rule"]) == ["r3"]
+
+def test_concurrent_refreshes_leave_a_valid_rollup_file(tmp_path):
+    logs, path = tmp_path / "logs", tmp_path / "rollups.json"
+    logs.mkdir()
+    log = logs / "rule_violations.jsonl"
+    for i in range(20):
+        write(log, [violation(f"r{i}")])
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: refresh_rollups(path, logs), range(8)))
+        assert load_rollups(path)["tables"]["violations"]["total"] == i + 1
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".tmp"] == []
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts import notification_outbox as outbox
+
+def test_bursts_are_coalesced_and_failures_retried(tmp_path):
+    db = tmp_path / "outbox.db"
+    for i in range(3):
+        outbox.enqueue("slack", f"drift {i}", subject="Rule Drift Detected", path=db)
+    outbox.enqueue("email", "expired", subject="Rule Exception Review", path=db)
+    sent = {}
+
+    def slack(digests):
+        sent["slack"] = digests
+        return [True] * len(digests)
+
+    def email(digests):
+        time.sleep(1)
+        return [True] * len(digests)
+
+    def failing(digests):
+        return [False] * len(digests)
+
+    assert outbox.dispatch(db, timeout=0.2, senders={"slack": slack, "email": email}) == (3, 0, 1)
+    (ids, subject, body), = sent["slack"]
+    assert len(ids) == 3 and "3 notifications" in subject and "drift 2" in body
+    # The timed-out email may have gone out: it is not re-sent until explicitly re-queued
+    assert outbox.pending(db) == {}
+    assert outbox.status(db) == [("email", 0, 0, 0, 1), ("slack", 0, 3, 0, 0)]
+    assert outbox.retry_unknown(db) == 1
+    assert outbox.dispatch(db, senders={"email": failing}) == (0, 1, 0)
+    assert list(outbox.pending(db)) == ["email"]
+    assert outbox.dispatch(db, senders={"slack": slack, "email": lambda d: [True]}) == (1, 0, 0)
+    assert outbox.pending(db) == {}
+
+def test_only_the_digest_in_flight_is_unknown(tmp_path):
+    # 45 messages -> digests of 20, 20 and 5
+    db, delivered = tmp_path / "outbox.db", []
+    for i in range(45):
+        outbox.enqueue("slack", f"drift {i}", path=db)
+
+    def stalls_on_second(digests):
+        for n, digest in enumerate(digests):
+            if n == 1:
+                time.sleep(0.5)
+            delivered.append(n)
+            yield True
+
+    assert outbox.dispatch(db, timeout=0.2, senders={"slack": stalls_on_second}) == (20, 5, 20)
+    time.sleep(0.5)
+    assert delivered == [0, 1]
+    assert outbox.status(db) == [("slack", 5, 20, 0, 20)]
+
+    def raises_on_first(digests):
+        raise OSError("connection refused")
+        yield
+
+    db = tmp_path / "errors.db"
+    for i in range(45):
+        outbox.enqueue("slack", f"drift {i}", path=db)
+    assert outbox.dispatch(db, senders={"slack": raises_on_first}) == (0, 45, 0)
+    with outbox.connect(db) as conn:
+        query = "SELECT attempts, COUNT(*) FROM outbox GROUP BY attempts"
+        attempts = conn.execute(query).fetchall()
+    assert attempts == [(0, 25), (1, 20)]
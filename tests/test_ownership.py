@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.ownership import Ownership, get_ownership
+
+PATTERNS = {
+    "*": "default",
+    "scripts/": "platform",
+    "docs/": "writers",
+    "*.md": "docs-team",
+    "scripts/plugins/**": "plugins",
+    "tests/**/test_*.py": "qa",
+    "scripts/run_all_checks.py": "ci",
+    "/setup.py": "release",
+    "scripts/check_[!d]*.py": "checks",
+}
+
+def test_last_matching_pattern_wins():
+    owners = Ownership(PATTERNS)
+    assert owners.owner_of("scripts/ownership.py") == "platform"
+    assert owners.owner_of("scripts/run_all_checks.py") == "ci"
+    assert owners.owner_of("scripts/check_py_length.py") == "checks"
+    assert owners.owner_of("scripts/check_docstrings.py") == "platform"
+    assert owners.owner_of("scripts/plugins/demo/demo_plugin_check.py") == "plugins"
+    assert owners.owner_of("scripts/plugins/README.md") == "plugins"
+    assert owners.owner_of("scripts/README.md") == "docs-team"
+    assert owners.owner_of("sub/docs/guide.txt") == "writers"
+    assert owners.owner_of("tests/test_sample.py") == "qa"
+    assert owners.owner_of("tests/unit/deep/test_x.py") == "qa"
+    assert owners.owner_of("tests/helpers.py") == "default"
+    assert owners.owner_of("setup.py") == "release"
+    assert owners.owner_of("pkg/setup.py") == "default"
+    assert Ownership({}).owner_of("anything.py") is None
+
+def test_owners_for_skips_unowned_paths_and_matches_owner_of():
+    owners = Ownership({"scripts/": "platform", "README.md": "docs", "notes.txt": "x"})
+    paths = ["scripts/a.py", "README.md", "docs/README.md", "tests/test_a.py", "./scripts/b/c.py",
+             "notes.txt/inner.py"]
+    assert owners.owners_for(paths) == {"scripts/a.py": "platform", "README.md": "docs",
+                                        "docs/README.md": "docs", "./scripts/b/c.py": "platform",
+                                        "notes.txt/inner.py": "x"}
+    assert owners.get("tests/test_a.py", "-") == "-"
+
+def test_get_ownership_reloads_on_change(tmp_path):
+    path = tmp_path / "file_ownership.json"
+    assert get_ownership(path).owner_of("a.py") is None
+    path.write_text(json.dumps({"*.py": "team-a"}))
+    first = get_ownership(path)
+    assert first.owner_of("a.py") == "team-a" and get_ownership(path) is first
+    path.write_text(json.dumps({"*.py": "team-bb"}))
+    assert get_ownership(path).owner_of("a.py") == "team-bb"
+
+def test_globs_match_whole_names_only():
+    owners = Ownership({"*.md": "docs", "*.py": "py"})
+    assert owners.owner_of("a.pyc") is None
+    assert owners.owner_of("scripts/x.py.bak") is None
+    assert owners.owner_of("scripts/x.py") == "py"
+    owners = Ownership({"*": "default", "tests/*.py": "qa", "pkg*/gen/": "gen"})
+    assert owners.owner_of("tests/a.pyc") == "default"
+    assert owners.owner_of("tests/a.py") == "qa"
+    assert owners.owner_of("pkg1/gen/deep/x.txt") == "gen"
+    assert owners.owner_of("pkg1/general/x.txt") == "default"
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import logging
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
+from github_stub import GitHubStub
+from scripts.pr_feedback_bot import (FINGERPRINT_RE, build_reviews, patch_positions,
+                                     post_feedback)
+
+PATCH = ("@@ -1,3 +1,4 @@\n import os\n-import sys\n+import json\n+import re\n x = 1\n"
+         "@@ -10,2 +11,2 @@\n y = 2\n+z = 3")
+VIOLATIONS = [{"rule": "r1", "file": "scripts/a.py", "line": 3, "message": "m"},
+              {"rule": "r2", "file": "scripts/a.py", "line": 3, "message": "n"},
+              {"rule": "r3", "file": "scripts/b.py", "line": 1, "message": "o"}]
+
+def test_patch_positions():
+    assert patch_positions(PATCH) == {1: 1, 2: 3, 3: 4, 4: 5, 11: 7, 12: 8}
+
+def test_single_review_and_no_reposts(tmp_path):
+    logger, cache = logging.getLogger("test_pr_feedback_bot"), tmp_path / "posted.json"
+    with GitHubStub() as gh:
+        gh.pull_files[7] = [{"filename": "scripts/a.py", "patch": PATCH}]
+        post_feedback("o/r", 7, "t", VIOLATIONS, logger, gh.url, cache)
+        review, = gh.reviews
+        assert review["commit_id"] == "0" * 40
+        comment, = review["comments"]
+        assert (comment["path"], comment["position"]) == ("scripts/a.py", 4)
+        assert "scripts/b.py" in review["body"]
+        gh.log.clear()
+        assert post_feedback("o/r", 7, "t", VIOLATIONS, logger, gh.url, cache) == []
+        assert gh.log == []
+        # A fresh runner has no cache: the markers in the posted review stand in for it.
+        cold = tmp_path / "cold.json"
+        assert post_feedback("o/r", 7, "t", VIOLATIONS, logger, gh.url, cold) == []
+        assert [(method, route) for method, route, _ in gh.log] == [("GET", "reviews")]
+        moved = dict(VIOLATIONS[0], line=2)
+        post_feedback("o/r", 7, "t", VIOLATIONS + [moved], logger, gh.url, cold)
+        assert len(gh.reviews) == 2 and len(gh.reviews[1]["comments"]) == 1
+
+def test_reviews_are_split_under_the_body_limit():
+    violations = [{"rule": "r", "file": "scripts/c.py", "line": i, "message": "x" * 40}
+                  for i in range(100)]
+    reviews = build_reviews(violations, {}, "0" * 40, max_body=2000)
+    assert len(reviews) > 1 and all(len(r["body"]) <= 2000 for r in reviews)
+    assert reviews[0]["body"].startswith("## Rule Violations (")
+    assert "(part 1/" in reviews[0]["body"]
+    markers = [fp for r in reviews for fp in FINGERPRINT_RE.findall(r["body"])]
+    assert len(set(markers)) == len(markers) == 100
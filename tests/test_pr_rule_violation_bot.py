@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+import logging
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
+from github_stub import GitHubStub
+from scripts.pr_rule_violation_bot import post_check_run_annotations
+
+def test_annotations_are_chunked():
+    violations = [{"rule": "check_py_length", "file": f"scripts/s{i}.py", "line": i,
+                   "message": "too long", "severity": "error"} for i in range(1, 121)]
+    failed = [{"script": "check_py_length.py", "category": "style", "status": "FAIL"}]
+    with GitHubStub() as gh:
+        posted = post_check_run_annotations("t", 1, "o/r", "abc", violations,
+                                            logging.getLogger("test_bot"), failed=failed,
+                                            api=gh.url)
+    updates = [data["output"] for method, route, data in gh.log
+               if (method, route) == ("PATCH", "check_run")]
+    assert posted == 120 and len(gh.check_runs[1]["annotations"]) == 120
+    assert sorted(len(u["annotations"]) for u in updates) == [20, 50, 50]
+    assert len(updates[0]["annotations"]) == 50
+    assert len({(u["title"], u["summary"]) for u in updates}) == 1
+    assert updates[0]["annotations"][0] == {"path": "scripts/s1.py", "start_line": 1, "end_line": 1,
+                                            "annotation_level": "failure",
+                                            "title": "check_py_length", "message": "too long"}
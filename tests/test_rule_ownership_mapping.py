@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+import os
+import subprocess
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts import rule_ownership_mapping
+from scripts.ownership import Ownership
+from scripts.rule_ownership_mapping import (author_weights, blame_all, head_blobs, infer_ownership,
+                                             infer_patterns, merge_inferred)
+
+DAY = 86400
+NOW = 1_700_000_000
+
+def commit(repo, author, when, files):
+    for path, text in files.items():
+        (repo / path).parent.mkdir(parents=True, exist_ok=True)
+        (repo / path).write_text(text)
+    env = {**os.environ, "GIT_AUTHOR_NAME": author, "GIT_AUTHOR_EMAIL": f"{author}@example.com",
+           "GIT_COMMITTER_NAME": author, "GIT_COMMITTER_EMAIL": f"{author}@example.com",
+           "GIT_AUTHOR_DATE": f"{when} +0000", "GIT_COMMITTER_DATE": f"{when} +0000"}
+    subprocess.run(["git", "add", "-A"], cwd=repo, check=True)
+    subprocess.run(["git", "commit", "-q", "-m", "change"], cwd=repo, check=True, env=env)
+
+def test_recent_lines_outweigh_old_ones():
+    authors = {"old": [[NOW - 360 * DAY, 10]], "new": [[NOW, 3]]}
+    weights = author_weights(authors, NOW, half_life_days=90)
+    assert weights["new"] == 3 and round(weights["old"], 3) == 0.625
+
+def test_patterns_cover_directories_and_exceptions():
+    blames = {"a/x.py": {"ann": [[NOW, 10]]}, "a/y.py": {"ann": [[NOW, 5]], "bob": [[NOW, 6]]},
+              "b/c/z.py": {"bob": [[NOW, 4]]}, "setup.py": {"ann": [[NOW, 1]]}}
+    patterns = infer_patterns(blames, NOW)
+    assert patterns == {"*": "ann", "/b/": "bob", "a/y.py": "bob"}
+    owners = Ownership(patterns)
+    assert {p: owners.owner_of(p) for p in blames} == {"a/x.py": "ann", "a/y.py": "bob",
+                                                       "b/c/z.py": "bob", "setup.py": "ann"}
+
+def test_infer_ownership_blames_only_changed_blobs(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    commit(repo, "ann", NOW - 400 * DAY, {"core/a.py": "1\n2\n3\n4\n", "docs/guide.md": "x\n"})
+    commit(repo, "bob", NOW - DAY, {"core/a.py": "1\n2\nb3\nb4\n", "docs/guide.md": "y\ny\n"})
+    cache = tmp_path / "blame.json"
+    patterns, fresh = infer_ownership(repo, cache, workers=2, now=NOW)
+    assert fresh == 2 and patterns == {"*": "bob@example.com"}
+    calls = []
+    real = rule_ownership_mapping.blame_file
+    monkeypatch.setattr(rule_ownership_mapping, "blame_file",
+                        lambda root, path: calls.append(path) or real(root, path))
+    commit(repo, "cy", NOW, {"core/new.py": "1\n2\n3\n4\n5\n6\n7\n8\n"})
+    patterns, fresh = infer_ownership(repo, cache, workers=2, now=NOW)
+    assert calls == ["core/new.py"] and fresh == 1
+    assert patterns == {"*": "cy@example.com", "/docs/": "bob@example.com",
+                        "core/a.py": "bob@example.com"}
+
+def test_same_blob_at_two_paths_is_blamed_per_path(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    commit(repo, "ann", NOW - DAY, {"a.py": "x\n"})
+    commit(repo, "bob", NOW, {"b.py": "x\n"})
+    cache = {}
+    blames = blame_all(repo, head_blobs(repo), cache, workers=2)
+    assert list(blames["a.py"]) == ["ann@example.com"]
+    assert list(blames["b.py"]) == ["bob@example.com"]
+    assert len(cache) == 2
+
+def test_infer_keeps_manual_entries_after_inferred_patterns():
+    previous = {"*": "ann", "/docs/": "bob"}
+    current = {**previous, "/docs/": "writers", "scripts/run_all_checks.py": "ci"}
+    merged = merge_inferred(current, previous, {"*": "cy", "/docs/": "bob"})
+    assert merged == {"*": "cy", "/docs/": "writers", "scripts/run_all_checks.py": "ci"}
+    assert list(merged)[-2:] == ["/docs/", "scripts/run_all_checks.py"]
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.rule_performance_profiling import detect_regressions, mann_whitney_greater
+
+def make_runs(durations, calibration=1.0):
+    return [
+        {"rule": "check_py_length", "duration": d, "ts": i, "commit": f"{i:040x}",
+         "calibration": calibration}
+        for i, d in enumerate(durations)
+    ]
+
+def test_detects_30_percent_slowdown_and_commit_range():
+    entries = make_runs([1.0, 1.02, 0.98, 1.01, 0.99, 1.0, 1.4, 1.41, 1.39, 1.42, 1.4])
+    regressions = detect_regressions(entries, recent=5, min_history=5)
+    assert [r["rule"] for r in regressions] == ["check_py_length"]
+    assert regressions[0]["commits"] == f"{5:040x}"[:12] + ".." + f"{6:040x}"[:12]
+
+def test_slower_runner_is_not_a_regression():
+    history = make_runs([1.0, 1.02, 0.98, 1.01, 0.99, 1.0])
+    slow_runner = make_runs([1.5, 1.52, 1.49, 1.51, 1.5], calibration=1.5)
+    for i, entry in enumerate(slow_runner):
+        entry["ts"] = 100 + i
+    assert detect_regressions(history + slow_runner, recent=5, min_history=5) == []
+
+def test_mann_whitney_direction():
+    assert mann_whitney_greater([5, 6, 7, 8], [1, 2, 3, 4]) < 0.05
+    assert mann_whitney_greater([1, 2, 3, 4], [5, 6, 7, 8]) > 0.5
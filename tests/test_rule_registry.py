@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from scripts.rule_registry import RuleRegistry, get_registry
+
+MAPPING = {
+    "check_a": {"category": "style", "script": "check_a.py", "owner": "team-a",
+                "deprecated": True, "upgrade_to": "check_b"},
+    "check_b": {"category": "style,security", "script": "check_b.py", "severity": "warning",
+                "deprecated": True, "upgrade_to": "check_c"},
+    "check_c": {"category": "security", "script": "check_c.py", "owner": "team-a",
+                "enforcement": "warn"},
+}
+
+def test_indexes_and_upgrade_chains():
+    registry = RuleRegistry(MAPPING)
+    assert registry.rules_in_category("Security") == {"check_b", "check_c"}
+    assert registry.rules_by_owner("team-a") == {"check_a", "check_c"}
+    assert registry.rules_for_path("scripts/check_b.py") == {"check_b"}
+    assert registry.blocking_rules() == {"check_a"}
+    assert registry.deprecated == {"check_a", "check_b"}
+    assert registry.upgrade_chain("check_a") == ["check_b", "check_c"]
+    assert registry.final_upgrade("check_c") is None
+    assert registry.problems == []
+
+def test_validation_reports_cycles_and_bad_entries():
+    registry = RuleRegistry({"x": {"upgrade_to": "y"},
+                             "y": {"upgrade_to": "x", "severity": "fatal"}})
+    assert any("cycle" in p for p in registry.problems)
+    assert any("fatal" in p for p in registry.problems)
+    with pytest.raises(ValueError):
+        RuleRegistry({"x": "not an object"})
+
+def test_get_registry_is_cached_until_the_file_changes(tmp_path):
+    path = tmp_path / "rule_mapping.json"
+    path.write_text(json.dumps(MAPPING))
+    first = get_registry(path)
+    assert get_registry(path) is first
+    path.write_text(json.dumps({"check_d": {}}))
+    os.utime(path, ns=(0, 0))
+    assert list(get_registry(path)) == ["check_d"]
+    assert len(get_registry(tmp_path / "missing.json")) == 0
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+import os
+import sys
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts import rule_release_gates
+from scripts.rule_registry import RuleRegistry
+from scripts.run_history import build_run_summary
+
+REGISTRY = RuleRegistry({
+    "check_py_length": {"script": "check_py_length.py", "severity": "error",
+                        "enforcement": "block"},
+    "check_docstrings": {"script": "check_docstrings.py", "severity": "warning",
+                         "enforcement": "warn"},
+})
+
+def summary_for(results, commit="abc"):
+    return build_run_summary("run-1", results, [], REGISTRY.as_dict(), started=0.0, commit=commit)
+
+def test_failed_blocking_script_and_stale_summary_block():
+    failed = summary_for([{"script": "check_py_length.py", "status": "FAIL"}])
+    assert rule_release_gates.gate_problems(failed, REGISTRY, "abc") == [
+        "check_py_length.py FAIL (blocking rule check_py_length)"]
+    warn_only = summary_for([{"script": "check_docstrings.py", "status": "FAIL"}])
+    assert rule_release_gates.gate_problems(warn_only, REGISTRY, "abc") == []
+    assert "not HEAD" in rule_release_gates.gate_problems(warn_only, REGISTRY, "def")[0]
+
+def test_enforce_exits_1_when_a_blocking_check_fails(monkeypatch):
+    summary = summary_for([{"script": "check_py_length.py", "status": "FAIL"}])
+    monkeypatch.setattr(rule_release_gates, "load_latest_summary", lambda: summary)
+    monkeypatch.setattr(rule_release_gates, "current_commit", lambda: "abc")
+    monkeypatch.setattr(rule_release_gates, "get_registry", lambda path: REGISTRY)
+    monkeypatch.setattr(sys, "argv", ["rule_release_gates.py", "--enforce"])
+    with pytest.raises(SystemExit) as exit_info:
+        rule_release_gates.main()
+    assert exit_info.value.code == 1
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts import rule_result_cache
+from scripts.applicability_matrix import ApplicabilityMatrix
+from scripts.rule_what_if_simulator import project_change
+
+def test_evaluate_runs_only_uncached_files_and_projects_the_change(tmp_path, monkeypatch):
+    (tmp_path / "a.py").write_text('"""Doc."""\n')
+    (tmp_path / "b.py").write_text("x = 1\n")
+    results, files = {}, ["a.py", "b.py"]
+    evaluate = rule_result_cache.evaluate
+    first = evaluate("check_docstrings", files, {}, root=tmp_path, results=results)
+    assert first["violations"] == {"a.py": 0, "b.py": 1} and first["ran"] == 2
+    (tmp_path / "a.py").write_text("y = 2\n")
+    checked = []
+    checker = rule_result_cache.rule_checker
+
+    def counting_checker(script):
+        return lambda path, config: checked.append(path.name) or checker(script)(path, config)
+
+    monkeypatch.setattr(rule_result_cache, "rule_checker", counting_checker)
+    second = evaluate("check_docstrings", files, {}, root=tmp_path, results=results)
+    assert checked == ["a.py"] and second["cached"] == 1
+    assert second["violations"]["a.py"] == 1
+    unknown = evaluate("check_missing", ["a.py"], {}, root=tmp_path, results=results)
+    assert unknown["unknown"] == ["a.py"]
+
+    matrix = ApplicabilityMatrix.build(["a.py", "b.py", "c.py", "d.py"], ["check_docstrings"],
+                                       {"suppressed_rules": {"check_docstrings": "x"}})
+    report = {"violations": {"a.py": 1, "b.py": 1}, "ran": 0, "unknown": ["c.py", "d.py"],
+              "seconds_per_file": None}
+    perf = {"check_docstrings": {"count": 2, "sum": 8000.0}}
+    files = matrix.all_files
+    change = project_change("check_docstrings", files, matrix, report, perf, enabling=True)
+    assert change["estimated_violations"] == 4 and change["ci_seconds"] == 4.0
+    assert change["timing_source"] == "history"
+    disabling = project_change("check_docstrings", files, matrix, report, {}, enabling=False)
+    assert disabling["ci_seconds"] is None
+
+def test_rule_scripts_that_exit_on_import_are_skipped(tmp_path):
+    script = tmp_path / "check_exits.py"
+    script.write_text("import sys\nsys.exit(1)\n\ndef check_file(path, config):\n    return []\n")
+    assert rule_result_cache.rule_checker(script) is None
+    broken = tmp_path / "check_broken.py"
+    broken.write_text("raise RuntimeError('needs a CLI')\n")
+    assert rule_result_cache.rule_checker(broken) is None
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts import rule_security_patch
+from scripts.rule_marketplace import import_rule, publish_rule
+from scripts.rule_security_patch import SCANNER_STAMP, scan_source, scan_targets
+
+SOURCE = """import os as o
+import subprocess
+from pickle import loads as unpickle
+o.system("ls")
+subprocess.run(["ls"])
+unpickle(b"")
+eval("1")
+o.path.join("a", "b")
+"""
+
+def test_calls_are_resolved_through_import_aliases():
+    found = [(i["kind"], i["name"], i["line"]) for i in scan_source(SOURCE)]
+    assert found == [("import", "import os", 1), ("import", "import subprocess", 2),
+                     ("call", "os.system", 4), ("call", "subprocess.run", 5),
+                     ("call", "pickle.loads", 6), ("call", "eval", 7)]
+    assert scan_source("def f(:\n") == [{"kind": "error", "name": "unparseable", "line": 0}]
+
+def test_scan_targets_parses_each_content_once(tmp_path, monkeypatch):
+    (tmp_path / "a.py").write_text("eval('1')\n")
+    (tmp_path / "b.py").write_text("eval('1')\n")
+    (tmp_path / "c.py").write_text("print('ok')\n")
+    targets = {name: tmp_path / name for name in ("a.py", "b.py", "c.py")}
+    cache = {"scanner": "old", "results": {"stale": []}}
+    results = scan_targets(targets, cache, workers=1)
+    assert results["a.py"] == results["b.py"] == [{"kind": "call", "name": "eval", "line": 1}]
+    assert results["c.py"] == []
+    assert cache["scanner"] == SCANNER_STAMP and len(cache["results"]) == 2
+    monkeypatch.setattr(rule_security_patch, "scan_script", lambda path: 1 / 0)
+    assert scan_targets(targets, cache, workers=1) == results
+
+def test_marketplace_import_is_vetted(tmp_path):
+    registry, scripts, target = tmp_path / "registry", tmp_path / "scripts", tmp_path / "target"
+    scripts.mkdir()
+    target.mkdir()
+    (scripts / "check_shell.py").write_text(
+        '"""Runs a shell."""\nimport os\nos.system("rm -rf /tmp/x")\n')
+    publish_rule("check_shell", registry=registry, rules_dir=scripts)
+    ok, msg = import_rule("check_shell", registry=registry, rules_dir=target)
+    assert not ok and "os.system at line 3" in msg and not (target / "check_shell.py").exists()
+    assert import_rule("check_shell", registry=registry, rules_dir=target, allow_unsafe=True)[0]
+    assert rule_security_patch.registry_targets(registry).keys() == {"registry:check_shell@1.0.0"}
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.run_history import build_run_summary, fingerprint
+
+def test_summary_counts_and_blocking_fingerprints():
+    mapping = {
+        "check_py_length": {"severity": "error", "enforcement": "block"},
+        "check_docstrings": {"severity": "warning", "enforcement": "warn"},
+    }
+    violations = [
+        {"rule": "check_py_length", "file": "a.py", "line": 400, "message": "too long"},
+        {"rule": "check_docstrings", "file": "b.py", "line": 1, "message": "missing"},
+    ]
+    results = [{"script": "check_py_length.py", "status": "FAIL"},
+               {"script": "check_docstrings.py", "status": "PASS"}]
+    summary = build_run_summary("run-1", results, violations, mapping, started=0.0, commit="abc")
+    assert summary["status"] == "fail"
+    assert summary["by_severity"] == {"error": 1, "warning": 1}
+    assert summary["by_enforcement"] == {"block": 1, "warn": 1}
+    assert summary["blocking"] == {"count": 1, "fingerprints": [fingerprint(violations[0])]}
+    assert summary["failed_scripts"] == [
+        {"script": "check_py_length.py", "category": None, "status": "FAIL"}]
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+import logging
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
+from github_stub import GitHubStub
+from scripts.sync_board_to_github import sync_board
+
+def test_sync_is_incremental(tmp_path):
+    tsv, journal = tmp_path / "board.tsv", tmp_path / "journal.json"
+    tsv.write_text("Existing item\t\t\tDone\n" + "".join(f"Item {i}\t\t\tTodo\n" for i in range(5)))
+    logger = logging.getLogger("test_sync_board")
+    with GitHubStub() as gh:
+        gh.add_issue("Existing item")
+        stats = sync_board("o/r", "t", tsv, logger, journal, gh.url)
+        assert (stats["created"], stats["adopted"]) == (5, 1)
+        assert gh.counts[("POST", "issues")] == 5 and len(gh.issues) == 6
+
+        gh.log.clear()
+        assert sync_board("o/r", "t", tsv, logger, journal, gh.url)["unchanged"] == 6
+        assert gh.log == []
+
+        tsv.write_text(tsv.read_text().replace("Item 3\t\t", "Item 3\thttps://example.com/3\t"))
+        stats = sync_board("o/r", "t", tsv, logger, journal, gh.url)
+        assert stats["updated"] == 1
+        assert [(method, route) for method, route, _ in gh.log] == [("PATCH", "issue")]
+        item = next(issue for issue in gh.issues.values() if issue["title"] == "Item 3")
+        assert item["body"].endswith("https://example.com/3")